@@ -1,9 +1,36 @@
+import json
+import re
+
 from django.contrib import admin
+from django.contrib.admin.options import IS_POPUP_VAR
+from django.contrib.admin.utils import display_for_field, quote, unquote
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db.models import Q
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils.html import format_html
+from . import snapshots
+from .encryption import blind_index
 from .models import (
     Application, PersonalDetails, AddressEntry, Premises,
     ChildcareService, Training, EmploymentEntry, HouseholdMember,
-    Suitability, Declaration, Reference
+    Suitability, Declaration, Reference, StatusTransition, Check, SubmissionSnapshot,
+    SectionChange, HistoryCoverage, LocalAuthority,
+    normalize_search_text
 )
+from .paginators import EstimatedCountPaginator
+from .routers import replica_reads
+from .serializers import MANY_SECTIONS, ONE_TO_ONE_SECTIONS, SECTIONS
+from .workflow import bulk_transition
+
+NI_NUMBER_RE = re.compile(r'^[A-Z]{2}[0-9]{6}[A-D]$')
+
+
+def prefix_q(field, prefix):
+    """startswith as a range so it can use a plain B-tree index on any backend."""
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\uffff'})
+
 
 class PersonalDetailsInline(admin.StackedInline):
     model = PersonalDetails
@@ -48,9 +75,17 @@ class ReferenceInline(admin.TabularInline):
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ['application_number', 'get_applicant_name', 'status', 'created_at']
-    list_filter = ['status', 'created_at']
-    search_fields = ['application_number', 'personal_details__first_name', 'personal_details__last_name', 'personal_details__email']
-    readonly_fields = ['id', 'application_number', 'created_at', 'updated_at']
+    list_filter = ['status', 'created_at', ('duplicate_of', admin.EmptyFieldListFilter)]
+    list_select_related = ['personal_details']
+    ordering = ['-created_at']
+    # Searches are handled by get_search_results against indexed normalized columns
+    search_fields = ['application_number', 'personal_details__normalized_first_name', 'personal_details__normalized_last_name', 'personal_details__normalized_email']
+    search_help_text = 'Application number prefix, exact email, exact NI number, or name prefix (first, last or "first last")'
+    readonly_fields = ['id', 'application_number', 'duplicate_of', 'created_at', 'updated_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    summary_template = 'admin/applications/application/summary.html'
+    actions = ['mark_checks_in_progress', 'mark_under_review', 'mark_registered']
     
     inlines = [
         PersonalDetailsInline,
@@ -65,8 +100,261 @@ class ApplicationAdmin(admin.ModelAdmin):
         DeclarationInline,
     ]
     
+    # The change page opens on a read-only summary built from one graph query.
+    # Each section's inline is only built (and saved) when requested with
+    # ?section=<key>; ?section=application edits the Application fields alone.
+
+    @method_decorator(replica_reads)
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        # Render now, while the listing's reads are still routed to the replica
+        return response.render() if hasattr(response, 'render') else response
+
+    def get_section_inlines(self):
+        by_model = {inline.model: inline for inline in self.inlines}
+        return {key: by_model[model] for key, model in SECTIONS if model in by_model}
+
+    def get_inlines(self, request, obj):
+        if obj is None:
+            return self.inlines
+        inline = self.get_section_inlines().get(request.GET.get('section'))
+        return [inline] if inline else []
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        section = request.GET.get('section')
+        if request.method == 'GET' and not section and IS_POPUP_VAR not in request.GET:
+            return self.summary_view(request, object_id, extra_context)
+        inline = self.get_section_inlines().get(section)
+        if inline:
+            extra_context = {**(extra_context or {}), 'subtitle': inline.model._meta.verbose_name.capitalize()}
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    def response_change(self, request, obj):
+        response = super().response_change(request, obj)
+        # A plain "Save" on a section returns to the summary, not the changelist
+        other_actions = ['_continue', '_addanother', '_saveasnew', IS_POPUP_VAR]
+        if request.GET.get('section') and not any(key in request.POST for key in other_actions):
+            response['Location'] = reverse(
+                'admin:applications_application_change', args=[quote(obj.pk)], current_app=self.admin_site.name
+            )
+        return response
+
+    def summary_view(self, request, object_id, extra_context=None):
+        queryset = self.get_queryset(request).select_related(
+            *[key for key, _ in ONE_TO_ONE_SECTIONS]
+        ).prefetch_related(*[key for key, _ in MANY_SECTIONS])
+        try:
+            obj = queryset.get(pk=unquote(object_id))
+        except (Application.DoesNotExist, ValidationError, ValueError):
+            return self._get_obj_does_not_exist_redirect(request, self.opts, object_id)
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'Application {obj}',
+            'subtitle': None,
+            'opts': self.opts,
+            'original': obj,
+            'application_rows': self._summary_rows(obj, [
+                f for f in Application._meta.concrete_fields if f.name != 'id'
+            ]),
+            'sections': self._summary_sections(obj),
+            'snapshot': obj.snapshots.only('pk', 'created_at').first(),
+            'has_change_permission': self.has_change_permission(request, obj),
+            'has_delete_permission': self.has_delete_permission(request, obj),
+            **(extra_context or {}),
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, self.summary_template, context)
+
+    def _summary_rows(self, obj, fields):
+        return [
+            (f.verbose_name.capitalize(), display_for_field(getattr(obj, f.attname), f, self.get_empty_value_display()))
+            for f in fields
+        ]
+
+    def _summary_sections(self, obj):
+        sections = []
+        for key, model in SECTIONS:
+            derived = getattr(model, 'DERIVED_FIELDS', [])
+            fields = [f for f in model._meta.concrete_fields if f.name not in ('id', 'application', *derived)]
+            section = {
+                'key': key,
+                'title': model._meta.verbose_name_plural.capitalize(),
+                'many': (key, model) in MANY_SECTIONS,
+            }
+            if section['many']:
+                section['headers'] = [f.verbose_name.capitalize() for f in fields]
+                section['items'] = [
+                    [value for _, value in self._summary_rows(item, fields)]
+                    for item in getattr(obj, key).all()
+                ]
+            else:
+                instance = getattr(obj, key, None)
+                section['rows'] = self._summary_rows(instance, fields) if instance else []
+            sections.append(section)
+        return sections
+
+    def get_search_results(self, request, queryset, search_term):
+        term = normalize_search_text(search_term)
+        if not term:
+            return queryset, False
+        if term.startswith('rk-'):
+            return queryset.filter(prefix_q('application_number', term.upper())), False
+        if '@' in term:
+            return queryset.filter(personal_details__normalized_email=term), False
+        if NI_NUMBER_RE.match(term.replace(' ', '').upper()):
+            # ni_number is encrypted; exact matches go through its blind index
+            return queryset.filter(personal_details__ni_number_index=blind_index(term)), False
+
+        parts = term.split(' ', 1)
+        if len(parts) == 2:
+            query = (
+                prefix_q('personal_details__normalized_first_name', parts[0])
+                & prefix_q('personal_details__normalized_last_name', parts[1])
+            )
+        else:
+            query = (
+                prefix_q('personal_details__normalized_last_name', term)
+                | prefix_q('personal_details__normalized_first_name', term)
+            )
+        # Joins are one-to-one, so no duplicates
+        return queryset.filter(query), False
+
+    def _transition(self, request, queryset, to_status):
+        moved = bulk_transition(queryset, to_status, user=request.user, note='Admin bulk action')
+        label = dict(Application.STATUS_CHOICES)[to_status]
+        self.message_user(request, f'{moved} application(s) moved to {label}.')
+
+    @admin.action(description='Move selected applications to Checks in progress', permissions=['change'])
+    def mark_checks_in_progress(self, request, queryset):
+        self._transition(request, queryset, 'CHECKS_IN_PROGRESS')
+
+    @admin.action(description='Move selected applications to Under review', permissions=['change'])
+    def mark_under_review(self, request, queryset):
+        self._transition(request, queryset, 'UNDER_REVIEW')
+
+    @admin.action(description='Move selected applications to Registered', permissions=['change'])
+    def mark_registered(self, request, queryset):
+        self._transition(request, queryset, 'REGISTERED')
+
     def get_applicant_name(self, obj):
         if hasattr(obj, 'personal_details'):
             return f"{obj.personal_details.first_name} {obj.personal_details.last_name}"
         return "N/A"
     get_applicant_name.short_description = 'Applicant Name'
+
+
+@admin.register(StatusTransition)
+class StatusTransitionAdmin(admin.ModelAdmin):
+    list_display = ['application', 'from_status', 'to_status', 'changed_by', 'created_at']
+    list_filter = ['to_status', 'created_at']
+    list_select_related = ['application', 'changed_by']
+    raw_id_fields = ['application']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # Append-only audit log (rows still cascade when an application is deleted)
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Check)
+class CheckAdmin(admin.ModelAdmin):
+    list_display = ['application', 'check_type', 'status', 'details', 'updated_at']
+    list_filter = ['check_type', 'status']
+    list_select_related = ['application']
+    raw_id_fields = ['application']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(HistoryCoverage)
+class HistoryCoverageAdmin(admin.ModelAdmin):
+    list_display = ['application', 'kind', 'coverage_ok', 'gaps', 'overlaps', 'as_of']
+    list_filter = ['kind', 'coverage_ok']
+    list_select_related = ['application']
+    raw_id_fields = ['application']
+    readonly_fields = ['application', 'kind', 'coverage_ok', 'gaps', 'overlaps', 'as_of', 'updated_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # Computed from the history rows; edit those instead
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(LocalAuthority)
+class LocalAuthorityAdmin(admin.ModelAdmin):
+    list_display = ['name', 'code']
+    search_fields = ['name', 'code']
+
+    # Replaced wholesale by the load_postcodes command
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SubmissionSnapshot)
+class SubmissionSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['application', 'schema_version', 'created_at']
+    list_select_related = ['application']
+    raw_id_fields = ['application']
+    # The compressed blob is only decoded on the detail page
+    fields = ['application', 'schema_version', 'created_at', 'digest', 'intact', 'payload']
+    readonly_fields = fields
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('_changelist'):
+            queryset = queryset.defer('data')
+        return queryset
+
+    @admin.display(boolean=True, description='Matches digest')
+    def intact(self, obj):
+        try:
+            snapshots.load(obj)
+        except snapshots.SnapshotIntegrityError:
+            return False
+        return True
+
+    @admin.display(description='Submitted data')
+    def payload(self, obj):
+        try:
+            data = snapshots.load(obj)
+        except snapshots.SnapshotIntegrityError as e:
+            return str(e)
+        return format_html('<pre>{}</pre>', json.dumps(data, indent=2, sort_keys=True))
+
+    # Snapshots are the record of what was declared; they only go away with their application
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SectionChange)
+class SectionChangeAdmin(admin.ModelAdmin):
+    list_display = ['application', 'section', 'object_id', 'version', 'action', 'created_at']
+    list_filter = ['section', 'action']
+    list_select_related = ['application']
+    raw_id_fields = ['application']
+    readonly_fields = ['application', 'section', 'object_id', 'version', 'action', 'changes', 'state', 'created_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # Edit history is append-only, like the status transition log
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
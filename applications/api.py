@@ -0,0 +1,191 @@
+import base64
+import binascii
+import datetime
+import functools
+import hmac
+import json
+import uuid
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import urlencode
+from django.views.decorators.http import require_GET
+
+from .models import Application
+from .routers import replica_reads
+from .serializers import SECTIONS, _field_names, _plain, fetch_sections
+
+API_VERSION = 'v1'
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+SECTION_MODELS = dict(SECTIONS)
+
+APPLICATION_FIELDS = [
+    f.attname for f in Application._meta.concrete_fields if f.name not in Application.DERIVED_FIELDS
+]
+STATUSES = {value for value, _ in Application.STATUS_CHOICES}
+
+# ?<param>=<date or datetime> -> lookup; "after" is inclusive, "before" exclusive
+DATE_FILTERS = {
+    'created_after': 'created_at__gte',
+    'created_before': 'created_at__lt',
+    'updated_after': 'updated_at__gte',
+    'updated_before': 'updated_at__lt',
+}
+
+
+class ApiError(ValueError):
+    """A bad query parameter; answered with a 400."""
+
+
+def api_auth(view):
+    """
+    Let in staff sessions with the view permission, or a request carrying
+    `Authorization: Bearer <token>` for one of settings.API_TOKENS.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and token:
+            allowed = any(hmac.compare_digest(token.encode(), known.encode()) for known in settings.API_TOKENS)
+        else:
+            allowed = request.user.is_authenticated and request.user.has_perm('applications.view_application')
+        if not allowed:
+            return JsonResponse({'error': 'Authentication required.'}, status=401)
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    return wrapper
+
+
+def _names(value, allowed, what):
+    names = [name for name in value.split(',') if name]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ApiError(f'Unknown {what}: {", ".join(unknown)}')
+    return names
+
+
+def parse_query(params):
+    """
+    The shape of the response asked for by `?fields=`, `?fields[<section>]=`
+    and `?include=`. Returns (application columns, [(section key, model)],
+    {section key: columns}); `id` is always part of a row.
+    """
+    fields = list(APPLICATION_FIELDS)
+    if params.get('fields'):
+        fields = ['id'] + [name for name in _names(params['fields'], APPLICATION_FIELDS, 'fields') if name != 'id']
+    include = _names(params.get('include', ''), SECTION_MODELS, 'include')
+    section_fields = {}
+    for param, value in params.items():
+        if param.startswith('fields[') and param.endswith(']'):
+            key = param[len('fields['):-1]
+            if key not in include:
+                raise ApiError(f'{param} needs include={key}')
+            names = _names(value, _field_names(SECTION_MODELS[key]), f'{key} fields')
+            section_fields[key] = ['id'] + [name for name in names if name != 'id']
+    return fields, [(key, SECTION_MODELS[key]) for key in include], section_fields
+
+
+def _moment(param, value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ApiError(f'{param} must be an ISO date or datetime')
+        moment = datetime.datetime.combine(day, datetime.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_applications(queryset, params):
+    """?status=A,B and the DATE_FILTERS, all ANDed."""
+    if params.get('status'):
+        queryset = queryset.filter(status__in=_names(params['status'], STATUSES, 'status'))
+    for param, lookup in DATE_FILTERS.items():
+        if params.get(param):
+            queryset = queryset.filter(**{lookup: _moment(param, params[param])})
+    return queryset
+
+
+def encode_cursor(created_at, pk):
+    raw = json.dumps([created_at.isoformat(), str(pk)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        created_at, pk = parse_datetime(created_at), uuid.UUID(pk)
+    except (ValueError, TypeError, AttributeError, binascii.Error):
+        created_at = None
+    if created_at is None:
+        raise ApiError('Invalid cursor')
+    return created_at, pk
+
+
+def _limit(params):
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError('limit must be a number')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ApiError(f'limit must be between 1 and {MAX_LIMIT}')
+    return limit
+
+
+def serialize(rows, fields, sections, section_fields):
+    """Application rows (from .values()) with the included sections, one query per section."""
+    by_app = fetch_sections([row['id'] for row in rows], sections, section_fields) if sections else {}
+    data = []
+    for row in rows:
+        item = {name: _plain(row[name]) for name in fields}
+        item.update(by_app.get(row['id'], {}))
+        data.append(item)
+    return data
+
+
+@require_GET
+@api_auth
+@replica_reads
+def application_list(request):
+    """
+    Applications in created_at/id order, `limit` at a time. `next` holds the
+    URL of the following page (or null); its cursor is the last row's
+    (created_at, id), so pages stay stable while applications are added and
+    each one is an index range scan however deep the client has paged.
+    """
+    params = request.GET
+    fields, sections, section_fields = parse_query(params)
+    limit = _limit(params)
+    queryset = filter_applications(Application.objects.order_by('created_at', 'id'), params)
+    if params.get('cursor'):
+        created_at, pk = decode_cursor(params['cursor'])
+        queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+    rows = list(queryset.values(*dict.fromkeys(fields + ['created_at']))[:limit + 1])
+
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        query = {**params.dict(), 'cursor': encode_cursor(rows[-1]['created_at'], rows[-1]['id'])}
+        next_url = request.build_absolute_uri(request.path + '?' + urlencode(query))
+    return JsonResponse({'data': serialize(rows, fields, sections, section_fields), 'next': next_url})
+
+
+@require_GET
+@api_auth
+@replica_reads
+def application_detail(request, pk):
+    """One application, with the same ?fields= and ?include= as the list."""
+    fields, sections, section_fields = parse_query(request.GET)
+    rows = list(Application.objects.filter(pk=pk).values(*fields))
+    if not rows:
+        return JsonResponse({'error': 'Not found.'}, status=404)
+    return JsonResponse({'data': serialize(rows, fields, sections, section_fields)[0]})
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+from .db import retry_on_locked
+from .models import Application
+
+# Namespace of serializers.dashboard_sections() entries
+DASHBOARD = 'dashboard'
+
+
+def get_cache():
+    return caches[settings.APPLICATION_CACHE_ALIAS]
+
+
+def cache_key(namespace, application):
+    """
+    Key of `application`'s entry under `namespace`. Application.cache_version
+    is part of the key, so bumping it orphans every older entry at once and
+    no cache ever has to be told about a change.
+    """
+    return f'application:{namespace}:{application.pk}:{application.cache_version}'
+
+
+def get_many(applications, namespace, build):
+    """
+    Cached values for a list of Application instances, in order.
+
+    One get_many() fetches every current entry; the misses are passed to
+    `build(applications) -> {pk: value}` in one call and stored with one
+    set_many().
+    """
+    cache = get_cache()
+    keys = {app.pk: cache_key(namespace, app) for app in applications}
+    found = cache.get_many(keys.values())
+    missing = [app for app in applications if keys[app.pk] not in found]
+    if missing:
+        built = build(missing)
+        cache.set_many({keys[pk]: value for pk, value in built.items()})
+        found.update((keys[pk], value) for pk, value in built.items())
+    return [found[keys[app.pk]] for app in applications]
+
+
+@retry_on_locked
+def bump(application_ids):
+    """Invalidate the cached entries of `application_ids` with one UPDATE."""
+    return Application.objects.filter(pk__in=list(application_ids)).update(cache_version=F('cache_version') + 1)
+
+
+def bump_all():
+    """Invalidate every cached entry, e.g. after data was rewritten in bulk."""
+    return Application.objects.update(cache_version=F('cache_version') + 1)
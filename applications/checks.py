@@ -0,0 +1,202 @@
+import contextvars
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+from . import app_cache
+from .coverage import COVERAGE_KINDS, recompute_coverage
+from .db import retry_on_locked
+from .encryption import mask
+from .models import Application, Check, Reference, Suitability, Training
+
+CHECK_TYPES = [code for code, _ in Check.CHECK_TYPES]
+
+# Check types computed from section data, keyed by the section they read.
+# Types not listed here (la_check, ofsted, gp_health) are only ever set by staff.
+SOURCE_CHECKS = {
+    Suitability: ['dbs'],
+    Training: ['first_aid', 'safeguarding'],
+    Reference: ['ref_1', 'ref_2'],
+}
+DERIVED_CHECKS = [check_type for types in SOURCE_CHECKS.values() for check_type in types]
+
+# Applications per round of reads/writes
+BATCH_SIZE = 1000
+
+# {application_id: {check_type}} collected inside deferred_recompute()
+_deferred = contextvars.ContextVar('deferred_checks', default=None)
+
+
+def compute_checks(suitability, training, reference_count):
+    """
+    Derive {check_type: (status, details)} from section values.
+    `suitability` and `training` are dicts of field values, or None if the
+    section hasn't been saved yet.
+    """
+    checks = {}
+    if suitability and suitability['has_dbs']:
+        # Only the last digits; the number itself is kept encrypted on Suitability
+        checks['dbs'] = ('complete', mask(suitability['dbs_number']))
+    elif suitability and suitability['dbs_number']:
+        checks['dbs'] = ('pending', '')
+    else:
+        checks['dbs'] = ('not-started', '')
+    checks['ref_1'] = ('pending' if reference_count >= 1 else 'not-started', '')
+    checks['ref_2'] = ('pending' if reference_count >= 2 else 'not-started', '')
+    for course in ['first_aid', 'safeguarding']:
+        done = training and training[f'{course}_completed']
+        checks[course] = ('complete' if done else 'not-started', '')
+    return checks
+
+
+def initial_checks(application_id):
+    """Unsaved not-started rows for every check type, for a new application."""
+    return [Check(application_id=application_id, check_type=check_type) for check_type in CHECK_TYPES]
+
+
+@retry_on_locked
+def recompute_checks(application_ids, check_types=None):
+    """
+    Bring the stored Check rows for `application_ids` in line with their sections.
+
+    Only the sections feeding `check_types` (default: every derived type) are
+    read, with one IN query per section per batch. Missing rows are created,
+    and rows whose status or details changed are written with one
+    bulk_update; unchanged rows aren't touched. Returns the number of rows
+    created or updated.
+    """
+    check_types = [t for t in (check_types or DERIVED_CHECKS) if t in DERIVED_CHECKS]
+    application_ids = list(application_ids)
+    written = 0
+    for start in range(0, len(application_ids), BATCH_SIZE):
+        batch = application_ids[start:start + BATCH_SIZE]
+        suitability, training, references = {}, {}, {}
+        if 'dbs' in check_types:
+            rows = Suitability.objects.filter(application_id__in=batch).values('application_id', 'has_dbs', 'dbs_number')
+            suitability = {row['application_id']: row for row in rows}
+        if {'first_aid', 'safeguarding'} & set(check_types):
+            rows = Training.objects.filter(application_id__in=batch).values(
+                'application_id', 'first_aid_completed', 'safeguarding_completed'
+            )
+            training = {row['application_id']: row for row in rows}
+        if {'ref_1', 'ref_2'} & set(check_types):
+            references = dict(
+                Reference.objects.filter(application_id__in=batch).order_by()
+                .values_list('application_id').annotate(n=Count('pk'))
+            )
+
+        existing = {(c.application_id, c.check_type): c for c in Check.objects.filter(application_id__in=batch)}
+        now = timezone.now()
+        to_create, to_update, incomplete = [], [], set()
+        for app_id in batch:
+            computed = compute_checks(suitability.get(app_id), training.get(app_id), references.get(app_id, 0))
+            for check_type in CHECK_TYPES:
+                check = existing.get((app_id, check_type))
+                if check is None and check_type in DERIVED_CHECKS and check_type not in check_types:
+                    # Its section wasn't read; redo this application in full below
+                    incomplete.add(app_id)
+                elif check is None:
+                    status, details = computed.get(check_type, ('not-started', ''))
+                    to_create.append(Check(application_id=app_id, check_type=check_type, status=status, details=details))
+                elif check_type in check_types and (check.status, check.details) != computed[check_type]:
+                    check.status, check.details = computed[check_type]
+                    check.updated_at = now
+                    to_update.append(check)
+        to_create = [c for c in to_create if c.application_id not in incomplete]
+        Check.objects.bulk_create(to_create)
+        Check.objects.bulk_update(to_update, ['status', 'details', 'updated_at'])
+        written += len(to_create) + len(to_update)
+        if incomplete:
+            written += recompute_checks(incomplete)
+    return written
+
+
+# Pseudo type that invalidates the applications.app_cache entries instead
+CACHE = 'cache'
+
+
+def _recompute(application_ids, types):
+    """
+    Route a mix of check types, coverage kinds (see applications.coverage)
+    and CACHE to their recompute.
+    """
+    check_types = [t for t in types if t not in COVERAGE_KINDS and t != CACHE]
+    kinds = [t for t in types if t in COVERAGE_KINDS]
+    if check_types:
+        recompute_checks(application_ids, check_types)
+    if kinds:
+        recompute_coverage(application_ids, kinds)
+    if CACHE in types:
+        app_cache.bump(application_ids)
+
+
+def schedule_recompute(application_id, check_types):
+    """
+    Recompute now, or at the end of the enclosing deferred_recompute() block.
+    `check_types` may also name history coverage kinds.
+    """
+    pending = _deferred.get()
+    if pending is None:
+        _recompute([application_id], check_types)
+    else:
+        pending.setdefault(application_id, set()).update(check_types)
+
+
+def _run_pending(pending):
+    """Recompute everything collected in `pending` and empty it."""
+    # Cache bumps don't depend on the types, so they share one UPDATE; one
+    # for an application deleted inside the block just matches no row
+    bumped = [app_id for app_id, check_types in pending.items() if CACHE in check_types]
+    todo = {app_id: check_types - {CACHE} for app_id, check_types in pending.items() if check_types - {CACHE}}
+    pending.clear()
+    # Applications deleted inside the block have nothing left to recompute
+    existing = set(Application.objects.filter(pk__in=list(todo)).values_list('pk', flat=True)) if todo else set()
+    by_types = defaultdict(list)
+    for app_id, check_types in todo.items():
+        if app_id in existing:
+            by_types[frozenset(check_types)].append(app_id)
+    for check_types, app_ids in by_types.items():
+        _recompute(app_ids, list(check_types))
+    if bumped:
+        _recompute(bumped, [CACHE])
+
+
+def flush_recompute():
+    """
+    Run the recomputes collected so far in the enclosing deferred_recompute()
+    block. Called at the end of a save's transaction, so checks, coverage
+    and the cache version commit (or are retried) with the sections instead
+    of in transactions of their own afterwards.
+    """
+    pending = _deferred.get()
+    if pending:
+        _run_pending(pending)
+
+
+@contextmanager
+def deferred_recompute():
+    """
+    Batch the recomputes triggered by section saves inside the block, so a
+    request that saves several sections recomputes each application once.
+    Nothing is recomputed if the block raises.
+    """
+    if _deferred.get() is not None:
+        yield
+        return
+    pending = {}
+    token = _deferred.set(pending)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+    _run_pending(pending)
+
+
+def outstanding(queryset, check_type=None):
+    """Filter an Application queryset to those with a check (of `check_type`) not yet complete."""
+    checks = Check.objects.filter(application=OuterRef('pk')).exclude(status='complete')
+    if check_type:
+        checks = checks.filter(check_type=check_type)
+    return queryset.filter(Exists(checks))
@@ -0,0 +1,123 @@
+import datetime
+from itertools import groupby
+from operator import itemgetter
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .db import retry_on_locked
+from .models import AddressEntry, EmploymentEntry, HistoryCoverage, years_before
+
+# Years of history the register page asks for
+REQUIRED_YEARS = 5
+
+# kind: (model, start field, end field, overlaps allowed)
+# Two jobs at once is normal; living at two addresses at once is a data error.
+COVERAGE_KINDS = {
+    'address': (AddressEntry, 'move_in_date', 'move_out_date', False),
+    'employment': (EmploymentEntry, 'start_date', 'end_date', True),
+}
+COVERAGE_SOURCES = {model: [kind] for kind, (model, _, _, _) in COVERAGE_KINDS.items()}
+
+# Applications per round of reads/writes
+BATCH_SIZE = 500
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def window_start(as_of, years=REQUIRED_YEARS):
+    return years_before(as_of, years)
+
+
+def compute_coverage(intervals, as_of, allow_overlap=False):
+    """
+    Sweep `intervals` ([(start, end_or_None), ...] sorted by start) across
+    the REQUIRED_YEARS window ending `as_of`. An open end means "to date";
+    moving out and in on the same day is neither a gap nor an overlap.
+    Returns (coverage_ok, gaps, overlaps) with ranges as [first_day, last_day].
+    """
+    start = window_start(as_of)
+    covered_until = start - ONE_DAY
+    gaps, overlaps = [], []
+    for begin, end in intervals:
+        if begin is None:
+            continue
+        end = min(end or as_of, as_of)
+        if end < begin or end < start:
+            continue
+        begin = max(begin, start)
+        if begin > covered_until + ONE_DAY:
+            gaps.append([covered_until + ONE_DAY, begin - ONE_DAY])
+        elif begin < covered_until:
+            overlaps.append([begin, min(end, covered_until)])
+        covered_until = max(covered_until, end)
+    if covered_until < as_of:
+        gaps.append([covered_until + ONE_DAY, as_of])
+    ok = not gaps and (allow_overlap or not overlaps)
+    return ok, _iso(gaps), _iso(overlaps)
+
+
+def _iso(ranges):
+    return [[first.isoformat(), last.isoformat()] for first, last in ranges]
+
+
+@retry_on_locked
+def recompute_coverage(application_ids, kinds=None, as_of=None):
+    """
+    Bring the stored HistoryCoverage rows for `application_ids` up to date.
+
+    Per batch and kind, one query reads the history rows sorted by
+    application and start date, and each application's run is swept in
+    order. Changed rows are written with one bulk_update, missing ones with
+    one bulk_create. Returns the number of rows written.
+    """
+    kinds = [kind for kind in (kinds or COVERAGE_KINDS) if kind in COVERAGE_KINDS]
+    as_of = as_of or timezone.localdate()
+    application_ids = list(application_ids)
+    written = 0
+    for start in range(0, len(application_ids), BATCH_SIZE):
+        batch = application_ids[start:start + BATCH_SIZE]
+        existing = {
+            (row.application_id, row.kind): row
+            for row in HistoryCoverage.objects.filter(application_id__in=batch, kind__in=kinds)
+        }
+        to_create, to_update = [], []
+        for kind in kinds:
+            model, start_field, end_field, allow_overlap = COVERAGE_KINDS[kind]
+            rows = (
+                model.objects.filter(application_id__in=batch)
+                .order_by('application_id', start_field)
+                .values_list('application_id', start_field, end_field)
+            )
+            intervals = {
+                app_id: [(begin, end) for _, begin, end in group]
+                for app_id, group in groupby(rows, key=itemgetter(0))
+            }
+            for app_id in batch:
+                ok, gaps, overlaps = compute_coverage(intervals.get(app_id, []), as_of, allow_overlap)
+                row = existing.get((app_id, kind))
+                if row is None:
+                    to_create.append(HistoryCoverage(
+                        application_id=app_id, kind=kind, coverage_ok=ok, gaps=gaps, overlaps=overlaps, as_of=as_of,
+                    ))
+                elif (row.coverage_ok, row.gaps, row.overlaps, row.as_of) != (ok, gaps, overlaps, as_of):
+                    row.coverage_ok, row.gaps, row.overlaps, row.as_of = ok, gaps, overlaps, as_of
+                    row.updated_at = timezone.now()
+                    to_update.append(row)
+        HistoryCoverage.objects.bulk_create(to_create)
+        HistoryCoverage.objects.bulk_update(to_update, ['coverage_ok', 'gaps', 'overlaps', 'as_of', 'updated_at'])
+        written += len(to_create) + len(to_update)
+    return written
+
+
+def incomplete_coverage(queryset, kind=None):
+    """
+    Filter an Application queryset to those without complete `kind` history
+    (default: address or employment). Applications never computed count as
+    incomplete.
+    """
+    query = Q()
+    for name in [kind] if kind else COVERAGE_KINDS:
+        ok = HistoryCoverage.objects.filter(application=OuterRef('pk'), kind=name, coverage_ok=True)
+        query |= ~Exists(ok)
+    return queryset.filter(query)
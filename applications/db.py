@@ -0,0 +1,55 @@
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+# sqlite3 messages for SQLITE_BUSY / SQLITE_LOCKED
+LOCKED_MESSAGES = ('database is locked', 'database table is locked')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    connection_created hook: apply settings.SQLITE_PRAGMAS to every new
+    SQLite connection (WAL, busy_timeout, synchronous, mmap_size, ...).
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def is_locked_error(exc):
+    return isinstance(exc, OperationalError) and any(message in str(exc) for message in LOCKED_MESSAGES)
+
+
+def backoff_delay(attempt, base_delay=0.05, max_delay=1.0):
+    """Full-jitter exponential backoff, so retrying writers don't collide again in lockstep."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def retry_on_locked(func=None, *, attempts=None, using=None):
+    """
+    Rerun `func` when it fails with "database is locked", sleeping with
+    jittered exponential backoff between tries (settings.DB_WRITE_RETRIES
+    retries unless `attempts` is given). `func` must be safe to run again,
+    i.e. its writes are atomic. Inside an enclosing atomic block nothing is
+    retried: the error propagates so the outer transaction is retried whole.
+    """
+    if func is None:
+        return functools.partial(retry_on_locked, attempts=attempts, using=using)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        retries = attempts if attempts is not None else getattr(settings, 'DB_WRITE_RETRIES', 0)
+        for attempt in range(retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as e:
+                if attempt == retries or not is_locked_error(e) or transaction.get_connection(using).in_atomic_block:
+                    raise
+            time.sleep(backoff_delay(attempt))
+    return wrapper
@@ -0,0 +1,100 @@
+from itertools import groupby
+from operator import itemgetter
+
+from django.db.models import Q
+
+from .models import Application, PersonalDetails
+
+# Indexed PersonalDetails columns that identify the same applicant
+MATCH_KEYS = ['ni_number_index', 'normalized_email', 'name_dob_key']
+
+
+def match_q(personal):
+    """OR of the applicant's non-empty match keys, or None if there are none."""
+    query = Q()
+    for key in MATCH_KEYS:
+        value = getattr(personal, key)
+        if value:
+            query |= Q(**{key: value})
+    return query or None
+
+
+def find_duplicate(personal):
+    """
+    The earliest older application sharing a match key with `personal`, or
+    None. One query: an equality probe on each key's index.
+    """
+    query = match_q(personal)
+    if query is None:
+        return None
+    application = personal.application
+    return (
+        PersonalDetails.objects.filter(query, application__created_at__lt=application.created_at)
+        .order_by('application__created_at', 'application_id')
+        .values_list('application_id', flat=True).first()
+    )
+
+
+def flag_duplicate(personal):
+    """
+    Point the application at the earlier one it duplicates (or clear the
+    link). Call after saving PersonalDetails so the match keys are current.
+    Links to newer applications, and chains through other keys, are
+    resolved by the cluster_duplicates command.
+    """
+    application = personal.application
+    duplicate_of = find_duplicate(personal)
+    if duplicate_of != application.duplicate_of_id:
+        Application.objects.filter(pk=application.pk).update(duplicate_of=duplicate_of)
+        application.duplicate_of_id = duplicate_of
+    return duplicate_of
+
+
+def cluster_duplicates(chunk_size=2000):
+    """
+    Group every application with those it shares any match key with,
+    directly or through others, and return {application_id: earliest
+    application_id in its cluster} for all but the earliest of each.
+
+    One index-ordered scan per key: rows with equal values come out
+    adjacent, so groups are read off in a single pass with no pairwise
+    comparison. Groups from different keys are merged with union-find.
+    """
+    parent = {}
+    created = {}
+
+    def find(app_id):
+        root = app_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[app_id] != root:
+            parent[app_id], app_id = root, parent[app_id]
+        return root
+
+    for key in MATCH_KEYS:
+        rows = (
+            PersonalDetails.objects.filter(**{f'{key}__isnull': False}).order_by(key)
+            .values_list(key, 'application_id', 'application__created_at').iterator(chunk_size=chunk_size)
+        )
+        for _, group in groupby(rows, key=itemgetter(0)):
+            group = list(group)
+            if len(group) < 2:
+                continue
+            first = group[0][1]
+            for _, app_id, created_at in group:
+                created[app_id] = created_at
+                parent.setdefault(app_id, app_id)
+            root = find(first)
+            for _, app_id, _ in group[1:]:
+                other = find(app_id)
+                if other != root:
+                    parent[other] = root
+
+    clusters = {}
+    for app_id in parent:
+        clusters.setdefault(find(app_id), []).append(app_id)
+    canonical = {}
+    for members in clusters.values():
+        earliest = min(members, key=lambda app_id: (created[app_id], str(app_id)))
+        canonical.update({app_id: earliest for app_id in members if app_id != earliest})
+    return canonical
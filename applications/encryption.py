@@ -0,0 +1,144 @@
+import base64
+import functools
+import hashlib
+import hmac
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from django.conf import settings
+from django.db import models
+
+# Marks stored ciphertext; anything without it is a plaintext row from before encryption
+PREFIX = 'enc1$'
+
+
+def _derive(secret, purpose):
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b'applications.' + purpose)
+    return hkdf.derive(secret.encode('utf-8'))
+
+
+@functools.lru_cache(maxsize=4)
+def _keyring(secrets):
+    """
+    Ciphers and the blind-index key for a tuple of secrets. Derived once per
+    process (per key set), not per row, so exports and the dashboard only pay
+    for the AES/HMAC work itself.
+    """
+    fernet = MultiFernet([Fernet(base64.urlsafe_b64encode(_derive(secret, b'field-encryption'))) for secret in secrets])
+    # Blind indexes use the first (current) key; see the reencrypt_fields command
+    return fernet, _derive(secrets[0], b'blind-index')
+
+
+def keyring():
+    secrets = tuple(getattr(settings, 'FIELD_ENCRYPTION_KEYS', None) or [settings.SECRET_KEY])
+    return _keyring(secrets)
+
+
+def encrypt(value):
+    if value is None or value == '':
+        return value
+    fernet, _ = keyring()
+    return PREFIX + fernet.encrypt(value.encode('utf-8')).decode('ascii')
+
+
+def decrypt(value):
+    """Plaintext for a stored value; legacy plaintext rows are returned unchanged."""
+    if not value or not value.startswith(PREFIX):
+        return value
+    fernet, _ = keyring()
+    try:
+        return fernet.decrypt(value[len(PREFIX):].encode('ascii')).decode('utf-8')
+    except InvalidToken:
+        raise ValueError('Encrypted value cannot be decrypted with the configured FIELD_ENCRYPTION_KEYS')
+
+
+def normalize_identifier(value):
+    """NI/DBS numbers compare without spaces or dashes, case-insensitively."""
+    return ''.join(value.split()).replace('-', '').upper() if value else ''
+
+
+def mask(value, visible=4):
+    """'********7890': enough to tell certificates apart without storing the number in clear."""
+    value = normalize_identifier(value)
+    if not value:
+        return ''
+    return '*' * max(len(value) - visible, 0) + value[-visible:]
+
+
+def blind_index(value):
+    """Keyed hash of `value` for exact-match lookups on an encrypted column, or None if empty."""
+    value = normalize_identifier(value)
+    if not value:
+        return None
+    _, key = keyring()
+    return hmac.new(key, value.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+class EncryptedCharField(models.CharField):
+    """
+    CharField stored encrypted (Fernet) in a text column. max_length and
+    validators apply to the plaintext. Ciphertext is randomised, so the
+    column can't be searched: only isnull lookups are allowed, and exact
+    matches go through a separate blind_index() column.
+    """
+
+    def get_internal_type(self):
+        # Ciphertext is far longer than max_length
+        return 'TextField'
+
+    def from_db_value(self, value, expression, connection):
+        return decrypt(value)
+
+    def get_db_prep_save(self, value, connection):
+        value = super().get_db_prep_save(value, connection)
+        # Expressions (e.g. bulk_update's CASE) encrypt their own Values on save
+        if hasattr(value, 'as_sql'):
+            return value
+        return encrypt(value)
+
+    def get_lookup(self, lookup_name):
+        if lookup_name != 'isnull':
+            return None
+        return super().get_lookup(lookup_name)
+
+
+def encrypted_fields(model):
+    return [f.attname for f in model._meta.concrete_fields if isinstance(f, EncryptedCharField)]
+
+
+def seal_row(model, row):
+    """Copy of a {attname: value} row with the model's encrypted fields encrypted."""
+    names = [name for name in encrypted_fields(model) if name in row]
+    if not names:
+        return row
+    return {**row, **{name: encrypt(row[name]) for name in names}}
+
+
+def open_row(model, row):
+    """Inverse of seal_row()."""
+    names = [name for name in encrypted_fields(model) if name in row]
+    if not names:
+        return row
+    return {**row, **{name: decrypt(row[name]) for name in names}}
+
+
+def reencrypt(model, batch_size=1000):
+    """
+    Rewrite every row's encrypted fields with the current key and refresh
+    their `<field>_index` blind indexes. Encrypts legacy plaintext rows too.
+    Works on historical models, so migrations can call it. Returns the row count.
+    """
+    fields = encrypted_fields(model)
+    indexes = {name: f'{name}_index' for name in fields if f'{name}_index' in {f.attname for f in model._meta.concrete_fields}}
+    done, last_pk = 0, 0
+    while True:
+        rows = list(model.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', *fields)[:batch_size])
+        if not rows:
+            return done
+        for row in rows:
+            for name, index in indexes.items():
+                setattr(row, index, blind_index(getattr(row, name)))
+        model.objects.bulk_update(rows, fields + list(indexes.values()))
+        done += len(rows)
+        last_pk = rows[-1].pk
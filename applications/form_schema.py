@@ -0,0 +1,131 @@
+import functools
+import hashlib
+import json
+
+from django import forms
+from django.core.exceptions import FieldDoesNotExist
+from django.core.validators import RegexValidator
+
+from .forms import (
+    AddressEntryFormSet, ChildcareServiceForm, DeclarationForm, EmploymentEntryFormSet,
+    HouseholdMemberFormSet, PersonalDetailsForm, PremisesForm, ReferenceFormSet, SuitabilityForm,
+    TrainingForm,
+)
+from .fragments import FIELD_SECTIONS, FORM_SECTIONS
+
+# Prefixes as used by register_view
+SCHEMA_FORMS = [
+    ('personal', PersonalDetailsForm),
+    ('premises', PremisesForm),
+    ('service', ChildcareServiceForm),
+    ('training', TrainingForm),
+    ('suitability', SuitabilityForm),
+    ('declaration', DeclarationForm),
+]
+
+SCHEMA_FORMSETS = [
+    ('address', AddressEntryFormSet),
+    ('employment', EmploymentEntryFormSet),
+    ('household', HouseholdMemberFormSet),
+    ('reference', ReferenceFormSet),
+]
+
+# Most specific first: EmailField is a CharField, TypedChoiceField a ChoiceField, ...
+FIELD_TYPES = [
+    (forms.EmailField, 'email'),
+    (forms.DateTimeField, 'datetime'),
+    (forms.DateField, 'date'),
+    (forms.IntegerField, 'integer'),
+    (forms.DecimalField, 'decimal'),
+    (forms.BooleanField, 'boolean'),
+    (forms.NullBooleanField, 'boolean'),
+    (forms.ChoiceField, 'choice'),
+]
+
+# Bookkeeping fields the client never fills in
+SKIPPED_FIELDS = {'id', 'application'}
+
+
+def _patterns(form, name, field):
+    """
+    RegexValidators on the form field and, for ModelForms, on the model
+    field (run by the model's full_clean). Only flag-free, non-inverted
+    patterns are exported, so the client can use them as JS RegExps.
+    """
+    validators = list(field.validators)
+    try:
+        validators += form._meta.model._meta.get_field(name).validators
+    except (AttributeError, FieldDoesNotExist):
+        pass
+    patterns = []
+    for validator in validators:
+        if isinstance(validator, RegexValidator) and not validator.inverse_match and not validator.flags:
+            entry = {'pattern': validator.regex.pattern, 'message': str(validator.message)}
+            if entry not in patterns:
+                patterns.append(entry)
+    return patterns
+
+
+def field_schema(form, prefix, name, field):
+    entry = {
+        'type': next((label for cls, label in FIELD_TYPES if isinstance(field, cls)), 'string'),
+        'required': field.required,
+        'label': str(field.label or name),
+        'section': FIELD_SECTIONS.get(f'{prefix}-{name}', FORM_SECTIONS[prefix]),
+    }
+    for attr in ['max_length', 'min_length', 'min_value', 'max_value']:
+        value = getattr(field, attr, None)
+        if value is not None:
+            entry[attr] = value
+    if isinstance(field, forms.ChoiceField):
+        entry['choices'] = [str(value) for value, _ in field.choices if value != '']
+    patterns = _patterns(form, name, field)
+    if patterns:
+        entry['patterns'] = patterns
+    normalize = getattr(form, 'normalizers', {}).get(name)
+    if normalize:
+        entry['normalize'] = normalize
+    if field.required:
+        entry['messages'] = {'required': str(field.error_messages['required'])}
+    return entry
+
+
+def form_schema(form, prefix):
+    return {
+        'fields': {
+            name: field_schema(form, prefix, name, field)
+            for name, field in form.fields.items() if name not in SKIPPED_FIELDS
+        },
+        'rules': getattr(form, 'cross_field_rules', []),
+    }
+
+
+def build_schema():
+    """
+    Field types, required flags, lengths, choices, regex patterns and
+    cross-field rules of the register page's forms, as a submit (not a
+    draft save) validates them. Forms are instantiated unbound, so rules
+    set up in __init__ (e.g. TrainingForm's optional flags) are included.
+    """
+    schema = {'forms': {}, 'formsets': {}}
+    for prefix, form_class in SCHEMA_FORMS:
+        schema['forms'][prefix] = form_schema(form_class(prefix=prefix), prefix)
+    for prefix, formset_class in SCHEMA_FORMSETS:
+        # The form class alone: an inline formset instance would query its rows
+        schema['formsets'][prefix] = {
+            **form_schema(formset_class.form(prefix=f'{prefix}-__prefix__'), prefix),
+            'min_num': formset_class.min_num,
+            'max_num': formset_class.max_num,
+            'can_delete': formset_class.can_delete,
+        }
+    return schema
+
+
+@functools.lru_cache(maxsize=1)
+def schema_json():
+    """
+    The schema as JSON bytes and its version (a content hash). The forms
+    are code, so it's built once per process and only changes on deploy.
+    """
+    content = json.dumps(build_schema(), sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return content, hashlib.sha256(content).hexdigest()[:16]
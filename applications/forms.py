@@ -1,16 +1,51 @@
 from django import forms
+from .encryption import normalize_identifier
 from .models import (
     Application, PersonalDetails, AddressEntry, Premises,
     ChildcareService, Training, EmploymentEntry, HouseholdMember,
     Suitability, Declaration, Reference
 )
 
+class CrossFieldRulesMixin:
+    """
+    Cross-field checks declared as data in `cross_field_rules`, so clean()
+    and the client-side schema (applications.form_schema) share one
+    definition. Rules are dicts with a `type` of:
+
+      any_of         at least one of `fields` is set (non-field error)
+      required_if    `field` is required when `depends_on` is set
+      required_true  every one of `fields` must be ticked
+
+    Drafts skip them, like the required flags.
+    """
+    cross_field_rules = []
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if self.is_draft:
+            return cleaned_data
+        for rule in self.cross_field_rules:
+            if rule['type'] == 'any_of':
+                if not any(cleaned_data.get(field) for field in rule['fields']):
+                    self.add_error(None, rule['message'])
+            elif rule['type'] == 'required_if':
+                if cleaned_data.get(rule['depends_on']) and not cleaned_data.get(rule['field']):
+                    self.add_error(rule['field'], rule['message'])
+            elif rule['type'] == 'required_true':
+                for field in rule['fields']:
+                    if not cleaned_data.get(field):
+                        self.add_error(field, rule['message'])
+        return cleaned_data
+
 class ApplicationForm(forms.ModelForm):
     class Meta:
         model = Application
         fields = ['status'] # Usually user doesn't set status, but handled in view
 
 class PersonalDetailsForm(forms.ModelForm):
+    # Applied before validation; clients should do the same (see form_schema)
+    normalizers = {'ni_number': 'identifier'}
+
     ni_number = forms.CharField(
         max_length=20, 
         widget=forms.TextInput(attrs={
@@ -52,10 +87,8 @@ class PersonalDetailsForm(forms.ModelForm):
                 field.required = False
 
     def clean_ni_number(self):
-        ni = self.cleaned_data.get('ni_number', '')
-        # Remove spaces and dashes, convert to upper
-        clean_ni = ni.replace(' ', '').replace('-', '').upper()
-        return clean_ni
+        # Same normalization as the ni_number blind index (duplicate matching)
+        return normalize_identifier(self.cleaned_data.get('ni_number', ''))
 
 class PremisesForm(forms.ModelForm):
     class Meta:
@@ -74,7 +107,12 @@ class PremisesForm(forms.ModelForm):
             for field in self.fields.values():
                 field.required = False
 
-class ChildcareServiceForm(forms.ModelForm):
+class ChildcareServiceForm(CrossFieldRulesMixin, forms.ModelForm):
+    cross_field_rules = [
+        {'type': 'any_of', 'fields': ['care_age_0_5', 'care_age_5_8', 'care_age_8_plus'],
+         'message': 'Please select at least one age group.'},
+    ]
+
     class Meta:
         model = ChildcareService
         exclude = ['application']
@@ -89,16 +127,6 @@ class ChildcareServiceForm(forms.ModelForm):
             for field in self.fields.values():
                 field.required = False
 
-    def clean(self):
-        cleaned_data = super().clean()
-        if self.is_draft:
-            return cleaned_data
-            
-        age_groups = ['care_age_0_5', 'care_age_5_8', 'care_age_8_plus']
-        if not any(cleaned_data.get(field) for field in age_groups):
-            raise forms.ValidationError('Please select at least one age group.')
-        return cleaned_data
-
 class TrainingForm(forms.ModelForm):
     class Meta:
         model = Training
@@ -128,7 +156,12 @@ class TrainingForm(forms.ModelForm):
                 if field in self.fields:
                     self.fields[field].required = False
 
-class SuitabilityForm(forms.ModelForm):
+class SuitabilityForm(CrossFieldRulesMixin, forms.ModelForm):
+    cross_field_rules = [
+        {'type': 'required_if', 'field': 'dbs_number', 'depends_on': 'has_dbs',
+         'message': 'Please provide your DBS certificate number.'},
+    ]
+
     class Meta:
         model = Suitability
         exclude = ['application']
@@ -145,16 +178,14 @@ class SuitabilityForm(forms.ModelForm):
             for field in self.fields.values():
                 field.required = False
 
-    def clean(self):
-        cleaned_data = super().clean()
-        if self.is_draft:
-            return cleaned_data
-            
-        if cleaned_data.get('has_dbs') and not cleaned_data.get('dbs_number'):
-            self.add_error('dbs_number', 'Please provide your DBS certificate number.')
-        return cleaned_data
+class DeclarationForm(CrossFieldRulesMixin, forms.ModelForm):
+    cross_field_rules = [
+        {'type': 'required_true',
+         'fields': ['consent_auth_contact', 'consent_auth_share', 'consent_understand_usage',
+                    'consent_understand_gdpr', 'consent_truth'],
+         'message': 'You must provide your consent to continue.'},
+    ]
 
-class DeclarationForm(forms.ModelForm):
     class Meta:
         model = Declaration
         exclude = ['application']
@@ -171,25 +202,25 @@ class DeclarationForm(forms.ModelForm):
             for field in self.fields.values():
                 field.required = False
 
-    def clean(self):
-        cleaned_data = super().clean()
-        if self.is_draft:
-            return cleaned_data
-            
-        consent_fields = [
-            'consent_auth_contact', 'consent_auth_share', 
-            'consent_understand_usage', 'consent_understand_gdpr', 'consent_truth'
-        ]
-        
-        for field in consent_fields:
-            if not cleaned_data.get(field):
-                self.add_error(field, "You must provide your consent to continue.")
-        
-        return cleaned_data
+
+class ResumableInlineFormSet(forms.BaseInlineFormSet):
+    """
+    Unbound, shows the factory's blank `extra` rows only until the applicant
+    has saved a row. Decided from the rows the formset loads anyway, so it
+    costs no extra query (and none at all when the page comes from the
+    fragment cache). Bound formsets count rows from the management form.
+    """
+
+    def total_form_count(self):
+        if not self.is_bound and self.initial_form_count():
+            return max(self.initial_form_count(), self.min_num)
+        return super().total_form_count()
+
 
 # Address History FormSet
 AddressEntryFormSet = forms.inlineformset_factory(
     Application, AddressEntry,
+    formset=ResumableInlineFormSet,
     fields=['line1', 'line2', 'town', 'postcode', 'move_in_date', 'move_out_date', 'is_current'],
     widgets={
         'line1': forms.TextInput(attrs={'class': 'input', 'required': 'true'}),
@@ -206,6 +237,7 @@ AddressEntryFormSet = forms.inlineformset_factory(
 # Employment FormSet
 EmploymentEntryFormSet = forms.inlineformset_factory(
     Application, EmploymentEntry,
+    formset=ResumableInlineFormSet,
     fields=['employer_name', 'role', 'start_date', 'end_date', 'is_current'],
     widgets={
         'employer_name': forms.TextInput(attrs={'class': 'input', 'required': 'true'}),
@@ -220,6 +252,7 @@ EmploymentEntryFormSet = forms.inlineformset_factory(
 # Household Member FormSet
 HouseholdMemberFormSet = forms.inlineformset_factory(
     Application, HouseholdMember,
+    formset=ResumableInlineFormSet,
     fields=['first_name', 'last_name', 'dob', 'relationship', 'is_adult'],
     widgets={
         'first_name': forms.TextInput(attrs={'class': 'input', 'required': 'true'}),
@@ -234,6 +267,7 @@ HouseholdMemberFormSet = forms.inlineformset_factory(
 # Reference FormSet
 ReferenceFormSet = forms.inlineformset_factory(
     Application, Reference,
+    formset=ResumableInlineFormSet,
     fields=['first_name', 'last_name', 'email', 'phone', 'relationship', 'years_known'],
     widgets={
         'first_name': forms.TextInput(attrs={'class': 'input', 'required': 'true'}),
@@ -0,0 +1,137 @@
+import json
+
+from django.db import router
+from django.db.models.signals import post_save
+from django.forms.models import model_to_dict
+from django.forms.utils import ErrorList
+
+
+def delta_field(prefix):
+    """POST field carrying a formset's delta, e.g. 'address-delta'."""
+    return f'{prefix}-delta'
+
+
+class FormsetDelta:
+    """
+    Bound stand-in for an inline formset when the client posts only what
+    changed, as JSON in the `<prefix>-delta` field instead of every row
+    and the management form:
+
+        {"added":   [{"key": "n1", "line1": "...", ...}],
+         "changed": [{"id": 12, "postcode": "LS1 1AA"}],
+         "deleted": [13]}
+
+    Rows are identified by their primary key. Added rows carry a
+    client-side `key`; save() returns {key: new id} so later deltas can
+    refer to them. Each row is validated with the formset's own form,
+    changed rows against their stored values. save() writes one bulk
+    INSERT, one bulk UPDATE and one DELETE.
+
+    It supports what register_view and fragments.section_errors() use on a
+    bound formset: is_valid(), forms, non_form_errors(), save(), prefix,
+    instance. Rendering it shows the stored rows, since a delta client
+    reads its errors from the JSON response.
+    """
+
+    def __init__(self, formset_class, data, prefix, instance=None):
+        self.formset_class = formset_class
+        self.model = formset_class.model
+        self.prefix = prefix
+        self.instance = instance
+        self._errors = ErrorList()
+        self.added, self.changed, self.deleted = [], [], []
+        try:
+            delta = json.loads(data[delta_field(prefix)])
+            self._parse(delta, data)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            self._errors.append('Malformed delta.')
+            self.added, self.changed, self.deleted = [], [], []
+        self.forms = self.added + self.changed
+
+    def _parse(self, delta, data):
+        form_class = self.formset_class.form
+        for row in delta.get('added', []):
+            row = dict(row)
+            key = str(row.pop('key'))
+            # Like a formset's extra forms, an added row left blank is skipped
+            self.added.append(form_class(self._prefixed(key, row), prefix=f'{self.prefix}-{key}',
+                                        empty_permitted=True, use_required_attribute=False))
+
+        changes = {int(row['id']): row for row in delta.get('changed', [])}
+        self.deleted = [int(pk) for pk in delta.get('deleted', [])]
+        if self.deleted and not self.formset_class.can_delete:
+            self._errors.append('Rows cannot be deleted here.')
+        wanted = set(changes) | set(self.deleted)
+        stored = {}
+        if wanted and self.instance is not None and self.instance.pk:
+            stored = {obj.pk: obj for obj in self.model.objects.filter(application=self.instance, pk__in=wanted)}
+        if wanted - set(stored):
+            self._errors.append('Unknown rows: ' + ', '.join(str(pk) for pk in sorted(wanted - set(stored))))
+        for pk, row in changes.items():
+            if pk not in stored:
+                continue
+            obj = stored[pk]
+            values = model_to_dict(obj, fields=form_class._meta.fields)
+            values.update((name, value) for name, value in row.items() if name != 'id')
+            self.changed.append(form_class(self._prefixed(pk, values), instance=obj, prefix=f'{self.prefix}-{pk}'))
+
+    def _prefixed(self, key, row):
+        return {f'{self.prefix}-{key}-{name}': value for name, value in row.items() if value is not None}
+
+    def __iter__(self):
+        return iter(self.stored_formset())
+
+    @property
+    def management_form(self):
+        return self.stored_formset().management_form
+
+    def stored_formset(self):
+        if not hasattr(self, '_stored_formset'):
+            self._stored_formset = self.formset_class(prefix=self.prefix, instance=self.instance)
+        return self._stored_formset
+
+    def non_form_errors(self):
+        return self._errors
+
+    def is_valid(self):
+        # Every row is validated, so all errors are reported at once
+        forms_valid = all([form.is_valid() for form in self.forms])
+        return forms_valid and not self._errors
+
+    def save(self):
+        """
+        Apply the delta for self.instance. bulk_create/bulk_update skip
+        save(), so derived fields are filled here and post_save is sent per
+        row: section history, checks, coverage and the cache stay in step.
+        Returns {client key: id} for the added rows.
+        """
+        using = router.db_for_write(self.model)
+        added = [form for form in self.added if form.has_changed()]
+        created = []
+        for form in added:
+            obj = form.save(commit=False)
+            obj.application = self.instance
+            created.append(obj)
+        changed = [form.save(commit=False) for form in self.changed]
+        for obj in created + changed:
+            if hasattr(obj, 'populate_derived_fields'):
+                obj.populate_derived_fields()
+        # Whatever differs from the loaded rows, derived fields included
+        # (e.g. a household member's is_adult after a dob change)
+        updated, fields = [], set()
+        for obj in changed:
+            diff = {name for name, value in obj._loaded_values.items() if getattr(obj, name) != value}
+            if diff:
+                updated.append(obj)
+                fields |= diff
+
+        self.model.objects.bulk_create(created)
+        if updated:
+            self.model.objects.bulk_update(updated, sorted(fields))
+        if self.deleted:
+            # Not a fast delete: post_delete receivers run per row
+            self.model.objects.filter(application=self.instance, pk__in=self.deleted).delete()
+
+        for obj, created_flag in [(obj, True) for obj in created] + [(obj, False) for obj in updated]:
+            post_save.send(sender=self.model, instance=obj, created=created_flag, raw=False, using=using, update_fields=None)
+        return {form.prefix[len(self.prefix) + 1:]: obj.pk for form, obj in zip(added, created)}
@@ -0,0 +1,87 @@
+from django.core.cache import caches
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.core.cache.utils import make_template_fragment_key
+from django.template.loader import render_to_string
+
+# Sections of the register page in page order; each is applications/register/<key>.html
+REGISTER_SECTIONS = [
+    'personal', 'addresses', 'premises', 'service', 'training',
+    'employment', 'household', 'suitability', 'declaration',
+]
+
+# Form/formset prefix -> section its fields are rendered in
+FORM_SECTIONS = {
+    'personal': 'personal', 'address': 'addresses', 'premises': 'premises', 'service': 'service',
+    'training': 'training', 'employment': 'employment', 'reference': 'employment',
+    'household': 'household', 'suitability': 'suitability', 'declaration': 'declaration',
+}
+
+# Inputs rendered in another section than the rest of their form
+FIELD_SECTIONS = {
+    'personal-lived_outside_uk': 'addresses',
+    'personal-military_base_abroad': 'addresses',
+}
+
+# Same alias the {% cache %} tag uses
+FRAGMENT_CACHE_ALIAS = 'template_fragments'
+
+
+def section_template(key):
+    return f'applications/register/{key}.html'
+
+
+def fragment_vary(application):
+    """
+    Everything an unbound register section depends on: nothing for a blank
+    form, otherwise the application's section rows (via cache_version, see
+    applications.app_cache) and the household flags on the application row.
+    """
+    if application is None:
+        return ['blank']
+    return [application.pk, application.cache_version, application.has_adults_in_home, application.has_children_in_home]
+
+
+def render_sections(context, keys=REGISTER_SECTIONS, vary_on=None):
+    """
+    Render register sections as [(key, html)]. With `vary_on` (unbound
+    forms only: bound ones echo the POST), each section is cached as a
+    template fragment, fetched with one get_many, and only misses render.
+    """
+    if vary_on is None:
+        return [(key, render_to_string(section_template(key), context)) for key in keys]
+    cache = caches[FRAGMENT_CACHE_ALIAS]
+    cache_keys = {key: make_template_fragment_key(f'register.{key}', vary_on) for key in keys}
+    found = cache.get_many(cache_keys.values())
+    missing = {
+        cache_keys[key]: render_to_string(section_template(key), context)
+        for key in keys if cache_keys[key] not in found
+    }
+    cache.set_many(missing)
+    found.update(missing)
+    return [(key, found[cache_keys[key]]) for key in keys]
+
+
+def section_errors(forms, formsets):
+    """
+    Validation errors of bound forms and formsets grouped by the section
+    they're rendered in: {section key: {input name: [messages]}}. Non-field
+    errors are keyed by the form's prefix, non-form errors by the formset's.
+    """
+    errors = {}
+
+    def add(prefix, name, messages):
+        section = FIELD_SECTIONS.get(name, FORM_SECTIONS[prefix])
+        errors.setdefault(section, {})[name] = [str(message) for message in messages]
+
+    def add_form(prefix, form):
+        for field, messages in form.errors.items():
+            add(prefix, form.prefix if field == NON_FIELD_ERRORS else form.add_prefix(field), messages)
+
+    for form in forms:
+        add_form(form.prefix, form)
+    for formset in formsets:
+        if formset.non_form_errors():
+            add(formset.prefix, formset.prefix, formset.non_form_errors())
+        for form in formset.forms:
+            add_form(formset.prefix, form)
+    return {key: errors[key] for key in REGISTER_SECTIONS if key in errors}
@@ -0,0 +1,142 @@
+import contextvars
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Max, Q
+
+from .db import retry_on_locked
+from .encryption import open_row, seal_row
+from .models import SectionChange
+from .serializers import SECTIONS, _field_names, _plain
+
+# A full copy of the row is kept on version 1 and every Nth version after it
+CHECKPOINT_INTERVAL = 10
+
+SECTION_KEYS = {model: key for key, model in SECTIONS}
+SECTION_MODELS = dict(SECTIONS)
+
+# Changes made during the current collect() block, written together at its end
+_buffer = contextvars.ContextVar('section_history', default=None)
+
+
+def row_state(instance):
+    """The section row as {attname: JSON-safe value}, in the export format."""
+    return {name: _plain(getattr(instance, name)) for name in _field_names(type(instance))}
+
+
+def record_save(instance, created):
+    """Queue a change row for a saved section instance, holding only the fields that changed."""
+    state = row_state(instance)
+    loaded = getattr(instance, '_loaded_values', None)
+    if created or loaded is None:
+        changes = state
+    else:
+        missing = object()
+        changes = {
+            name: value for name, value in state.items()
+            if _plain(loaded.get(name, missing)) != value
+        }
+    # The next save of this instance diffs against what was just written
+    instance._loaded_values = {name: getattr(instance, name) for name in state}
+    if changes:
+        # Diffed in plaintext, stored with encrypted fields (NI/DBS numbers) still encrypted
+        model = type(instance)
+        _enqueue(SectionChange(
+            application_id=instance.application_id, section=SECTION_KEYS[model],
+            object_id=instance.pk, action='create' if created else 'update', changes=seal_row(model, changes),
+        ), seal_row(model, state))
+
+
+def record_delete(instance):
+    _enqueue(SectionChange(
+        application_id=instance.application_id, section=SECTION_KEYS[type(instance)],
+        object_id=instance.pk, action='delete', changes={},
+    ), None)
+
+
+def _enqueue(change, state):
+    change.full_state = state
+    buffer = _buffer.get()
+    if buffer is None:
+        # In the caller's transaction, so the edit and its history commit together
+        write_changes([change])
+    else:
+        buffer.append(change)
+
+
+@contextmanager
+def collect():
+    """
+    Buffer the changes made inside the block and bulk-insert them at its end.
+    The block is atomic and the insert is its last statement, so the edits
+    and their history commit, or roll back, together.
+    """
+    if _buffer.get() is not None:
+        yield
+        return
+    buffer = []
+    token = _buffer.set(buffer)
+    try:
+        with transaction.atomic(savepoint=False):
+            yield
+            if buffer:
+                write_changes(buffer)
+    finally:
+        _buffer.reset(token)
+
+
+@retry_on_locked
+def write_changes(changes):
+    """
+    Number and insert change rows: one grouped MAX(version) query for the
+    rows touched, then a single bulk INSERT. Version 1 and every CHECKPOINT_INTERVAL-th
+    version keep the full row in `state`. A concurrent writer that allocated
+    the same version fails on the unique (section, object_id, version)
+    constraint, and its edit rolls back with it.
+    """
+    by_section = defaultdict(set)
+    for change in changes:
+        by_section[change.section].add(change.object_id)
+    rows_touched = Q()
+    for section, object_ids in by_section.items():
+        rows_touched |= Q(section=section, object_id__in=object_ids)
+    # A failure is never handled inside the caller's transaction, so no savepoint
+    with transaction.atomic(savepoint=False):
+        versions = {
+            (section, object_id): version
+            for section, object_id, version in SectionChange.objects.filter(rows_touched).order_by()
+            .values('section', 'object_id').annotate(version=Max('version')).values_list('section', 'object_id', 'version')
+        }
+        for change in changes:
+            key = (change.section, change.object_id)
+            change.version = versions.get(key, 0) + 1
+            versions[key] = change.version
+            if change.full_state is not None and (change.version == 1 or change.version % CHECKPOINT_INTERVAL == 0):
+                change.state = change.full_state
+        SectionChange.objects.bulk_create(changes)
+
+
+def reconstruct(section, object_id, version=None):
+    """
+    The section row as it was at `version` (default: latest), or None if it
+    didn't exist or had been deleted. Reads the nearest checkpoint at or
+    before `version` plus the diffs after it.
+    """
+    rows = SectionChange.objects.filter(section=section, object_id=object_id)
+    if version is not None:
+        rows = rows.filter(version__lte=version)
+    checkpoint = rows.filter(state__isnull=False).order_by('-version').first()
+    if checkpoint is None:
+        return None
+    state = dict(checkpoint.state)
+    for change in rows.filter(version__gt=checkpoint.version).order_by('version'):
+        if change.action == 'delete':
+            return None
+        state.update(change.changes)
+    return open_row(SECTION_MODELS[section], state)
+
+
+def application_history(application_id):
+    """Every change to the application's sections, oldest first."""
+    return SectionChange.objects.filter(application_id=application_id).order_by('created_at', 'id')
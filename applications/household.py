@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models import BooleanField, Case, Exists, F, OuterRef, Q, Value, When
+
+from .db import retry_on_locked
+from .models import Application, HouseholdMember
+
+
+def adult_q(cutoff):
+    """Members who are adults as of `cutoff`: by dob when known, else as entered."""
+    return Q(dob__lte=cutoff) | Q(dob__isnull=True, is_adult=True)
+
+
+def misclassified(cutoff):
+    """Members with a known dob whose stored is_adult disagrees with `cutoff`."""
+    return HouseholdMember.objects.filter(
+        Q(is_adult=False, dob__lte=cutoff) | Q(is_adult=True, dob__gt=cutoff)
+    )
+
+
+def refresh_household_flags(applications, cutoff=None, bump_cache=False):
+    """
+    Set has_adults_in_home / has_children_in_home on an Application queryset
+    from its listed members, in one UPDATE with correlated EXISTS. With
+    `bump_cache`, the same UPDATE invalidates their applications.app_cache
+    entries.
+    """
+    cutoff = cutoff or HouseholdMember.adult_cutoff()
+    members = HouseholdMember.objects.filter(application=OuterRef('pk'))
+    extra = {'cache_version': F('cache_version') + 1} if bump_cache else {}
+    return applications.update(
+        has_adults_in_home=Exists(members.filter(adult_q(cutoff))),
+        has_children_in_home=Exists(members.exclude(adult_q(cutoff))),
+        **extra,
+    )
+
+
+@retry_on_locked
+def reclassify_members(today=None):
+    """
+    Bring is_adult in line with dob for every member as of `today`. One
+    UPDATE refreshes the household flags of the applications affected, then
+    one date-based UPDATE flips the members. Returns (members changed,
+    applications refreshed).
+    """
+    cutoff = HouseholdMember.adult_cutoff(today)
+    changed = misclassified(cutoff)
+    with transaction.atomic():
+        # Flags first: afterwards nothing is left to identify the affected applications by.
+        # The member UPDATE skips signals, so their cached entries are bumped here too.
+        applications = refresh_household_flags(
+            Application.objects.filter(Exists(changed.filter(application=OuterRef('pk')))), cutoff, bump_cache=True,
+        )
+        members = changed.update(is_adult=Case(
+            When(dob__lte=cutoff, then=Value(True)), default=Value(False), output_field=BooleanField(),
+        ))
+    return members, applications
@@ -1,113 +1,65 @@
 from django.core.management.base import BaseCommand
-from applications.models import Application, Premises, ChildcareService, Training, Suitability, Declaration
+from django.db import models
+from django.db.models import Q
+from applications.checks import deferred_recompute
+from applications.models import Premises, ChildcareService, Training, Suitability, Declaration
+
+# Section models and the fields that make a record worth keeping
+SECTION_FIELDS = [
+    (Premises, ['local_authority', 'premises_type', 'has_outdoor_space', 'has_pets', 'pets_details']),
+    (ChildcareService, ['care_age_0_5', 'care_age_5_8', 'care_age_8_plus', 'work_with_assistants', 'number_of_assistants']),
+    (Training, [
+        'first_aid_completed', 'safeguarding_completed', 'eyfs_completed', 'level2_qual_completed',
+        'food_hygiene_completed', 'first_aid_date', 'safeguarding_date',
+    ]),
+    # The blind index is set exactly when there is a DBS number, so nothing is decrypted
+    (Suitability, [
+        'has_medical_condition', 'is_disqualified', 'social_services_involved', 'has_dbs',
+        'medical_condition_details', 'social_services_details', 'dbs_number_index',
+    ]),
+    (Declaration, [
+        'consent_auth_contact', 'consent_auth_share', 'consent_understand_usage', 'consent_understand_gdpr',
+        'consent_truth', 'signature', 'print_name', 'date_signed',
+    ]),
+]
+
+
+def blank(model, name):
+    """Q for rows where `name` holds no data: NULL, '', False or a count of 0."""
+    field = model._meta.get_field(name)
+    q = Q(**{f'{name}__isnull': True})
+    if isinstance(field, models.BooleanField):
+        q |= Q(**{name: False})
+    elif isinstance(field, models.IntegerField):
+        q |= Q(**{f'{name}__lte': 0})
+    elif isinstance(field, (models.CharField, models.TextField)):
+        q |= Q(**{name: ''})
+    return q
+
+
+def empty_records(model, names):
+    query = Q()
+    for name in names:
+        query &= blank(model, name)
+    return model.objects.filter(query)
 
 
 class Command(BaseCommand):
     help = 'Cleans up empty Premises, ChildcareService, Training, Suitability, and Declaration records that only contain default values'
 
+    @deferred_recompute()
     def handle(self, *args, **options):
         self.stdout.write('Starting cleanup of empty records...\n')
-        
-        # Clean up empty Premises
-        empty_premises = []
-        for premises in Premises.objects.all():
-            has_data = (
-                premises.local_authority or 
-                premises.premises_type or 
-                premises.has_outdoor_space or 
-                premises.has_pets or 
-                premises.pets_details
-            )
-            if not has_data:
-                empty_premises.append(premises.id)
-        
-        if empty_premises:
-            count = Premises.objects.filter(id__in=empty_premises).delete()[0]
-            self.stdout.write(self.style.SUCCESS(f'✓ Deleted {count} empty Premises records'))
-        else:
-            self.stdout.write('  No empty Premises records found')
-        
-        # Clean up empty ChildcareService
-        empty_services = []
-        for service in ChildcareService.objects.all():
-            has_data = (
-                service.care_age_0_5 or 
-                service.care_age_5_8 or 
-                service.care_age_8_plus or
-                service.work_with_assistants or
-                service.number_of_assistants > 0
-            )
-            if not has_data:
-                empty_services.append(service.id)
-        
-        if empty_services:
-            count = ChildcareService.objects.filter(id__in=empty_services).delete()[0]
-            self.stdout.write(self.style.SUCCESS(f'✓ Deleted {count} empty ChildcareService records'))
-        else:
-            self.stdout.write('  No empty ChildcareService records found')
-        
-        # Clean up empty Training
-        empty_training = []
-        for training in Training.objects.all():
-            has_data = (
-                training.first_aid_completed or
-                training.safeguarding_completed or
-                training.eyfs_completed or
-                training.level2_qual_completed or
-                training.food_hygiene_completed or
-                training.first_aid_date or
-                training.safeguarding_date
-            )
-            if not has_data:
-                empty_training.append(training.id)
-        
-        if empty_training:
-            count = Training.objects.filter(id__in=empty_training).delete()[0]
-            self.stdout.write(self.style.SUCCESS(f'✓ Deleted {count} empty Training records'))
-        else:
-            self.stdout.write('  No empty Training records found')
-        
-        # Clean up empty Suitability
-        empty_suitability = []
-        for suitability in Suitability.objects.all():
-            has_data = (
-                suitability.has_medical_condition or
-                suitability.is_disqualified or
-                suitability.social_services_involved or
-                suitability.has_dbs or
-                suitability.medical_condition_details or
-                suitability.social_services_details or
-                suitability.dbs_number
-            )
-            if not has_data:
-                empty_suitability.append(suitability.id)
-        
-        if empty_suitability:
-            count = Suitability.objects.filter(id__in=empty_suitability).delete()[0]
-            self.stdout.write(self.style.SUCCESS(f'✓ Deleted {count} empty Suitability records'))
-        else:
-            self.stdout.write('  No empty Suitability records found')
-        
-        # Clean up empty Declaration
-        empty_declaration = []
-        for declaration in Declaration.objects.all():
-            has_data = (
-                declaration.consent_auth_contact or
-                declaration.consent_auth_share or
-                declaration.consent_understand_usage or
-                declaration.consent_understand_gdpr or
-                declaration.consent_truth or
-                declaration.signature or
-                declaration.print_name or
-                declaration.date_signed
-            )
-            if not has_data:
-                empty_declaration.append(declaration.id)
-        
-        if empty_declaration:
-            count = Declaration.objects.filter(id__in=empty_declaration).delete()[0]
-            self.stdout.write(self.style.SUCCESS(f'✓ Deleted {count} empty Declaration records'))
-        else:
-            self.stdout.write('  No empty Declaration records found')
-        
+
+        # Empty rows are found in SQL; only those are loaded, by delete()'s signal handling.
+        # delete() takes the write lock even when nothing matches, so check first.
+        for model, names in SECTION_FIELDS:
+            label = model.__name__
+            empty = empty_records(model, names)
+            count = empty.delete()[0] if empty.exists() else 0
+            if count:
+                self.stdout.write(self.style.SUCCESS(f'✓ Deleted {count} empty {label} records'))
+            else:
+                self.stdout.write(f'  No empty {label} records found')
+
         self.stdout.write(self.style.SUCCESS('\n✓ Cleanup complete!'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from applications.duplicates import cluster_duplicates
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = (
+        'Finds applications started more than once by the same applicant (matching NI '
+        'number, email, or name and date of birth) and links each to the earliest one '
+        'via Application.duplicate_of. One sorted index scan per match key, so it runs '
+        'in one pass over the table rather than comparing applications pairwise.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows fetched per round trip')
+        parser.add_argument('--dry-run', action='store_true', help='Report clusters without updating links')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be >= 1')
+
+        canonical = cluster_duplicates(chunk_size=batch_size)
+        clusters = len(set(canonical.values()))
+        self.stdout.write(f'  {len(canonical)} duplicate applications in {clusters} clusters')
+        if options['dry_run']:
+            return
+
+        current = dict(Application.objects.filter(duplicate_of__isnull=False).values_list('pk', 'duplicate_of'))
+        changed = [
+            Application(pk=app_id, duplicate_of_id=canonical.get(app_id))
+            for app_id in set(current) | set(canonical)
+            if current.get(app_id) != canonical.get(app_id)
+        ]
+        with transaction.atomic():
+            Application.objects.bulk_update(changed, ['duplicate_of'], batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'✓ Updated {len(changed)} duplicate links'))
@@ -0,0 +1,72 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from applications import postcodes
+from applications.models import LocalAuthority, PostcodePrefix
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads a postcode→local authority CSV (e.g. the ONS Postcode Directory) into the '
+        'compact PostcodePrefix table, replacing the previous dataset. Districts and '
+        'sectors that lie in one authority are stored as a single prefix.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV with a header row')
+        parser.add_argument('--postcode-column', default='pcds', help='Postcode column (default: pcds)')
+        parser.add_argument('--code-column', default='laua', help='Authority code column (default: laua)')
+        parser.add_argument('--name-column', help='Authority name column, if names are in the same file')
+        parser.add_argument('--names', help='Separate CSV of authority code,name (header row skipped)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be >= 1')
+
+        names, rows, skipped = {}, [], 0
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as f:
+                reader = csv.DictReader(f)
+                missing = {options['postcode_column'], options['code_column'], options['name_column']} - set(reader.fieldnames or []) - {None}
+                if missing:
+                    raise CommandError(f'Columns not found in {options["path"]}: {", ".join(sorted(missing))}')
+                for record in reader:
+                    postcode = postcodes.normalize_postcode(record[options['postcode_column']])
+                    code = record[options['code_column']].strip()
+                    if not code or not postcode or not postcodes.POSTCODE_RE.match(postcode.replace(' ', '')):
+                        skipped += 1
+                        continue
+                    rows.append((postcode, code))
+                    if options['name_column']:
+                        names[code] = record[options['name_column']].strip()
+            if options['names']:
+                with open(options['names'], newline='', encoding='utf-8-sig') as f:
+                    reader = csv.reader(f)
+                    next(reader, None)
+                    names.update((code.strip(), name.strip()) for code, name, *_ in reader)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        rows.sort()
+        prefixes = list(postcodes.compact(rows))
+        codes = {code for _, code in prefixes}
+        with transaction.atomic():
+            PostcodePrefix.objects.all().delete()
+            LocalAuthority.objects.all().delete()
+            LocalAuthority.objects.bulk_create(
+                [LocalAuthority(code=code, name=names.get(code, code)) for code in sorted(codes)], batch_size=batch_size
+            )
+            PostcodePrefix.objects.bulk_create(
+                [PostcodePrefix(prefix=prefix, authority_id=code) for prefix, code in prefixes], batch_size=batch_size
+            )
+        postcodes.clear_cache()
+
+        if skipped:
+            self.stdout.write(f'  Skipped {skipped} rows without a valid postcode or authority code')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Loaded {len(rows)} postcodes as {len(prefixes)} prefixes across {len(codes)} authorities'
+        ))
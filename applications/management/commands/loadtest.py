@@ -0,0 +1,91 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from benchmarks.load import run_load
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs concurrent applicant autosaves/submits and staff dashboard reads, then reports '
+        'throughput, p50/p95/p99 latency and "database is locked" error rates. By default the '
+        'WSGI app is driven in-process against a throwaway file-backed database; pass --url to '
+        'load a running server instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applicants', type=int, default=200, help='Concurrent applicant threads')
+        parser.add_argument('--staff', type=int, default=5, help='Concurrent dashboard threads')
+        parser.add_argument('--iterations', type=int, default=5, help='Requests per thread')
+        parser.add_argument('--no-submit', action='store_true', help='Applicants only autosave, never submit')
+        parser.add_argument('--seed-count', type=int, default=1000,
+                            help='Applications to seed into the throwaway database (in-process mode only)')
+        parser.add_argument('--url', help='Base URL of a running server, e.g. http://localhost:8000')
+        parser.add_argument('--output', help='Also write the report as JSON to this path')
+        parser.add_argument('--no-tuning', action='store_true',
+                            help='In-process only: run with stock SQLite settings (rollback journal, no '
+                                 'busy_timeout pragma, deferred transactions, no write retries) for comparison')
+
+    def handle(self, *args, **options):
+        if options['applicants'] < 0 or options['staff'] < 0 or options['applicants'] + options['staff'] == 0:
+            raise CommandError('Need at least one applicant or staff thread')
+
+        load_kwargs = {
+            'applicants': options['applicants'],
+            'staff': options['staff'],
+            'iterations': options['iterations'],
+            'submit': not options['no_submit'],
+        }
+        if options['url']:
+            report = run_load(base_url=options['url'], **load_kwargs)
+        elif options['no_tuning']:
+            # Threads' connections share this settings dict, so the change applies to all of them
+            db_options = connection.settings_dict['OPTIONS']
+            transaction_mode = db_options.pop('transaction_mode', None)
+            try:
+                with override_settings(SQLITE_PRAGMAS={'journal_mode': 'DELETE'}, DB_WRITE_RETRIES=0):
+                    report = self._run_in_process(options['seed_count'], load_kwargs)
+            finally:
+                if transaction_mode:
+                    db_options['transaction_mode'] = transaction_mode
+        else:
+            report = self._run_in_process(options['seed_count'], load_kwargs)
+
+        self.stdout.write(f'Elapsed: {report["elapsed_s"]}s')
+        self.stdout.write(f'  {"kind":<14} {"reqs":>6} {"rps":>8} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"errors":>7} {"locked":>7}')
+        for kind, row in report['kinds'].items():
+            self.stdout.write(
+                f'  {kind:<14} {row["requests"]:>6} {row["throughput_rps"]:>8} {row["p50_ms"]:>9} '
+                f'{row["p95_ms"]:>9} {row["p99_ms"]:>9} {row["error_rate"]:>7.2%} {row["locked_rate"]:>7.2%}'
+            )
+            other = {k: v for k, v in row['outcomes'].items() if k not in ('ok', 'locked')}
+            if other:
+                self.stdout.write(f'    other errors: {other}')
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+
+    def _run_in_process(self, seed_count, load_kwargs):
+        # A real file (not the in-memory test DB) so SQLite locking behaves as in production
+        tmp_dir = tempfile.mkdtemp()
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tmp_dir, 'loadtest.sqlite3')
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            if seed_count:
+                call_command('seed_applications', count=seed_count, seed=seed_count, stdout=StringIO())
+            connection.close()
+            return run_load(**load_kwargs)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            # WAL mode can leave -wal/-shm files next to the database
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications import app_cache, postcodes
+from applications.models import AddressEntry, Premises
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-normalises every AddressEntry postcode and re-derives the local authority '
+        'codes of addresses and premises from the loaded dataset. Run after load_postcodes '
+        'and once for rows saved before postcodes were normalised. Only changed rows are written.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be >= 1')
+        if not postcodes.dataset_loaded():
+            self.stdout.write('  No postcode dataset loaded; only normalising postcodes')
+
+        addresses = self._update(AddressEntry, ['postcode', 'local_authority_code'], batch_size)
+        self.stdout.write(self.style.SUCCESS(f'✓ Updated {addresses} addresses'))
+        premises = self._update(Premises, ['local_authority', 'local_authority_code'], batch_size)
+        self.stdout.write(self.style.SUCCESS(f'✓ Updated {premises} premises'))
+
+    def _update(self, model, fields, batch_size):
+        changed, last_pk = 0, 0
+        while True:
+            batch = list(model.objects.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+            if not batch:
+                return changed
+            last_pk = batch[-1].pk
+            home_postcodes = {}
+            if model is Premises:
+                # One query per batch instead of one per own-home premises
+                home_postcodes = dict(
+                    AddressEntry.objects.filter(application_id__in=[p.application_id for p in batch], is_current=True)
+                    .values_list('application_id', 'postcode')
+                )
+            updates = []
+            for obj in batch:
+                before = [getattr(obj, name) for name in fields]
+                if model is Premises:
+                    obj.populate_derived_fields(home_postcode=home_postcodes.get(obj.application_id, ''))
+                else:
+                    obj.populate_derived_fields()
+                if [getattr(obj, name) for name in fields] != before:
+                    updates.append(obj)
+            model.objects.bulk_update(updates, fields)
+            # bulk_update sends no signals
+            app_cache.bump({obj.application_id for obj in updates})
+            changed += len(updates)
@@ -0,0 +1,27 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.household import reclassify_members
+
+
+class Command(BaseCommand):
+    help = (
+        'Updates HouseholdMember.is_adult for members who have reached (or, after a '
+        'corrected date of birth, not reached) adult age, and re-derives the affected '
+        'applications\' has_adults_in_home / has_children_in_home. Run nightly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Classify as of this date (YYYY-MM-DD, default today)')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be YYYY-MM-DD')
+
+        members, applications = reclassify_members(today)
+        self.stdout.write(self.style.SUCCESS(f'✓ Reclassified {members} household members ({applications} applications updated)'))
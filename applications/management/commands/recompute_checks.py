@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications import checks
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the stored Check rows from the Suitability, Training and Reference '
+        'sections. Use after bulk loads or imports that bypass the section save signals.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=checks.BATCH_SIZE, help='Applications per batch')
+        parser.add_argument('--status', help='Only recompute applications in this status')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be >= 1')
+
+        queryset = Application.objects.order_by('pk')
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+
+        seen = written = 0
+        batch = []
+        for app_id in queryset.values_list('pk', flat=True).iterator(chunk_size=batch_size):
+            batch.append(app_id)
+            if len(batch) >= batch_size:
+                written += checks.recompute_checks(batch)
+                seen += len(batch)
+                batch = []
+                self.stdout.write(f'  Checked {seen} applications...')
+        if batch:
+            written += checks.recompute_checks(batch)
+            seen += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Recomputed checks for {seen} applications ({written} rows written)'))
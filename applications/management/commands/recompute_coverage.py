@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications import coverage
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the stored address/employment HistoryCoverage rows. The window ends '
+        'today, so run it daily (and after bulk loads that bypass the save signals).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=coverage.BATCH_SIZE, help='Applications per batch')
+        parser.add_argument('--status', help='Only recompute applications in this status')
+        parser.add_argument('--kind', choices=list(coverage.COVERAGE_KINDS), help='Only this history (default: all)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be >= 1')
+
+        queryset = Application.objects.order_by('pk')
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+        kinds = [options['kind']] if options['kind'] else None
+
+        seen = written = 0
+        batch = []
+        for app_id in queryset.values_list('pk', flat=True).iterator(chunk_size=batch_size):
+            batch.append(app_id)
+            if len(batch) >= batch_size:
+                written += coverage.recompute_coverage(batch, kinds)
+                seen += len(batch)
+                batch = []
+                self.stdout.write(f'  Checked {seen} applications...')
+        if batch:
+            written += coverage.recompute_coverage(batch, kinds)
+            seen += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Recomputed history coverage for {seen} applications ({written} rows written)'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications import app_cache
+from applications.encryption import reencrypt
+from applications.models import PersonalDetails, Suitability
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-encrypts the NI and DBS number columns with the first of FIELD_ENCRYPTION_KEYS '
+        'and recomputes their blind indexes. Run after prepending a new key; once it '
+        'finishes, older keys can be dropped from the setting.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per UPDATE')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be >= 1')
+
+        for model in [PersonalDetails, Suitability]:
+            count = reencrypt(model, batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f'✓ Re-encrypted {count} {model.__name__} rows'))
+        # Cached dashboard entries hold ciphertext under the old keys
+        app_cache.bump_all()
+        self.stdout.write(self.style.SUCCESS('✓ Invalidated cached application entries'))
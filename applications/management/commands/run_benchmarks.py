@@ -0,0 +1,95 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from benchmarks.scenarios import SCENARIOS, BenchmarkContext, compare, measure
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds throwaway test databases of increasing size and times the dashboard, register '
+        'resume/new/invalid submit renders, save_and_exit, submit and cleanup_empty_records '
+        'paths. Results are written '
+        'as JSON and compared against the committed baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes',
+                            help='Comma separated application counts to benchmark '
+                                 '(default: the sizes recorded in the baseline, else 1000,10000,100000)')
+        parser.add_argument('--scenarios', help='Comma separated subset of scenarios to run')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per scenario (median is reported)')
+        parser.add_argument('--output', default='bench_output.json', help='Where to write the results JSON')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed relative growth in wall time and peak memory')
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Write these results to the baseline file instead of comparing')
+
+    def handle(self, *args, **options):
+        baseline_path = Path(options['baseline'])
+        if options['sizes']:
+            sizes = [int(s) for s in options['sizes'].split(',') if s.strip()]
+        elif baseline_path.exists():
+            # Only sizes that can be compared against something
+            sizes = sorted(int(size) for size in json.loads(baseline_path.read_text()))
+        else:
+            sizes = DEFAULT_SIZES
+        scenarios = SCENARIOS
+        if options['scenarios']:
+            wanted = set(options['scenarios'].split(','))
+            unknown = wanted - {name for name, _ in SCENARIOS}
+            if unknown:
+                raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+            scenarios = [(name, func) for name, func in SCENARIOS if name in wanted]
+
+        results = {}
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for size in sizes:
+                call_command('flush', interactive=False, verbosity=0)
+                self.stdout.write(f'Seeding {size} applications...')
+                call_command('seed_applications', count=size, seed=size, stdout=StringIO())
+                ctx = BenchmarkContext()
+                results[str(size)] = {}
+                for name, func in scenarios:
+                    result = measure(func, ctx, repeat=options['repeat'])
+                    results[str(size)][name] = result
+                    self.stdout.write(
+                        f'  {name:<24} {result["wall_ms"]:>10.2f} ms {result["queries"]:>6} queries '
+                        f'{result["peak_kib"]:>9} KiB'
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        with open(options['output'], 'w') as fh:
+            json.dump(results, fh, indent=2)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+        if options['update_baseline']:
+            baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+            baseline.update(results)
+            baseline_path.write_text(json.dumps(baseline, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'✓ Baseline updated at {baseline_path}'))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path}; skipping comparison'))
+            return
+        regressions = compare(results, json.loads(baseline_path.read_text()), options['tolerance'])
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(f'  ✗ {line}'))
+            raise CommandError(f'{len(regressions)} benchmark regression(s) against {baseline_path}')
+        self.stdout.write(self.style.SUCCESS('✓ No regressions against baseline'))
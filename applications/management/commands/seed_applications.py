@@ -0,0 +1,298 @@
+import datetime
+import random
+from collections import Counter
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from applications.checks import recompute_checks
+from applications.coverage import recompute_coverage
+from applications.models import (
+    Application, StatusCounter, PersonalDetails, AddressEntry, Premises,
+    ChildcareService, Training, EmploymentEntry, HouseholdMember,
+    Suitability, Declaration, Reference
+)
+
+FIRST_NAMES = ['Olivia', 'Amelia', 'Isla', 'Ava', 'Mia', 'Grace', 'Sophia', 'Aisha', 'Priya', 'Zara',
+               'Oliver', 'George', 'Noah', 'Arthur', 'Muhammad', 'Leo', 'Harry', 'Oscar', 'Jack', 'Yusuf']
+LAST_NAMES = ['Smith', 'Jones', 'Taylor', 'Brown', 'Williams', 'Wilson', 'Johnson', 'Davies', 'Patel', 'Khan',
+              'Robinson', 'Wright', 'Thompson', 'Evans', 'Walker', 'White', 'Roberts', 'Green', 'Hall', 'Wood']
+TOWNS = [('Leeds', 'LS'), ('Manchester', 'M'), ('Birmingham', 'B'), ('Bristol', 'BS'), ('Sheffield', 'S'),
+         ('Liverpool', 'L'), ('Newcastle', 'NE'), ('Nottingham', 'NG'), ('Leicester', 'LE'), ('York', 'YO')]
+STREETS = ['High Street', 'Station Road', 'Church Lane', 'Park Avenue', 'Mill Lane', 'Victoria Road', 'Green Lane']
+EMPLOYERS = ['Little Stars Nursery', 'NHS Trust', 'Tesco', 'County Council', 'Sunshine Pre-school', 'Self-employed']
+ROLES = ['Nursery Practitioner', 'Teaching Assistant', 'Nanny', 'Administrator', 'Retail Assistant', 'Carer']
+RELATIONSHIPS = ['Husband', 'Wife', 'Partner', 'Son', 'Daughter', 'Mother', 'Father', 'Lodger']
+REFERENCE_RELATIONSHIPS = ['Friend', 'Colleague', 'Former Employer', 'Neighbour']
+TRAINING_ORGS = ['St John Ambulance', 'Red Cross', 'NSPCC', 'Local Authority', 'PACEY']
+
+# Application numbers are RK-YEAR-NNNNN. Application._generate_application_number()
+# finds the last one by string order, which only matches numeric order at this width.
+MAX_PER_YEAR = 99999
+
+# Roughly the status split seen in production
+STATUS_WEIGHTS = [('DRAFT', 40), ('SUBMITTED', 30), ('CHECKS_IN_PROGRESS', 10), ('UNDER_REVIEW', 5), ('REGISTERED', 15)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates N synthetic applications with realistic section data for benchmarking. '
+        'Rows are written with bulk_create, so large datasets load in minutes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, required=True, help='Number of applications to create')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Applications inserted per batch')
+        parser.add_argument('--years', type=int, default=5, help='Spread created_at over this many past years')
+        parser.add_argument('--seed', type=int, help='Random seed for reproducible datasets')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        batch_size = options['batch_size']
+        if count < 0 or batch_size < 1 or options['years'] < 1:
+            raise CommandError('--count must be >= 0, --batch-size and --years must be >= 1')
+        if count > MAX_PER_YEAR * options['years']:
+            raise CommandError(
+                f'{count} applications over {options["years"]} years overflows the 5-digit yearly '
+                f'application numbers; pass --years {-(-count // MAX_PER_YEAR) + 1} or more'
+            )
+
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.span_seconds = options['years'] * 365 * 24 * 3600
+        # created_at comes from its own stream, replayed here so every year's
+        # numbers are known to fit before the first batch commits
+        dates_seed = self.rng.randrange(2 ** 32)
+        per_year = Counter(created_at.year for created_at in islice(self._created_dates(dates_seed), count))
+        self.sequences = {year: self._last_number(year) for year in per_year}
+        for year, n in sorted(per_year.items()):
+            if self.sequences[year] + n > MAX_PER_YEAR:
+                raise CommandError(
+                    f'{n} applications fall in {year}, which already has {self.sequences[year]}; '
+                    f'that overflows {MAX_PER_YEAR} yearly application numbers, pass a larger --years'
+                )
+        self.dates = self._created_dates(dates_seed)
+
+        created = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            with transaction.atomic():
+                self._create_batch(size)
+            created += size
+            self.stdout.write(f'  Created {created}/{count} applications...')
+
+        # bulk_create bypasses the counter updates in Application.save()
+        StatusCounter.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Seeded {count} applications'))
+
+    def _created_dates(self, seed):
+        rng = random.Random(seed)
+        while True:
+            yield self.now - datetime.timedelta(seconds=rng.randint(0, self.span_seconds))
+
+    def _last_number(self, year):
+        prefix = f'RK-{year}-'
+        numbers = Application.objects.filter(application_number__startswith=prefix).values_list('application_number', flat=True)
+        return max((int(n.split('-')[-1]) for n in numbers if n.split('-')[-1].isdigit()), default=0)
+
+    def _next_number(self, year):
+        """Allocate RK-YEAR-NNNNN numbers without going through Application.save()."""
+        self.sequences[year] += 1
+        return f'RK-{year}-{self.sequences[year]:05d}'
+
+    def _date_between(self, start, end):
+        if end <= start:
+            return start
+        return start + datetime.timedelta(days=self.rng.randint(0, (end - start).days))
+
+    def _create_batch(self, size):
+        rng = self.rng
+        statuses = [s for s, _ in STATUS_WEIGHTS]
+        weights = [w for _, w in STATUS_WEIGHTS]
+
+        apps = []
+        for _ in range(size):
+            created_at = next(self.dates)
+            updated_at = min(self.now, created_at + datetime.timedelta(days=rng.randint(0, 60)))
+            app = Application(
+                status=rng.choices(statuses, weights)[0],
+                application_number=self._next_number(created_at.year),
+                last_section_completed=rng.randint(0, 9),
+                created_at=created_at,
+                updated_at=updated_at,
+                status_changed_at=updated_at,
+            )
+            if app.status != 'DRAFT':
+                app.last_section_completed = 9
+            apps.append(app)
+
+        # UUID primary keys are assigned on instantiation, so sections can be
+        # built (and household flags set) before anything is inserted
+        sections = {model: [] for model in [
+            PersonalDetails, AddressEntry, Premises, ChildcareService, Training,
+            EmploymentEntry, HouseholdMember, Suitability, Declaration, Reference,
+        ]}
+        for app in apps:
+            self._build_sections(app, sections)
+
+        # bulk_create applies auto_now/auto_now_add, so restore the spread timestamps afterwards
+        timestamps = [(app.created_at, app.updated_at) for app in apps]
+        Application.objects.bulk_create(apps)
+        for app, (created_at, updated_at) in zip(apps, timestamps):
+            app.created_at, app.updated_at = created_at, updated_at
+        Application.objects.bulk_update(apps, ['created_at', 'updated_at'])
+
+        for model, objs in sections.items():
+            # bulk_create skips save(), so fill derived columns explicitly
+            if model is Premises:
+                # Home postcodes from the addresses built above (normalised
+                # already, as AddressEntry comes first), not one query per premises
+                home_postcodes = {a.application_id: a.postcode for a in sections[AddressEntry] if a.is_current}
+                for obj in objs:
+                    obj.populate_derived_fields(home_postcode=home_postcodes.get(obj.application_id, ''))
+            elif hasattr(model, 'populate_derived_fields'):
+                for obj in objs:
+                    obj.populate_derived_fields()
+            model.objects.bulk_create(objs)
+        # ... and the section signals that keep Check and HistoryCoverage rows current
+        recompute_checks([app.pk for app in apps])
+        recompute_coverage([app.pk for app in apps])
+
+    def _build_sections(self, app, sections):
+        rng = self.rng
+        submitted = app.status != 'DRAFT'
+        # Drafts stop part-way through the form
+        reached = 9 if submitted else app.last_section_completed
+        today = app.created_at.date()
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        dob = self._date_between(datetime.date(1960, 1, 1), datetime.date(2000, 12, 31))
+        town, area = rng.choice(TOWNS)
+
+        sections[PersonalDetails].append(PersonalDetails(
+            application=app,
+            title=rng.choice(['Mr', 'Mrs', 'Miss', 'Ms', 'Mx', 'Dr']),
+            first_name=first_name,
+            last_name=last_name,
+            dob=dob,
+            gender=rng.choice(['Female', 'Male']),
+            email=f'{first_name}.{last_name}{rng.randint(1, 9999)}@example.com'.lower(),
+            phone=f'07{rng.randint(100000000, 999999999)}',
+            ni_number=f'{rng.choice("ABCEGHJKLMNPRSTWXYZ")}{rng.choice("ABCEGHJKLMNPRSTWXYZ")}{rng.randint(0, 999999):06d}{rng.choice("ABCD")}',
+            right_to_work_status=rng.choice(PersonalDetails.RIGHT_TO_WORK_CHOICES)[0],
+        ))
+
+        if reached >= 1:
+            move_in = today
+            for i in range(rng.choices([1, 2, 3, 4], [40, 30, 20, 10])[0]):
+                move_out = move_in if i else None
+                move_in = move_in - datetime.timedelta(days=rng.randint(365, 365 * 4))
+                sections[AddressEntry].append(AddressEntry(
+                    application=app,
+                    line1=f'{rng.randint(1, 200)} {rng.choice(STREETS)}',
+                    town=town,
+                    postcode=f'{area}{rng.randint(1, 20)} {rng.randint(1, 9)}{rng.choice("ABDEFGHJLNPQRSTUWXYZ")}{rng.choice("ABDEFGHJLNPQRSTUWXYZ")}',
+                    move_in_date=move_in,
+                    move_out_date=move_out,
+                    is_current=(i == 0),
+                ))
+
+        if reached >= 2:
+            sections[Premises].append(Premises(
+                application=app,
+                local_authority=f'{town} City Council',
+                premises_type=rng.choices(['Domestic', 'Non-domestic'], [85, 15])[0],
+                has_outdoor_space=rng.random() < 0.8,
+                has_pets=rng.random() < 0.3,
+            ))
+
+        if reached >= 3:
+            sections[ChildcareService].append(ChildcareService(
+                application=app,
+                care_age_0_5=rng.random() < 0.9,
+                care_age_5_8=rng.random() < 0.6,
+                care_age_8_plus=rng.random() < 0.3,
+                work_with_assistants=rng.random() < 0.2,
+            ))
+
+        if reached >= 4:
+            first_aid = submitted or rng.random() < 0.6
+            safeguarding = submitted or rng.random() < 0.6
+            sections[Training].append(Training(
+                application=app,
+                first_aid_completed=first_aid,
+                first_aid_date=self._date_between(today - datetime.timedelta(days=1000), today) if first_aid else None,
+                first_aid_org=rng.choice(TRAINING_ORGS) if first_aid else None,
+                safeguarding_completed=safeguarding,
+                safeguarding_date=self._date_between(today - datetime.timedelta(days=1000), today) if safeguarding else None,
+                safeguarding_org=rng.choice(TRAINING_ORGS) if safeguarding else None,
+                eyfs_completed=rng.random() < 0.5,
+                food_hygiene_completed=rng.random() < 0.5,
+            ))
+
+        if reached >= 5:
+            start = today
+            for i in range(rng.choices([0, 1, 2, 3], [15, 40, 30, 15])[0]):
+                end = start if i else None
+                start = start - datetime.timedelta(days=rng.randint(180, 365 * 5))
+                sections[EmploymentEntry].append(EmploymentEntry(
+                    application=app,
+                    employer_name=rng.choice(EMPLOYERS),
+                    role=rng.choice(ROLES),
+                    start_date=start,
+                    end_date=end,
+                    is_current=(i == 0),
+                ))
+
+        if reached >= 6:
+            for _ in range(rng.choices([0, 1, 2, 3, 4], [25, 35, 20, 15, 5])[0]):
+                member_dob = self._date_between(datetime.date(1950, 1, 1), today)
+                is_adult = member_dob <= HouseholdMember.adult_cutoff(today)
+                app.has_adults_in_home = app.has_adults_in_home or is_adult
+                app.has_children_in_home = app.has_children_in_home or not is_adult
+                sections[HouseholdMember].append(HouseholdMember(
+                    application=app,
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=last_name,
+                    dob=member_dob,
+                    relationship=rng.choice(RELATIONSHIPS),
+                    is_adult=is_adult,
+                ))
+
+        if reached >= 7:
+            for _ in range(2 if submitted else rng.randint(0, 2)):
+                sections[Reference].append(Reference(
+                    application=app,
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    email=f'ref{rng.randint(1, 99999)}@example.com',
+                    phone=f'01{rng.randint(100000000, 999999999)}',
+                    relationship=rng.choice(REFERENCE_RELATIONSHIPS),
+                    years_known=rng.randint(2, 20),
+                ))
+
+        if reached >= 8:
+            has_dbs = submitted or rng.random() < 0.5
+            sections[Suitability].append(Suitability(
+                application=app,
+                has_medical_condition=rng.random() < 0.1,
+                has_dbs=has_dbs,
+                dbs_number=f'{rng.randint(0, 999999999999):012d}' if has_dbs else None,
+            ))
+
+        if reached >= 9:
+            full_name = f'{first_name} {last_name}'
+            sections[Declaration].append(Declaration(
+                application=app,
+                consent_auth_contact=True,
+                consent_auth_share=True,
+                consent_understand_usage=True,
+                consent_understand_gdpr=True,
+                consent_truth=True,
+                signature=full_name,
+                print_name=full_name,
+                date_signed=today,
+            ))
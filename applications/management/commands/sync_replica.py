@@ -0,0 +1,38 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from applications.routers import REPLICA_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies the primary SQLite database over the replica file configured as the '
+        '"replica" alias (DJANGO_REPLICA_DB), using SQLite\'s online backup so the '
+        'primary stays writable during the copy. For local testing of replica routing.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=1024,
+                            help='Pages copied per backup step; writers can interleave between steps')
+
+    def handle(self, *args, **options):
+        if REPLICA_DB_ALIAS not in connections.settings:
+            raise CommandError('No "replica" database configured; set DJANGO_REPLICA_DB')
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[REPLICA_DB_ALIAS]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('sync_replica only copies SQLite databases; use the backend\'s replication otherwise')
+        if str(primary.settings_dict['NAME']) == str(replica.settings_dict['NAME']):
+            raise CommandError('The replica points at the primary database file')
+
+        # Django's own replica connection would hold a stale read snapshot
+        replica.close()
+        primary.ensure_connection()
+        target = sqlite3.connect(str(replica.settings_dict['NAME']))
+        try:
+            primary.connection.backup(target, pages=options['pages'])
+        finally:
+            target.close()
+        self.stdout.write(self.style.SUCCESS(f'✓ Replica {replica.settings_dict["NAME"]} is up to date'))
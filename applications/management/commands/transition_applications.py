@@ -0,0 +1,57 @@
+import datetime
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from applications.models import Application
+from applications.workflow import bulk_transition, sources_for
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves applications to a new status with set-based updates, writing one '
+        'StatusTransition audit row per application. Only applications whose current '
+        'status allows the move are touched.'
+    )
+
+    def add_arguments(self, parser):
+        statuses = [code for code, _ in Application.STATUS_CHOICES]
+        parser.add_argument('--to', dest='to_status', required=True, choices=statuses, help='Target status')
+        parser.add_argument('--from', dest='from_status', choices=statuses, help='Only move applications in this status')
+        parser.add_argument('--ids', nargs='+', help='Application ids or numbers to move')
+        parser.add_argument('--created-before', help='Only move applications created before this date (YYYY-MM-DD)')
+        parser.add_argument('--note', default='', help='Note stored on each audit row')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many would move')
+
+    def handle(self, *args, **options):
+        if not (options['from_status'] or options['ids'] or options['created_before']):
+            raise CommandError('Refusing to move every application; pass --from, --ids or --created-before')
+
+        queryset = Application.objects.all()
+        if options['from_status']:
+            queryset = queryset.filter(status=options['from_status'])
+        if options['ids']:
+            numbers = [i for i in options['ids'] if i.upper().startswith('RK-')]
+            ids = [i for i in options['ids'] if i not in numbers]
+            try:
+                ids = [uuid.UUID(i) for i in ids]
+            except ValueError as e:
+                raise CommandError(f'Invalid application id: {e}')
+            queryset = queryset.filter(pk__in=ids) | queryset.filter(application_number__in=[n.upper() for n in numbers])
+        if options['created_before']:
+            created_before = parse_date(options['created_before'])
+            if created_before is None:
+                raise CommandError('--created-before must be YYYY-MM-DD')
+            # Compare against a datetime so the created_at index can be used
+            cutoff = timezone.make_aware(datetime.datetime.combine(created_before, datetime.time.min))
+            queryset = queryset.filter(created_at__lt=cutoff)
+
+        if options['dry_run']:
+            count = queryset.filter(status__in=sources_for(options['to_status'])).count()
+            self.stdout.write(f'{count} application(s) would move to {options["to_status"]}')
+            return
+
+        moved = bulk_transition(queryset, options['to_status'], note=options['note'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Moved {moved} application(s) to {options["to_status"]}'))
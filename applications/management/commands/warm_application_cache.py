@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications import app_cache
+from applications.models import Application
+from applications.serializers import dashboard_sections
+
+
+class Command(BaseCommand):
+    help = (
+        'Fills the per-application dashboard cache (APPLICATION_CACHE_ALIAS) for entries '
+        'that are missing or out of date. Useful after a deploy with a file-based cache, '
+        'or after bulk changes that bumped many cache versions.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Applications per batch')
+        parser.add_argument('--status', help='Only warm applications in this status')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be >= 1')
+
+        queryset = Application.objects.only('pk', 'cache_version').order_by('pk')
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+
+        built = 0
+
+        def build(applications):
+            nonlocal built
+            built += len(applications)
+            return dashboard_sections(applications)
+
+        seen = 0
+        batch = []
+        for application in queryset.iterator(chunk_size=batch_size):
+            batch.append(application)
+            if len(batch) >= batch_size:
+                app_cache.get_many(batch, app_cache.DASHBOARD, build)
+                seen += len(batch)
+                batch = []
+                self.stdout.write(f'  Checked {seen} applications...')
+        if batch:
+            app_cache.get_many(batch, app_cache.DASHBOARD, build)
+            seen += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Checked {seen} applications ({built} cache entries built)'))
@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+
+from .routers import STICKY_SESSION_KEY, replica_configured, track_writes
+
+
+class ReplicaStickinessMiddleware:
+    """
+    After a request writes to the database, pin its session to the primary
+    for REPLICA_STICKY_SECONDS so the next pages (e.g. the dashboard after
+    save-and-exit) show the user's own changes even if the replica lags.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+        with track_writes() as state:
+            response = self.get_response(request)
+        if state['wrote'] and hasattr(request, 'session'):
+            request.session[STICKY_SESSION_KEY] = time.time() + getattr(settings, 'REPLICA_STICKY_SECONDS', 60)
+        return response
+
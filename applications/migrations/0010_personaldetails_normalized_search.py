@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+# Frozen copy of applications.models.normalize_search_text as of this migration
+def normalize_search_text(value):
+    if not value:
+        return None
+    return ' '.join(value.split()).lower() or None
+
+
+def backfill_normalized_fields(apps, schema_editor):
+    PersonalDetails = apps.get_model('applications', 'PersonalDetails')
+    batch = []
+    for pd in PersonalDetails.objects.only('first_name', 'last_name', 'email').iterator(chunk_size=2000):
+        pd.normalized_first_name = normalize_search_text(pd.first_name)
+        pd.normalized_last_name = normalize_search_text(pd.last_name)
+        pd.normalized_email = normalize_search_text(pd.email)
+        batch.append(pd)
+        if len(batch) >= 2000:
+            PersonalDetails.objects.bulk_update(batch, ['normalized_first_name', 'normalized_last_name', 'normalized_email'])
+            batch = []
+    PersonalDetails.objects.bulk_update(batch, ['normalized_first_name', 'normalized_last_name', 'normalized_email'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0009_backfill_numbers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personaldetails',
+            name='normalized_email',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name='personaldetails',
+            name='normalized_first_name',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='personaldetails',
+            name='normalized_last_name',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_normalized_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0010_personaldetails_normalized_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='status',
+            field=models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('CHECKS_IN_PROGRESS', 'Checks in progress'), ('UNDER_REVIEW', 'Under review'), ('REGISTERED', 'Registered')], default='DRAFT', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('CHECKS_IN_PROGRESS', 'Checks in progress'), ('UNDER_REVIEW', 'Under review'), ('REGISTERED', 'Registered')], max_length=20)),
+                ('to_status', models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('CHECKS_IN_PROGRESS', 'Checks in progress'), ('UNDER_REVIEW', 'Under review'), ('REGISTERED', 'Registered')], max_length=20)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='applications.application')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0011_status_workflow_transitions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='addressentry',
+            index=models.Index(fields=['postcode'], name='address_postcode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='addressentry',
+            index=models.Index(fields=['application', '-move_in_date'], name='address_app_move_in_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-created_at', '-id'], name='app_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='app_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['updated_at'], name='app_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaldetails',
+            index=models.Index(fields=['email'], name='pd_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaldetails',
+            index=models.Index(fields=['ni_number'], name='pd_ni_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaldetails',
+            index=models.Index(fields=['last_name'], name='pd_last_name_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:34
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def backfill_status_tracking(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    StatusCounter = apps.get_model('applications', 'StatusCounter')
+    # Best available approximation of when each application entered its stage
+    Application.objects.update(status_changed_at=F('updated_at'))
+    # One row per status, so StatusCounter.adjust() is always a single UPDATE
+    counts = {status: 0 for status, _ in Application._meta.get_field('status').choices}
+    counts.update(Application.objects.order_by().values_list('status').annotate(n=Count('pk')))
+    StatusCounter.objects.bulk_create([StatusCounter(status=status, count=n) for status, n in counts.items()])
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0012_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCounter',
+            fields=[
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('CHECKS_IN_PROGRESS', 'Checks in progress'), ('UNDER_REVIEW', 'Under review'), ('REGISTERED', 'Registered')], max_length=20, primary_key=True, serialize=False)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'status_changed_at'], name='app_status_changed_idx'),
+        ),
+        migrations.RunPython(backfill_status_tracking, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+# Frozen copies of applications.checks as of this migration; Check.details
+# still held the full DBS number then (0017 masks it)
+CHECK_TYPES = ['dbs', 'la_check', 'ofsted', 'gp_health', 'ref_1', 'ref_2', 'first_aid', 'safeguarding']
+
+
+def compute_checks(suitability, training, reference_count):
+    checks = {}
+    if suitability and suitability['has_dbs']:
+        checks['dbs'] = ('complete', suitability['dbs_number'] or '')
+    elif suitability and suitability['dbs_number']:
+        checks['dbs'] = ('pending', '')
+    else:
+        checks['dbs'] = ('not-started', '')
+    checks['ref_1'] = ('pending' if reference_count >= 1 else 'not-started', '')
+    checks['ref_2'] = ('pending' if reference_count >= 2 else 'not-started', '')
+    for course in ['first_aid', 'safeguarding']:
+        done = training and training[f'{course}_completed']
+        checks[course] = ('complete' if done else 'not-started', '')
+    return checks
+
+
+def backfill_checks(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    Check = apps.get_model('applications', 'Check')
+    Suitability = apps.get_model('applications', 'Suitability')
+    Training = apps.get_model('applications', 'Training')
+    Reference = apps.get_model('applications', 'Reference')
+    app_ids = list(Application.objects.values_list('pk', flat=True))
+    for start in range(0, len(app_ids), 1000):
+        batch = app_ids[start:start + 1000]
+        suitability = {
+            row['application_id']: row
+            for row in Suitability.objects.filter(application_id__in=batch).values('application_id', 'has_dbs', 'dbs_number')
+        }
+        training = {
+            row['application_id']: row
+            for row in Training.objects.filter(application_id__in=batch).values(
+                'application_id', 'first_aid_completed', 'safeguarding_completed'
+            )
+        }
+        references = dict(
+            Reference.objects.filter(application_id__in=batch).order_by()
+            .values_list('application_id').annotate(n=Count('pk'))
+        )
+        rows = []
+        for app_id in batch:
+            computed = compute_checks(suitability.get(app_id), training.get(app_id), references.get(app_id, 0))
+            for check_type in CHECK_TYPES:
+                status, details = computed.get(check_type, ('not-started', ''))
+                rows.append(Check(application_id=app_id, check_type=check_type, status=status, details=details))
+        Check.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0013_status_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Check',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('check_type', models.CharField(choices=[('dbs', 'DBS'), ('la_check', 'Local authority check'), ('ofsted', 'Ofsted check'), ('gp_health', 'GP health declaration'), ('ref_1', 'First reference'), ('ref_2', 'Second reference'), ('first_aid', 'First aid'), ('safeguarding', 'Safeguarding')], max_length=20)),
+                ('status', models.CharField(choices=[('not-started', 'Not started'), ('pending', 'Pending'), ('complete', 'Complete')], default='not-started', max_length=20)),
+                ('details', models.CharField(blank=True, default='', max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checks', to='applications.application')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['check_type', 'status'], name='check_type_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('application', 'check_type'), name='check_app_type_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_checks, migrations.RunPython.noop),
+    ]
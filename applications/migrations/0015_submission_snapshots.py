@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0014_checks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schema_version', models.PositiveSmallIntegerField()),
+                ('data', models.BinaryField()),
+                ('digest', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='applications.application')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['application', '-created_at'], name='snapshot_app_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0015_submission_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('version', models.PositiveIntegerField()),
+                ('action', models.CharField(choices=[('create', 'Created'), ('update', 'Updated'), ('delete', 'Deleted')], max_length=10)),
+                ('changes', models.JSONField(default=dict)),
+                ('state', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='section_changes', to='applications.application')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['section', 'object_id', 'version'], name='change_row_version_idx'), models.Index(fields=['application', 'created_at'], name='change_app_created_idx')],
+            },
+        ),
+    ]
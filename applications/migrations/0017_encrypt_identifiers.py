@@ -0,0 +1,183 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:01
+
+import base64
+import hashlib
+import hmac
+import json
+import zlib
+
+import applications.encryption
+import django.core.validators
+from cryptography.fernet import Fernet, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of the applications.encryption helpers as of this migration.
+# Only the keys come from the settings at migrate time. Rows are read and
+# written with raw SQL so the live EncryptedCharField never sees them.
+PREFIX = 'enc1$'
+
+# {section key in history and snapshots: its encrypted fields}
+ENCRYPTED = {
+    'personal_details': ('PersonalDetails', 'ni_number'),
+    'suitability': ('Suitability', 'dbs_number'),
+}
+
+
+def _derive(secret, purpose):
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b'applications.' + purpose)
+    return hkdf.derive(secret.encode('utf-8'))
+
+
+def _keyring():
+    secrets = getattr(settings, 'FIELD_ENCRYPTION_KEYS', None) or [settings.SECRET_KEY]
+    fernet = MultiFernet([Fernet(base64.urlsafe_b64encode(_derive(secret, b'field-encryption'))) for secret in secrets])
+    return fernet, _derive(secrets[0], b'blind-index')
+
+
+def _normalize_identifier(value):
+    return ''.join(value.split()).replace('-', '').upper() if value else ''
+
+
+def _codec():
+    fernet, index_key = _keyring()
+
+    def encrypt(value):
+        if not isinstance(value, str) or not value or value.startswith(PREFIX):
+            return value
+        return PREFIX + fernet.encrypt(value.encode('utf-8')).decode('ascii')
+
+    def decrypt(value):
+        if not isinstance(value, str) or not value.startswith(PREFIX):
+            return value
+        return fernet.decrypt(value[len(PREFIX):].encode('ascii')).decode('utf-8')
+
+    def blind_index(value):
+        value = _normalize_identifier(value)
+        if not value:
+            return None
+        return hmac.new(index_key, value.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    return encrypt, decrypt, blind_index
+
+
+def _mask(value, visible=4):
+    value = _normalize_identifier(value)
+    if not value:
+        return ''
+    return '*' * max(len(value) - visible, 0) + value[-visible:]
+
+
+def _rewrite_column(apps, schema_editor, model_name, field, func, index_func=None):
+    model = apps.get_model('applications', model_name)
+    quote = schema_editor.quote_name
+    table, pk = quote(model._meta.db_table), quote(model._meta.pk.column)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT {pk}, {quote(field)} FROM {table} WHERE {quote(field)} IS NOT NULL')
+        rows = cursor.fetchall()
+        if index_func:
+            cursor.executemany(
+                f'UPDATE {table} SET {quote(field)} = %s, {quote(field + "_index")} = %s WHERE {pk} = %s',
+                [(func(value), index_func(value), row_pk) for row_pk, value in rows],
+            )
+        else:
+            cursor.executemany(
+                f'UPDATE {table} SET {quote(field)} = %s WHERE {pk} = %s',
+                [(func(value), row_pk) for row_pk, value in rows],
+            )
+
+
+def _map_history(apps, func):
+    """Apply func to the encrypted fields held in SectionChange diffs and checkpoints."""
+    SectionChange = apps.get_model('applications', 'SectionChange')
+    batch = []
+    for change in SectionChange.objects.filter(section__in=list(ENCRYPTED)).iterator(chunk_size=1000):
+        field = ENCRYPTED[change.section][1]
+        for data in [change.changes, change.state]:
+            if data and field in data:
+                data[field] = func(data[field])
+        batch.append(change)
+    SectionChange.objects.bulk_update(batch, ['changes', 'state'], batch_size=1000)
+
+
+def _map_snapshots(apps, func):
+    """
+    Apply func to the encrypted fields inside snapshot payloads and write a
+    new digest. Snapshots that no longer match their digest are left alone,
+    so tampering stays detectable.
+    """
+    SubmissionSnapshot = apps.get_model('applications', 'SubmissionSnapshot')
+    batch = []
+    for snapshot in SubmissionSnapshot.objects.iterator(chunk_size=500):
+        try:
+            raw = zlib.decompress(bytes(snapshot.data))
+        except zlib.error:
+            continue
+        if hashlib.sha256(raw).hexdigest() != snapshot.digest:
+            continue
+        payload = json.loads(raw)
+        for key, (_, field) in ENCRYPTED.items():
+            row = payload['sections'].get(key)
+            if row and field in row:
+                row[field] = func(row[field])
+        raw = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+        snapshot.data = zlib.compress(raw, 9)
+        snapshot.digest = hashlib.sha256(raw).hexdigest()
+        batch.append(snapshot)
+    SubmissionSnapshot.objects.bulk_update(batch, ['data', 'digest'], batch_size=500)
+
+
+def encrypt_existing(apps, schema_editor):
+    encrypt, decrypt, blind_index = _codec()
+    for model_name, field in ENCRYPTED.values():
+        _rewrite_column(apps, schema_editor, model_name, field, encrypt, lambda value: blind_index(decrypt(value)))
+    _rewrite_column(apps, schema_editor, 'Check', 'details', _mask)
+    # History and snapshots written before this migration hold the numbers in clear
+    _map_history(apps, encrypt)
+    _map_snapshots(apps, encrypt)
+
+
+def decrypt_existing(apps, schema_editor):
+    # Masked check details can't be restored
+    encrypt, decrypt, blind_index = _codec()
+    for model_name, field in ENCRYPTED.values():
+        _rewrite_column(apps, schema_editor, model_name, field, decrypt)
+    _map_history(apps, decrypt)
+    _map_snapshots(apps, decrypt)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0016_section_change_history'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='personaldetails',
+            name='pd_ni_number_idx',
+        ),
+        migrations.AddField(
+            model_name='personaldetails',
+            name='ni_number_index',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='suitability',
+            name='dbs_number_index',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='personaldetails',
+            name='ni_number',
+            field=applications.encryption.EncryptedCharField(blank=True, max_length=9, null=True, validators=[django.core.validators.RegexValidator('^[A-Z]{2}[0-9]{6}[A-D]{1}$', 'Invalid NI number format')], verbose_name='National Insurance Number'),
+        ),
+        migrations.AlterField(
+            model_name='suitability',
+            name='dbs_number',
+            field=applications.encryption.EncryptedCharField(blank=True, max_length=12, null=True),
+        ),
+        migrations.RunPython(encrypt_existing, decrypt_existing),
+    ]
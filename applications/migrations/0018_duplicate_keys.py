@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copy of applications.models.name_dob_key as of this migration
+def name_dob_key(normalized_first_name, normalized_last_name, dob):
+    if not (normalized_first_name and normalized_last_name and dob):
+        return None
+    return f'{normalized_first_name} {normalized_last_name}|{dob.isoformat()}'
+
+
+def backfill_name_dob_key(apps, schema_editor):
+    PersonalDetails = apps.get_model('applications', 'PersonalDetails')
+    rows = list(PersonalDetails.objects.filter(dob__isnull=False).only('normalized_first_name', 'normalized_last_name', 'dob'))
+    for row in rows:
+        row.name_dob_key = name_dob_key(row.normalized_first_name, row.normalized_last_name, row.dob)
+    PersonalDetails.objects.bulk_update(rows, ['name_dob_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0017_encrypt_identifiers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='applications.application'),
+        ),
+        migrations.AddField(
+            model_name='personaldetails',
+            name='name_dob_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=220, null=True),
+        ),
+        migrations.RunPython(backfill_name_dob_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:12
+
+import datetime
+import django.db.models.deletion
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Frozen copies of applications.coverage as of this migration
+REQUIRED_YEARS = 5
+
+# kind: (model name, start field, end field, overlaps allowed)
+COVERAGE_KINDS = {
+    'address': ('AddressEntry', 'move_in_date', 'move_out_date', False),
+    'employment': ('EmploymentEntry', 'start_date', 'end_date', True),
+}
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def window_start(as_of, years=REQUIRED_YEARS):
+    try:
+        return as_of.replace(year=as_of.year - years)
+    except ValueError:
+        return as_of.replace(year=as_of.year - years, day=28)
+
+
+def compute_coverage(intervals, as_of, allow_overlap=False):
+    start = window_start(as_of)
+    covered_until = start - ONE_DAY
+    gaps, overlaps = [], []
+    for begin, end in intervals:
+        if begin is None:
+            continue
+        end = min(end or as_of, as_of)
+        if end < begin or end < start:
+            continue
+        begin = max(begin, start)
+        if begin > covered_until + ONE_DAY:
+            gaps.append([covered_until + ONE_DAY, begin - ONE_DAY])
+        elif begin < covered_until:
+            overlaps.append([begin, min(end, covered_until)])
+        covered_until = max(covered_until, end)
+    if covered_until < as_of:
+        gaps.append([covered_until + ONE_DAY, as_of])
+    ok = not gaps and (allow_overlap or not overlaps)
+    return ok, _iso(gaps), _iso(overlaps)
+
+
+def _iso(ranges):
+    return [[first.isoformat(), last.isoformat()] for first, last in ranges]
+
+
+def backfill_coverage(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    HistoryCoverage = apps.get_model('applications', 'HistoryCoverage')
+    as_of = timezone.localdate()
+    app_ids = list(Application.objects.values_list('pk', flat=True))
+    for start in range(0, len(app_ids), 1000):
+        batch = app_ids[start:start + 1000]
+        rows = []
+        for kind, (model, start_field, end_field, allow_overlap) in COVERAGE_KINDS.items():
+            entries = (
+                apps.get_model('applications', model).objects.filter(application_id__in=batch)
+                .order_by('application_id', start_field).values_list('application_id', start_field, end_field)
+            )
+            intervals = {
+                app_id: [(begin, end) for _, begin, end in group]
+                for app_id, group in groupby(entries, key=itemgetter(0))
+            }
+            for app_id in batch:
+                ok, gaps, overlaps = compute_coverage(intervals.get(app_id, []), as_of, allow_overlap)
+                rows.append(HistoryCoverage(
+                    application_id=app_id, kind=kind, coverage_ok=ok, gaps=gaps, overlaps=overlaps, as_of=as_of,
+                ))
+        HistoryCoverage.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0018_duplicate_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryCoverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('address', 'Address history'), ('employment', 'Employment history')], max_length=20)),
+                ('coverage_ok', models.BooleanField(default=False)),
+                ('gaps', models.JSONField(blank=True, default=list)),
+                ('overlaps', models.JSONField(blank=True, default=list)),
+                ('as_of', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coverage', to='applications.application')),
+            ],
+            options={
+                'verbose_name_plural': 'history coverage',
+                'indexes': [models.Index(fields=['kind', 'coverage_ok'], name='coverage_kind_ok_idx')],
+                'constraints': [models.UniqueConstraint(fields=('application', 'kind'), name='coverage_app_kind_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_coverage, migrations.RunPython.noop),
+    ]
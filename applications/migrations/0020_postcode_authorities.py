@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0019_history_coverage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocalAuthority',
+            fields=[
+                ('code', models.CharField(max_length=9, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'verbose_name_plural': 'local authorities',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='addressentry',
+            name='local_authority_code',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='premises',
+            name='local_authority_code',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=9, null=True),
+        ),
+        migrations.CreateModel(
+            name='PostcodePrefix',
+            fields=[
+                ('prefix', models.CharField(max_length=8, primary_key=True, serialize=False)),
+                ('authority', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postcode_prefixes', to='applications.localauthority')),
+            ],
+            options={
+                'verbose_name_plural': 'postcode prefixes',
+            },
+        ),
+    ]
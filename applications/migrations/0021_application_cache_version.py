@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0020_postcode_authorities'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='cache_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,55 @@
+import hashlib
+import zlib
+
+from django.db import migrations
+from django.utils.crypto import salted_hmac
+
+# Frozen copy of applications.snapshots.DIGEST_SALT as of this migration
+DIGEST_SALT = 'applications.snapshots.digest'
+
+
+def _sha256(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _mac(raw):
+    return salted_hmac(DIGEST_SALT, raw, algorithm='sha256').hexdigest()
+
+
+def _redigest(apps, old, new):
+    """
+    Swap the digest of every snapshot that still matches old(raw) for new(raw).
+    Rows that don't match are left alone, so a row tampered with before the
+    migration keeps failing verification.
+    """
+    SubmissionSnapshot = apps.get_model('applications', 'SubmissionSnapshot')
+    batch = []
+    for snapshot in SubmissionSnapshot.objects.only('data', 'digest').iterator(chunk_size=500):
+        try:
+            raw = zlib.decompress(bytes(snapshot.data))
+        except zlib.error:
+            continue
+        if old(raw) == snapshot.digest:
+            snapshot.digest = new(raw)
+            batch.append(snapshot)
+    SubmissionSnapshot.objects.bulk_update(batch, ['digest'], batch_size=500)
+
+
+def sign_digests(apps, schema_editor):
+    """Replace the unkeyed SHA-256 digests of existing snapshots with the keyed MAC."""
+    _redigest(apps, _sha256, _mac)
+
+
+def unsign_digests(apps, schema_editor):
+    _redigest(apps, _mac, _sha256)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0021_application_cache_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(sign_digests, unsign_digests),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0022_sign_snapshot_digests'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='sectionchange',
+            name='change_row_version_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='sectionchange',
+            constraint=models.UniqueConstraint(fields=('section', 'object_id', 'version'), name='change_row_version_uniq'),
+        ),
+    ]
@@ -1,23 +1,123 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
+from django.db.models import Count, F
 from django.utils import timezone
+import time
 import uuid
 
+from .db import backoff_delay
+from .encryption import EncryptedCharField, blind_index
+from . import postcodes
+
+
+def normalize_search_text(value):
+    """Lower-case and collapse whitespace so values can be matched with index range scans."""
+    if not value:
+        return None
+    return ' '.join(value.split()).lower() or None
+
+
+def years_before(day, years):
+    """The same calendar date `years` earlier (28 February for 29 February)."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def name_dob_key(normalized_first_name, normalized_last_name, dob):
+    """Match key for "same person" by name and date of birth, or None if any part is missing."""
+    if not (normalized_first_name and normalized_last_name and dob):
+        return None
+    return f'{normalized_first_name} {normalized_last_name}|{dob.isoformat()}'
+
+
+class InvalidTransition(ValueError):
+    pass
+
+
 class Application(models.Model):
     STATUS_CHOICES = [
         ('DRAFT', 'Draft'),
         ('SUBMITTED', 'Submitted'),
+        ('CHECKS_IN_PROGRESS', 'Checks in progress'),
+        ('UNDER_REVIEW', 'Under review'),
+        ('REGISTERED', 'Registered'),
     ]
 
+    # Retries when a concurrent save took the same application number
+    NUMBER_ALLOCATION_ATTEMPTS = 5
+
+    # Allowed status moves; anything else raises InvalidTransition
+    TRANSITIONS = {
+        'DRAFT': ['SUBMITTED'],
+        'SUBMITTED': ['CHECKS_IN_PROGRESS', 'UNDER_REVIEW'],
+        'CHECKS_IN_PROGRESS': ['UNDER_REVIEW'],
+        'UNDER_REVIEW': ['CHECKS_IN_PROGRESS', 'REGISTERED'],
+        'REGISTERED': [],
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     application_number = models.CharField(max_length=20, unique=True, blank=True, null=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='DRAFT')
     last_section_completed = models.IntegerField(default=0)
     has_adults_in_home = models.BooleanField(default=False)
     has_children_in_home = models.BooleanField(default=False)
+    status_changed_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Earliest application by the same applicant (NI number, email or name + DOB); see applications.duplicates
+    duplicate_of = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='duplicates'
+    )
+    # Bumped when any section row changes; part of the applications.app_cache key
+    cache_version = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Bookkeeping columns left out of exports
+    DERIVED_FIELDS = ['cache_version']
+
+    class Meta:
+        indexes = [
+            # id is included so (created_at, id) orderings (admin, export cursor) need no sort
+            models.Index(fields=['-created_at', '-id'], name='app_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='app_status_created_idx'),
+            models.Index(fields=['updated_at'], name='app_updated_idx'),
+            # Stage ageing / SLA queries: "in status X since before T"
+            models.Index(fields=['status', 'status_changed_at'], name='app_status_changed_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can tell when it changes
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def can_transition_to(self, status):
+        return status in self.TRANSITIONS.get(self._previous_status() or self.status, [])
+
+    def transition_to(self, status, user=None, note=''):
+        """Move to `status`, recording a StatusTransition and updating StatusCounter atomically."""
+        if not self.can_transition_to(status):
+            raise InvalidTransition(f'Cannot move application from {self._previous_status()} to {status}')
+        self.status = status
+        self._transition_audit = (user, note)
+        self.save()
+
+    def _previous_status(self):
+        if self._state.adding:
+            return None
+        previous = getattr(self, '_loaded_status', None)
+        if previous is None:
+            previous = Application.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+        return previous
+
+    def clean(self):
+        previous = self._previous_status()
+        if previous and previous != self.status and self.status not in self.TRANSITIONS.get(previous, []):
+            raise ValidationError({'status': f'Cannot move from {previous} to {self.status}.'})
+
     def _generate_application_number(self):
         """Generate application number in format RK-YEAR-NNNNN (e.g. RK-2024-00001)"""
         year = timezone.now().year
@@ -40,14 +140,169 @@ class Application(models.Model):
         return f'{prefix}{seq:05d}'
 
     def save(self, *args, **kwargs):
-        if not self.application_number:
-            self.application_number = self._generate_application_number()
-        super().save(*args, **kwargs)
+        allocate_number = not self.application_number
+        adding = self._state.adding
+        previous = self._previous_status()
+        status_changed = adding or previous != self.status
+        if status_changed:
+            self.status_changed_at = timezone.now()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'status_changed_at'}
+
+        for attempt in range(self.NUMBER_ALLOCATION_ATTEMPTS):
+            try:
+                # Row, audit log and counters commit together. The number is
+                # allocated in the same (IMMEDIATE on SQLite) transaction as the
+                # write, so concurrent submits can't both take the next one.
+                # Only a number allocation is retried, so only it needs a savepoint.
+                with transaction.atomic(savepoint=allocate_number):
+                    if allocate_number:
+                        self.application_number = self._generate_application_number()
+                    super().save(*args, **kwargs)
+                    if adding:
+                        StatusCounter.adjust({self.status: 1})
+                    elif status_changed:
+                        user, note = getattr(self, '_transition_audit', (None, ''))
+                        StatusTransition.objects.create(
+                            application=self, from_status=previous, to_status=self.status, changed_by=user, note=note
+                        )
+                        StatusCounter.adjust({previous: -1, self.status: 1})
+                break
+            except IntegrityError as e:
+                # Another writer took the number first (backends without write-locking transactions)
+                if not allocate_number or 'application_number' not in str(e) or attempt == self.NUMBER_ALLOCATION_ATTEMPTS - 1:
+                    raise
+                time.sleep(backoff_delay(attempt))
+        self._loaded_status = self.status
+        self._transition_audit = (None, '')
 
     def __str__(self):
         return f"{self.application_number or self.id} ({self.get_status_display()})"
 
-class PersonalDetails(models.Model):
+
+class StatusCounter(models.Model):
+    """
+    Number of applications per status, kept in step with Application writes
+    so the dashboard stats cards are a single small read.
+    """
+    status = models.CharField(max_length=20, primary_key=True, choices=Application.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.status}: {self.count}"
+
+    @classmethod
+    def adjust(cls, deltas):
+        """Apply {status: delta} increments with UPDATE ... SET count = count + delta."""
+        for status, delta in deltas.items():
+            if not delta:
+                continue
+            if not cls.objects.filter(status=status).update(count=F('count') + delta):
+                cls.objects.get_or_create(status=status)
+                cls.objects.filter(status=status).update(count=F('count') + delta)
+
+    @classmethod
+    def rebuild(cls):
+        """Recount from scratch, e.g. after bulk loads that bypass Application.save()."""
+        counts = {status: 0 for status, _ in Application.STATUS_CHOICES}
+        counts.update(Application.objects.order_by().values_list('status').annotate(n=Count('pk')))
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([cls(status=status, count=n) for status, n in counts.items()])
+
+    @classmethod
+    def as_dict(cls):
+        counts = {status: 0 for status, _ in Application.STATUS_CHOICES}
+        counts.update(cls.objects.values_list('status', 'count'))
+        return counts
+
+class StatusTransition(models.Model):
+    """Audit row written for every change of Application.status."""
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_transitions')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    note = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+class SubmissionSnapshot(models.Model):
+    """
+    What the applicant sent, frozen at submit time: the application and every
+    section as zlib-compressed canonical JSON, plus an HMAC-SHA256 of it keyed
+    with SECRET_KEY, so later edits to the stored row are detectable even if the
+    digest is rewritten too. See applications.snapshots.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='snapshots')
+    schema_version = models.PositiveSmallIntegerField()
+    data = models.BinaryField()
+    digest = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['application', '-created_at'], name='snapshot_app_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Snapshot of {self.application_id} at {self.created_at:%Y-%m-%d %H:%M}"
+
+class SectionChange(models.Model):
+    """
+    Append-only history of section edits: one row per saved change to a
+    section row, holding only the fields that changed. Every
+    CHECKPOINT_INTERVAL-th version (and the first) also stores the full row,
+    so any version is rebuilt from at most that many rows. Written in bulk
+    by applications.history.
+    """
+    ACTION_CHOICES = [
+        ('create', 'Created'),
+        ('update', 'Updated'),
+        ('delete', 'Deleted'),
+    ]
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='section_changes')
+    section = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    version = models.PositiveIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField(default=dict)
+    state = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['application', 'created_at'], name='change_app_created_idx'),
+        ]
+        constraints = [
+            # Versions are allocated as MAX + 1; also the index reconstruct() reads by
+            models.UniqueConstraint(fields=['section', 'object_id', 'version'], name='change_row_version_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.section} #{self.object_id} v{self.version} ({self.action})"
+
+
+class TrackedSection:
+    """
+    Mixin for section models: remembers the values a row was loaded with so
+    applications.history can record only the fields a save changed.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+class PersonalDetails(TrackedSection, models.Model):
     TITLE_CHOICES = [
         ('Mr', 'Mr'),
         ('Mrs', 'Mrs'),
@@ -78,7 +333,7 @@ class PersonalDetails(models.Model):
     
     email = models.EmailField(null=True, blank=True)
     phone = models.CharField(max_length=20, null=True, blank=True)
-    ni_number = models.CharField(
+    ni_number = EncryptedCharField(
         max_length=9, 
         verbose_name="National Insurance Number",
         validators=[RegexValidator(r'^[A-Z]{2}[0-9]{6}[A-D]{1}$', 'Invalid NI number format')],
@@ -88,10 +343,40 @@ class PersonalDetails(models.Model):
     lived_outside_uk = models.BooleanField(default=False)
     military_base_abroad = models.BooleanField(default=False)
 
+    # Columns computed in populate_derived_fields(); left out of exports
+    DERIVED_FIELDS = ['normalized_first_name', 'normalized_last_name', 'normalized_email', 'ni_number_index', 'name_dob_key']
+
+    # Normalized copies used by admin search (see normalize_search_text)
+    normalized_first_name = models.CharField(max_length=100, null=True, blank=True, editable=False, db_index=True)
+    normalized_last_name = models.CharField(max_length=100, null=True, blank=True, editable=False, db_index=True)
+    normalized_email = models.CharField(max_length=254, null=True, blank=True, editable=False, db_index=True)
+    # Keyed hash of the encrypted ni_number, for exact-match lookups (see encryption.blind_index)
+    ni_number_index = models.CharField(max_length=64, null=True, blank=True, editable=False, db_index=True)
+    # "first last|YYYY-MM-DD", one of the duplicate-applicant match keys
+    name_dob_key = models.CharField(max_length=220, null=True, blank=True, editable=False, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['email'], name='pd_email_idx'),
+            models.Index(fields=['last_name'], name='pd_last_name_idx'),
+        ]
+
+    def populate_derived_fields(self):
+        """Recompute fields derived from user input. Called from save() and by bulk writers."""
+        self.normalized_first_name = normalize_search_text(self.first_name)
+        self.normalized_last_name = normalize_search_text(self.last_name)
+        self.normalized_email = normalize_search_text(self.email)
+        self.ni_number_index = blind_index(self.ni_number)
+        self.name_dob_key = name_dob_key(self.normalized_first_name, self.normalized_last_name, self.dob)
+
+    def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
-class AddressEntry(models.Model):
+class AddressEntry(TrackedSection, models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='address_history')
     line1 = models.CharField(max_length=255, null=True, blank=True)
     line2 = models.CharField(max_length=255, blank=True, null=True)
@@ -102,13 +387,33 @@ class AddressEntry(models.Model):
     is_current = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Columns computed in populate_derived_fields(); left out of exports
+    DERIVED_FIELDS = ['local_authority_code']
+
+    # ONS code of the authority the postcode falls in (see applications.postcodes)
+    local_authority_code = models.CharField(max_length=9, null=True, blank=True, editable=False, db_index=True)
+
     class Meta:
         ordering = ['-move_in_date']
+        indexes = [
+            models.Index(fields=['postcode'], name='address_postcode_idx'),
+            # Serves the per-application prefetch in its default ordering
+            models.Index(fields=['application', '-move_in_date'], name='address_app_move_in_idx'),
+        ]
+
+    def populate_derived_fields(self):
+        """Recompute fields derived from user input. Called from save() and by bulk writers."""
+        self.postcode = postcodes.normalize_postcode(self.postcode)
+        self.local_authority_code = postcodes.authority_for_postcode(self.postcode)
+
+    def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.line1}, {self.postcode}"
 
-class Premises(models.Model):
+class Premises(TrackedSection, models.Model):
     PREMISES_TYPES = [
         ('Domestic', 'Domestic (Home)'),
         ('Non-domestic', 'Non-domestic'),
@@ -124,10 +429,39 @@ class Premises(models.Model):
     has_pets = models.BooleanField(default=False)
     pets_details = models.TextField(blank=True, null=True)
 
+    # Columns computed in populate_derived_fields(); left out of exports
+    DERIVED_FIELDS = ['local_authority_code']
+
+    # ONS code for local_authority, so applications can be grouped by authority
+    local_authority_code = models.CharField(max_length=9, null=True, blank=True, editable=False, db_index=True)
+
+    def populate_derived_fields(self, home_postcode=None):
+        """
+        Match the typed authority to the loaded dataset, normalising its name.
+        Premises in the applicant's own home that don't match fall back to the
+        current address's postcode (`home_postcode`, looked up if not given).
+        """
+        if not postcodes.dataset_loaded():
+            return
+        code = postcodes.authority_for_name(self.local_authority)
+        if code is None and self.is_own_home:
+            if home_postcode is None and self.application_id:
+                home_postcode = AddressEntry.objects.filter(
+                    application_id=self.application_id, is_current=True
+                ).values_list('postcode', flat=True).first()
+            code = postcodes.authority_for_postcode(home_postcode)
+        self.local_authority_code = code
+        if code:
+            self.local_authority = postcodes.authority_name(code)
+
+    def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.premises_type} - {self.local_authority}"
 
-class ChildcareService(models.Model):
+class ChildcareService(TrackedSection, models.Model):
     application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='service_details')
     # Age groups (stored as comma-separated or boolean fields - boolean is cleaner)
     care_age_0_5 = models.BooleanField(default=False, verbose_name="0-5 years")
@@ -140,7 +474,7 @@ class ChildcareService(models.Model):
     def __str__(self):
         return f"Service Details for {self.application.id}"
 
-class Training(models.Model):
+class Training(TrackedSection, models.Model):
     application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='training')
     
     first_aid_completed = models.BooleanField(default=False)
@@ -167,7 +501,7 @@ class Training(models.Model):
     def __str__(self):
         return f"Training for {self.application.id}"
 
-class EmploymentEntry(models.Model):
+class EmploymentEntry(TrackedSection, models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='employment_history')
     employer_name = models.CharField(max_length=255, null=True, blank=True)
     role = models.CharField(max_length=255, null=True, blank=True)
@@ -178,18 +512,36 @@ class EmploymentEntry(models.Model):
     def __str__(self):
         return  f"{self.role} at {self.employer_name}"
 
-class HouseholdMember(models.Model):
+class HouseholdMember(TrackedSection, models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='household_members')
     first_name = models.CharField(max_length=100, null=True, blank=True)
     last_name = models.CharField(max_length=100, null=True, blank=True)
     dob = models.DateField(null=True, blank=True)
     relationship = models.CharField(max_length=100, null=True, blank=True)
-    is_adult = models.BooleanField(default=True) # Calculated based on DOB usually, but good to flag
+    # Derived from dob when it's known; only entered by hand without one
+    is_adult = models.BooleanField(default=True)
+
+    # Ofsted requires DBS checks for household members from this age
+    ADULT_AGE = 16
+
+    @classmethod
+    def adult_cutoff(cls, today=None):
+        """Members born on or before this date are adults on `today`."""
+        return years_before(today or timezone.localdate(), cls.ADULT_AGE)
+
+    def populate_derived_fields(self):
+        """Recompute fields derived from user input. Called from save() and by bulk writers."""
+        if self.dob:
+            self.is_adult = self.dob <= self.adult_cutoff()
+
+    def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
-class Reference(models.Model):
+class Reference(TrackedSection, models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='references')
     first_name = models.CharField(max_length=100, null=True, blank=True)
     last_name = models.CharField(max_length=100, null=True, blank=True)
@@ -201,7 +553,7 @@ class Reference(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
-class Suitability(models.Model):
+class Suitability(TrackedSection, models.Model):
     application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='suitability')
     
     has_medical_condition = models.BooleanField(default=False)
@@ -212,12 +564,26 @@ class Suitability(models.Model):
     social_services_details = models.TextField(blank=True, null=True)
     
     has_dbs = models.BooleanField(default=False)
-    dbs_number = models.CharField(max_length=12, blank=True, null=True)
+    dbs_number = EncryptedCharField(max_length=12, blank=True, null=True)
+
+    # Columns computed in populate_derived_fields(); left out of exports
+    DERIVED_FIELDS = ['dbs_number_index']
+
+    # Keyed hash of the encrypted dbs_number, for exact-match lookups (see encryption.blind_index)
+    dbs_number_index = models.CharField(max_length=64, null=True, blank=True, editable=False, db_index=True)
+
+    def populate_derived_fields(self):
+        """Recompute fields derived from user input. Called from save() and by bulk writers."""
+        self.dbs_number_index = blind_index(self.dbs_number)
+
+    def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Suitability for {self.application.id}"
 
-class Declaration(models.Model):
+class Declaration(TrackedSection, models.Model):
     application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='declaration')
     consent_auth_contact = models.BooleanField(default=False)
     consent_auth_share = models.BooleanField(default=False)
@@ -231,3 +597,109 @@ class Declaration(models.Model):
 
     def __str__(self):
         return f"Declaration by {self.print_name}"
+
+
+class Check(models.Model):
+    """
+    One row per application and check type, shown on the dashboard.
+    Derived checks are kept in step with their source sections by
+    applications.checks.recompute_checks(); the rest are set by staff.
+    """
+    CHECK_TYPES = [
+        ('dbs', 'DBS'),
+        ('la_check', 'Local authority check'),
+        ('ofsted', 'Ofsted check'),
+        ('gp_health', 'GP health declaration'),
+        ('ref_1', 'First reference'),
+        ('ref_2', 'Second reference'),
+        ('first_aid', 'First aid'),
+        ('safeguarding', 'Safeguarding'),
+    ]
+    STATUS_CHOICES = [
+        ('not-started', 'Not started'),
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+    ]
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='checks')
+    check_type = models.CharField(max_length=20, choices=CHECK_TYPES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='not-started')
+    details = models.CharField(max_length=255, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['application', 'check_type'], name='check_app_type_uniq'),
+        ]
+        indexes = [
+            # "Applications with outstanding <type> checks"
+            models.Index(fields=['check_type', 'status'], name='check_type_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_check_type_display()} for {self.application_id}: {self.status}"
+
+
+class HistoryCoverage(models.Model):
+    """
+    Whether an application's address or employment history covers the
+    required years, with the gaps and overlaps found. Kept in step with the
+    history rows by applications.coverage.recompute_coverage().
+    """
+    KIND_CHOICES = [
+        ('address', 'Address history'),
+        ('employment', 'Employment history'),
+    ]
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='coverage')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    coverage_ok = models.BooleanField(default=False)
+    # [[first_day, last_day], ...] as ISO dates, oldest first
+    gaps = models.JSONField(default=list, blank=True)
+    overlaps = models.JSONField(default=list, blank=True)
+    # End of the checked window; rows go stale as it moves (see recompute_coverage command)
+    as_of = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'history coverage'
+        constraints = [
+            models.UniqueConstraint(fields=['application', 'kind'], name='coverage_app_kind_uniq'),
+        ]
+        indexes = [
+            # "Applications whose <kind> history is incomplete"
+            models.Index(fields=['kind', 'coverage_ok'], name='coverage_kind_ok_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.application_id}: {'ok' if self.coverage_ok else 'incomplete'}"
+
+
+class LocalAuthority(models.Model):
+    """Local authorities from the postcode dataset (see the load_postcodes command)."""
+    code = models.CharField(max_length=9, primary_key=True)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'local authorities'
+
+    def __str__(self):
+        return self.name
+
+
+class PostcodePrefix(models.Model):
+    """
+    Compact postcode→authority table. A postcode district ("LS1") or sector
+    ("LS1 1") lying wholly in one authority is stored once; only postcodes in
+    split sectors are stored in full. Lookups take the longest stored prefix.
+    """
+    prefix = models.CharField(max_length=8, primary_key=True)
+    authority = models.ForeignKey(LocalAuthority, on_delete=models.CASCADE, related_name='postcode_prefixes')
+
+    class Meta:
+        verbose_name_plural = 'postcode prefixes'
+
+    def __str__(self):
+        return f"{self.prefix} → {self.authority_id}"
+
@@ -0,0 +1,94 @@
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimate_table_rows(model, using='default'):
+    """
+    Cheap row-count estimate for a whole table, or None if the backend has none.
+    PostgreSQL keeps one in pg_class; on SQLite MAX(rowid) is an index seek
+    that only over-counts by rows deleted since they were inserted.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for large admin changelists.
+
+    Unfiltered listings use the table estimate once the table is bigger than
+    `exact_count_limit`; filtered listings count at most `exact_count_limit + 1`
+    rows, so an unselective search never turns into a full COUNT(*). Past that
+    cap the total is unknown: any page may be asked for, each page reads one
+    extra row to tell whether a next page exists, and `count` only ever grows
+    to the rows seen so far.
+    """
+    exact_count_limit = 10000
+    _reached_end = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_table_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        return queryset.order_by()[:self.exact_count_limit + 1].count()
+
+    @property
+    def has_total(self):
+        """False while a filtered listing has more rows than were counted."""
+        return (
+            not self.object_list.query.where
+            or self.count <= self.exact_count_limit
+            or self._reached_end
+        )
+
+    def validate_number(self, number):
+        if self.has_total:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        if self.has_total:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows:
+            raise EmptyPage(self.error_messages['no_results'])
+        if len(rows) > self.per_page:
+            # One row past this page keeps the next page in num_pages
+            self.count = max(self.count, bottom + len(rows))
+        else:
+            self.count = bottom + len(rows)
+            self._reached_end = True
+        self.__dict__.pop('num_pages', None)
+        return self._get_page(rows[:self.per_page], number, self)
+
+    def get_page(self, number):
+        try:
+            return super().get_page(number)
+        except EmptyPage:
+            # Past the end of an uncounted listing: fall back to a page known to exist
+            return self.page(self.num_pages)
@@ -0,0 +1,101 @@
+import functools
+import re
+from itertools import groupby
+
+# Outward code ("LS1", "SW1A") and inward code ("1AA") of a UK postcode, without the space
+POSTCODE_RE = re.compile(r'^([A-Z]{1,2}[0-9][A-Z0-9]?)([0-9][A-Z]{2})$')
+
+# Wording that varies between how people type an authority and the dataset's name
+AUTHORITY_NOISE_RE = re.compile(
+    r'\b(?:(?:london|royal|metropolitan) borough of|borough of|city of|'
+    r'(?:city|county|borough|district|metropolitan borough) council|council)\b'
+)
+
+
+def normalize_postcode(value):
+    """'ls11aa ' -> 'LS1 1AA'. Values that aren't UK postcodes are only trimmed and upper-cased."""
+    if not value:
+        return value
+    compact = re.sub(r'[^A-Za-z0-9]', '', value).upper()
+    match = POSTCODE_RE.match(compact)
+    if not match:
+        return ' '.join(value.split()).upper()
+    return f'{match[1]} {match[2]}'
+
+
+def prefixes(postcode):
+    """Full postcode, sector and district of a normalized postcode, longest first."""
+    outward, _, inward = postcode.partition(' ')
+    if not inward:
+        return [outward]
+    return [postcode, f'{outward} {inward[0]}', outward]
+
+
+def normalize_authority_name(name):
+    """'Bristol, City of', 'Bristol City Council' and 'bristol' all compare equal."""
+    if not name:
+        return ''
+    name = AUTHORITY_NOISE_RE.sub(' ', re.sub(r'[^a-z0-9 ]', ' ', name.lower()))
+    return ' '.join(name.split())
+
+
+def compact(rows):
+    """
+    Reduce sorted (normalized full postcode, authority code) rows to the fewest
+    prefixes that map every postcode to its authority: one row per district
+    or sector lying in a single authority, full postcodes elsewhere.
+    """
+    for district, district_rows in groupby(rows, key=lambda row: prefixes(row[0])[2]):
+        district_rows = list(district_rows)
+        if len({code for _, code in district_rows}) == 1:
+            yield district, district_rows[0][1]
+            continue
+        for sector, sector_rows in groupby(district_rows, key=lambda row: prefixes(row[0])[1]):
+            sector_rows = list(sector_rows)
+            if len({code for _, code in sector_rows}) == 1:
+                yield sector, sector_rows[0][1]
+            else:
+                yield from sector_rows
+
+
+@functools.lru_cache(maxsize=1)
+def _index():
+    """
+    The loaded dataset as dicts, read once per process: lookups are a few
+    dict probes. load_postcodes clears it in its own process; running web
+    workers pick up a new dataset when restarted.
+    """
+    from .models import LocalAuthority, PostcodePrefix
+    names = dict(LocalAuthority.objects.values_list('code', 'name'))
+    by_name = {normalize_authority_name(name): code for code, name in names.items()}
+    by_prefix = dict(PostcodePrefix.objects.values_list('prefix', 'authority_id'))
+    return by_prefix, names, by_name
+
+
+def clear_cache():
+    _index.cache_clear()
+
+
+def dataset_loaded():
+    return bool(_index()[0])
+
+
+def authority_for_postcode(postcode):
+    """ONS code of the authority `postcode` lies in, or None if unknown."""
+    postcode = normalize_postcode(postcode)
+    if not postcode:
+        return None
+    by_prefix = _index()[0]
+    for prefix in prefixes(postcode):
+        code = by_prefix.get(prefix)
+        if code:
+            return code
+    return None
+
+
+def authority_for_name(name):
+    return _index()[2].get(normalize_authority_name(name))
+
+
+def authority_name(code):
+    return _index()[1].get(code)
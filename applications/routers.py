@@ -0,0 +1,91 @@
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+REPLICA_DB_ALIAS = 'replica'
+
+# Session key holding the time until which this session reads from the primary
+STICKY_SESSION_KEY = '_replica_sticky_until'
+
+_pinned = contextvars.ContextVar('replica_pinned', default=False)
+# Set by the router whenever something is written in the current context
+_wrote = contextvars.ContextVar('replica_wrote', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica():
+    """Send reads inside the block to the replica, when one is configured."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def replica_reads(view):
+    """
+    Serve a read-only view from the replica, unless the session wrote
+    recently (read-your-writes; see ReplicaStickinessMiddleware).
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        # Checked first so requests don't load the session for nothing
+        if not replica_configured():
+            return view(request, *args, **kwargs)
+        session = getattr(request, 'session', None)
+        sticky_until = session.get(STICKY_SESSION_KEY, 0) if session is not None else 0
+        if request.method not in ('GET', 'HEAD') or sticky_until > time.time():
+            return view(request, *args, **kwargs)
+        with use_replica():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def track_writes():
+    """Yield a dict whose 'wrote' flag is set if the block writes to any routed model."""
+    state = {'wrote': False}
+    token = _wrote.set(state)
+    try:
+        yield state
+    finally:
+        _wrote.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to the replica only inside
+    use_replica() (dashboard, exports, admin listings) and never while a
+    transaction is open on the primary, so read-modify-write code paths
+    such as bulk_transition see their own rows.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _pinned.get() or not replica_configured():
+            return None
+        if transaction.get_connection(DEFAULT_DB_ALIAS).in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _wrote.get()
+        # Session rows are written on almost every request; they don't make a session sticky
+        if state is not None and model._meta.app_label != 'sessions':
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, schema included
+        return db == DEFAULT_DB_ALIAS
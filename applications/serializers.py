@@ -0,0 +1,237 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import prefetch_related_objects
+
+from .encryption import decrypt, encrypt
+from .models import (
+    Application, PersonalDetails, AddressEntry, Premises,
+    ChildcareService, Training, EmploymentEntry, HouseholdMember,
+    Suitability, Declaration, Reference
+)
+
+# Section models keyed by their related_name on Application.
+# One-to-one sections serialize to a dict (or None), the rest to a list.
+ONE_TO_ONE_SECTIONS = [
+    ('personal_details', PersonalDetails),
+    ('premises', Premises),
+    ('service_details', ChildcareService),
+    ('training', Training),
+    ('suitability', Suitability),
+    ('declaration', Declaration),
+]
+
+MANY_SECTIONS = [
+    ('address_history', AddressEntry),
+    ('employment_history', EmploymentEntry),
+    ('household_members', HouseholdMember),
+    ('references', Reference),
+]
+
+SECTIONS = ONE_TO_ONE_SECTIONS + MANY_SECTIONS
+
+
+def _plain(value):
+    """Convert a DB value into something json.dumps can handle."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _field_names(model):
+    derived = getattr(model, 'DERIVED_FIELDS', [])
+    return [
+        f.attname for f in model._meta.concrete_fields
+        if f.attname != 'application_id' and f.name not in derived
+    ]
+
+
+def row_to_dict(row):
+    return {key: _plain(value) for key, value in row.items()}
+
+
+def fetch_sections(application_ids, sections=SECTIONS, fields=None):
+    """
+    Load the given sections for a batch of applications.
+    Runs one `IN` query per section model, regardless of batch size.
+    `fields` optionally maps a section key to the columns to load (default: all).
+    Returns {application_id: {section_key: dict | list | None}}.
+    """
+    application_ids = list(application_ids)
+    graphs = {app_id: {} for app_id in application_ids}
+    for key, model in sections:
+        many = (key, model) in MANY_SECTIONS
+        for graph in graphs.values():
+            graph[key] = [] if many else None
+        if not application_ids:
+            continue
+        names = (fields or {}).get(key) or _field_names(model)
+        rows = model.objects.filter(application_id__in=application_ids).values('application_id', *names)
+        for row in rows:
+            app_id = row.pop('application_id')
+            data = row_to_dict(row)
+            if many:
+                graphs[app_id][key].append(data)
+            else:
+                graphs[app_id][key] = data
+    return graphs
+
+
+def application_to_dict(application):
+    """Serialize the Application row itself (no sections)."""
+    return {
+        f.attname: _plain(f.value_from_object(application))
+        for f in Application._meta.concrete_fields
+        if f.name not in Application.DERIVED_FIELDS
+    }
+
+
+def serialize_applications(applications, sections=SECTIONS):
+    """
+    Serialize a batch of Application instances with their sections.
+    Section rows are fetched with one query per model for the whole batch.
+    """
+    applications = list(applications)
+    sections_by_app = fetch_sections([app.pk for app in applications], sections)
+    result = []
+    for app in applications:
+        data = application_to_dict(app)
+        data.update(sections_by_app[app.pk])
+        result.append(data)
+    return result
+
+
+# Relations read by dashboard_sections(), fetched with one query each per batch
+DASHBOARD_RELATIONS = [
+    'personal_details', 'premises', 'service_details', 'training', 'suitability', 'references', 'household_members', 'address_history',
+]
+
+
+def _section(application, name):
+    try:
+        return getattr(application, name)
+    except ObjectDoesNotExist:
+        return None
+
+
+def _date(value):
+    return value.strftime('%Y-%m-%d') if value else ''
+
+
+def dashboard_sections(applications):
+    """
+    The section-derived part of each application's dashboard entry, as
+    {pk: dict}. Values are what applications.app_cache stores, so NI and DBS
+    numbers stay encrypted; open_dashboard_sections() decrypts them.
+    """
+    prefetch_related_objects(applications, *DASHBOARD_RELATIONS)
+    result = {}
+    for app in applications:
+        data = {}
+        pd = _section(app, 'personal_details')
+        data['personal'] = pd and {
+            'title': pd.title,
+            'first_name': pd.first_name,
+            'middle_names': pd.middle_names or '',
+            'last_name': pd.last_name,
+            'dob': _date(pd.dob),
+            'gender': pd.gender,
+            'email': pd.email,
+            'phone': pd.phone,
+            'ni_number': encrypt(pd.ni_number),
+            'right_to_work_status': pd.right_to_work_status,
+            'known_by_other_names': pd.known_by_other_names,
+            'lived_outside_uk': pd.lived_outside_uk,
+            'military_base_abroad': pd.military_base_abroad,
+        }
+
+        pr = _section(app, 'premises')
+        # Premises saved with nothing but defaults show as missing
+        if pr and (pr.local_authority or pr.premises_type or pr.has_outdoor_space or pr.has_pets or pr.pets_details):
+            data['premises'] = {
+                'local_authority': pr.local_authority,
+                'premises_type': pr.premises_type,
+                'is_own_home': pr.is_own_home,
+                'has_outdoor_space': pr.has_outdoor_space,
+                'has_pets': pr.has_pets,
+                'pets_details': pr.pets_details or '',
+            }
+            data['local_authority'] = pr.local_authority or '-'
+        else:
+            data['premises'] = None
+            data['local_authority'] = '-'
+
+        tr = _section(app, 'training')
+        data['training'] = tr and {
+            'first_aid_completed': tr.first_aid_completed,
+            'first_aid_date': _date(tr.first_aid_date),
+            'first_aid_org': tr.first_aid_org or '',
+            'safeguarding_completed': tr.safeguarding_completed,
+            'safeguarding_date': _date(tr.safeguarding_date),
+            'safeguarding_org': tr.safeguarding_org or '',
+            'eyfs_completed': tr.eyfs_completed,
+            'food_hygiene_completed': tr.food_hygiene_completed,
+        }
+
+        su = _section(app, 'suitability')
+        data['suitability'] = su and {
+            'has_medical_condition': su.has_medical_condition,
+            'is_disqualified': su.is_disqualified,
+            'social_services_involved': su.social_services_involved,
+            'has_dbs': su.has_dbs,
+            'dbs_number': encrypt(su.dbs_number or ''),
+        }
+
+        data['references'] = [{
+            'full_name': f'{ref.first_name} {ref.last_name}',
+            'email': ref.email,
+            'phone': ref.phone,
+            'relationship': ref.relationship,
+            'years_known': ref.years_known,
+        } for ref in app.references.all()]
+
+        data['household_members'] = [{
+            'id': str(m.id),
+            'first_name': m.first_name,
+            'last_name': m.last_name,
+            'dob': _date(m.dob),
+            'relationship': m.relationship,
+            'is_adult': m.is_adult,
+            'checks': {},
+        } for m in app.household_members.all()]
+
+        sd = _section(app, 'service_details')
+        data['register'] = [
+            name for selected, name in [
+                (sd.care_age_0_5, 'Early Years'),
+                (sd.care_age_5_8, 'Compulsory Childcare'),
+                (sd.care_age_8_plus, 'Voluntary Childcare'),
+            ] if selected
+        ] if sd else []
+
+        data['addresses'] = [{
+            'line1': addr.line1,
+            'line2': addr.line2 or '',
+            'town': addr.town,
+            'postcode': addr.postcode,
+            'move_in_date': _date(addr.move_in_date),
+            'is_current': addr.is_current,
+        } for addr in app.address_history.all()]
+        result[app.pk] = data
+    return result
+
+
+def open_dashboard_sections(data):
+    """A copy of a dashboard_sections() entry with NI and DBS numbers decrypted."""
+    data = dict(data)
+    if data['personal']:
+        data['personal'] = {**data['personal'], 'ni_number': decrypt(data['personal']['ni_number'])}
+    if data['suitability']:
+        data['suitability'] = {**data['suitability'], 'dbs_number': decrypt(data['suitability']['dbs_number'])}
+    return data
@@ -0,0 +1,70 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .checks import CACHE, SOURCE_CHECKS, initial_checks, schedule_recompute
+from .coverage import COVERAGE_SOURCES
+from .db import configure_sqlite
+from . import history
+from .models import Application, Check, StatusCounter
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    StatusCounter.adjust({instance.status: -1})
+
+
+@receiver(post_save, sender=Application)
+def application_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Check.objects.bulk_create(initial_checks(instance.pk))
+
+
+def section_changed(sender, instance, raw=False, origin=None, **kwargs):
+    # Sections deleted along with their application take its checks with them
+    if raw or isinstance(origin, Application):
+        return
+    schedule_recompute(instance.application_id, SOURCE_CHECKS[sender])
+
+
+def history_rows_changed(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or isinstance(origin, Application):
+        return
+    schedule_recompute(instance.application_id, COVERAGE_SOURCES[sender])
+
+
+def section_cache_changed(sender, instance, raw=False, origin=None, **kwargs):
+    # Cached entries of a deleted application are never read again
+    if raw or isinstance(origin, Application):
+        return
+    schedule_recompute(instance.application_id, [CACHE])
+
+
+def section_saved_history(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        history.record_save(instance, created)
+
+
+def section_deleted_history(sender, instance, origin=None, **kwargs):
+    # History goes with the application when the whole application is deleted
+    if not isinstance(origin, Application):
+        history.record_delete(instance)
+
+
+for section in history.SECTION_KEYS:
+    post_save.connect(section_saved_history, sender=section, dispatch_uid=f'history_{section.__name__}_saved')
+    post_delete.connect(section_deleted_history, sender=section, dispatch_uid=f'history_{section.__name__}_deleted')
+
+for section in history.SECTION_KEYS:
+    post_save.connect(section_cache_changed, sender=section, dispatch_uid=f'cache_{section.__name__}_saved')
+    post_delete.connect(section_cache_changed, sender=section, dispatch_uid=f'cache_{section.__name__}_deleted')
+
+for section in SOURCE_CHECKS:
+    post_save.connect(section_changed, sender=section, dispatch_uid=f'checks_{section.__name__}_saved')
+    post_delete.connect(section_changed, sender=section, dispatch_uid=f'checks_{section.__name__}_deleted')
+
+for section in COVERAGE_SOURCES:
+    post_save.connect(history_rows_changed, sender=section, dispatch_uid=f'coverage_{section.__name__}_saved')
+    post_delete.connect(history_rows_changed, sender=section, dispatch_uid=f'coverage_{section.__name__}_deleted')
+
+connection_created.connect(configure_sqlite, dispatch_uid='applications_configure_sqlite')
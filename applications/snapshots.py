@@ -0,0 +1,119 @@
+import hmac
+import json
+import zlib
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+
+from .encryption import open_row, seal_row
+from .models import Application, SubmissionSnapshot
+from .serializers import (
+    MANY_SECTIONS, ONE_TO_ONE_SECTIONS, SECTIONS, _field_names, application_to_dict, fetch_sections, row_to_dict,
+)
+
+# Bump when the payload layout changes, and add an upgrade step below
+SCHEMA_VERSION = 1
+
+# {from_version: callable(payload) -> payload at from_version + 1}
+UPGRADES = {}
+
+
+# Namespaces the snapshot MAC key derived from SECRET_KEY
+DIGEST_SALT = 'applications.snapshots.digest'
+
+
+class SnapshotIntegrityError(ValueError):
+    pass
+
+
+def sign(raw, secret=None):
+    """
+    HMAC-SHA256 of a snapshot's canonical bytes. Keyed with SECRET_KEY, which
+    never touches the database, so whoever can rewrite a row can't produce a
+    digest that verifies.
+    """
+    return salted_hmac(DIGEST_SALT, raw, secret=secret, algorithm='sha256').hexdigest()
+
+
+def verify(raw, digest):
+    """Check against SECRET_KEY and then SECRET_KEY_FALLBACKS, so the key can be rotated."""
+    for secret in [settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS]:
+        if hmac.compare_digest(sign(raw, secret), digest):
+            return True
+    return False
+
+
+def _canonical(payload):
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def build_payload(application):
+    """
+    The application row plus every section, in serializers' export format.
+    The one-to-one sections are read with one joined query and the others
+    with one query each.
+    """
+    columns = {key: _field_names(model) for key, model in ONE_TO_ONE_SECTIONS}
+    joined = Application.objects.filter(pk=application.pk).values(
+        *[f'{key}__{name}' for key, names in columns.items() for name in names]
+    ).get()
+    sections = {}
+    for key, names in columns.items():
+        row = {name: joined[f'{key}__{name}'] for name in names}
+        sections[key] = row_to_dict(row) if row['id'] is not None else None
+    sections.update(fetch_sections([application.pk], MANY_SECTIONS)[application.pk])
+    return {'application': application_to_dict(application), 'sections': sections}
+
+
+def _map_section_rows(payload, func):
+    """Apply func(model, row) to every section row; used to keep encrypted fields encrypted at rest."""
+    sections = payload['sections']
+    for key, model in SECTIONS:
+        value = sections.get(key)
+        if isinstance(value, list):
+            sections[key] = [func(model, row) for row in value]
+        elif value is not None:
+            sections[key] = func(model, value)
+    return payload
+
+
+def capture(application):
+    """
+    Write a SubmissionSnapshot of `application` as it is now. Call inside the
+    transaction that saves the submission so the two can't disagree.
+    """
+    raw = _canonical(_map_section_rows(build_payload(application), seal_row))
+    return SubmissionSnapshot.objects.create(
+        application=application,
+        schema_version=SCHEMA_VERSION,
+        data=zlib.compress(raw, 9),
+        digest=sign(raw),
+    )
+
+
+def load(snapshot):
+    """
+    Decompress and verify a snapshot, returning its payload upgraded to the
+    current SCHEMA_VERSION. Raises SnapshotIntegrityError if the stored bytes
+    no longer match the MAC written at submit time.
+    """
+    try:
+        raw = zlib.decompress(bytes(snapshot.data))
+    except zlib.error as e:
+        raise SnapshotIntegrityError(f'Snapshot {snapshot.pk} is corrupt: {e}')
+    if not verify(raw, snapshot.digest):
+        raise SnapshotIntegrityError(f'Snapshot {snapshot.pk} does not match its digest')
+    payload = json.loads(raw)
+    for version in range(snapshot.schema_version, SCHEMA_VERSION):
+        payload = UPGRADES[version](payload)
+    # SECTIONS describes the current layout, so decrypt after upgrading
+    return _map_section_rows(payload, open_row)
+
+
+def latest_snapshots(application_ids):
+    """{application_id: newest SubmissionSnapshot} for a batch, in one query."""
+    latest = {}
+    rows = SubmissionSnapshot.objects.filter(application_id__in=list(application_ids)).order_by('application_id', '-created_at', '-pk')
+    for snapshot in rows:
+        latest.setdefault(snapshot.application_id, snapshot)
+    return latest
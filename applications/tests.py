@@ -1,13 +1,49 @@
-from django.test import TestCase, Client
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import FieldError
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, IntegrityError, OperationalError, connection, transaction
+from django.contrib import admin
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, Client, RequestFactory, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from applications.models import (
     Application, PersonalDetails, Premises, ChildcareService,
-    Training, Suitability, Declaration, AddressEntry
+    Training, Suitability, Declaration, AddressEntry, StatusTransition,
+    HouseholdMember, StatusCounter, InvalidTransition, Check, Reference, SubmissionSnapshot,
+    SectionChange, EmploymentEntry, PostcodePrefix
 )
+from applications.admin import ApplicationAdmin
+from applications import app_cache, history, postcodes, snapshots
+from applications.checks import deferred_recompute, outstanding
+from applications.coverage import compute_coverage, incomplete_coverage
+from applications.db import retry_on_locked
+from applications.duplicates import find_duplicate, flag_duplicate, match_q
+from applications.encryption import PREFIX, blind_index, keyring
+from applications.middleware import ReplicaStickinessMiddleware
+from applications.routers import ReplicaRouter, replica_reads, use_replica
 from applications.forms import (
-    PersonalDetailsForm, TrainingForm, AddressEntryFormSet
+    PersonalDetailsForm, TrainingForm, AddressEntryFormSet, ChildcareServiceForm, SuitabilityForm, ReferenceFormSet
 )
+from applications.formset_delta import FormsetDelta
+from applications.paginators import EstimatedCountPaginator
+from applications.workflow import bulk_transition
+from benchmarks.load import LoadResults, percentile
+from benchmarks.scenarios import compare, submission_data
 
 class ModelTests(TestCase):
     def test_application_creation(self):
@@ -246,3 +282,1099 @@ class SaveAndExitTests(TestCase):
         response = self.client.get(self.dashboard_url)
         self.assertEqual(response.context['draft_apps'], 2)
         self.assertEqual(response.context['submitted_apps'], 1)
+
+
+    def test_dashboard_is_paginated(self):
+        """Test that only one page is serialized and page links keep the filters."""
+        apps = [Application.objects.create(status='SUBMITTED') for _ in range(3)]
+        with mock.patch('applications.views.DASHBOARD_PAGE_SIZE', 2):
+            response = self.client.get(self.dashboard_url, {'page': 2, 'checks': 'outstanding'})
+        self.assertEqual([row['id'] for row in json.loads(response.context['apps_json'])], [str(apps[0].pk)])
+        self.assertEqual(json.loads(response.context['status_counts_json'])['SUBMITTED'], 3)
+        self.assertContains(response, '?checks=outstanding&amp;page=1')
+
+class ExportApplicationsTests(TestCase):
+    def _read_export(self, path):
+        with gzip.open(path, 'rt') as fh:
+            return [json.loads(line) for line in fh]
+
+    def test_export_includes_sections_and_resumes(self):
+        """Test that the export streams full graphs and resumes from the cursor."""
+        for name in ['Ann', 'Bea', 'Cat']:
+            app = Application.objects.create(status='SUBMITTED')
+            PersonalDetails.objects.create(application=app, first_name=name)
+            AddressEntry.objects.create(application=app, line1='1 High St', postcode='LS1 1AA')
+
+        with tempfile.TemporaryDirectory() as out:
+            call_command('export_applications', out, chunk_size=2, stdout=StringIO())
+            rows = self._read_export(os.path.join(out, 'applications.jsonl.gz'))
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(sorted(r['personal_details']['first_name'] for r in rows), ['Ann', 'Bea', 'Cat'])
+            self.assertEqual(rows[0]['address_history'][0]['postcode'], 'LS1 1AA')
+            self.assertIsNone(rows[0]['premises'])
+
+            Application.objects.create(status='DRAFT')
+            call_command('export_applications', out, resume=True, stdout=StringIO())
+            rows = self._read_export(os.path.join(out, 'applications.jsonl.gz'))
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(rows[-1]['status'], 'DRAFT')
+
+            # A different selection would append other rows to the same files
+            with self.assertRaisesMessage(CommandError, 'resume it with the same --status'):
+                call_command('export_applications', out, resume=True, status='SUBMITTED', stdout=StringIO())
+            self.assertEqual(len(self._read_export(os.path.join(out, 'applications.jsonl.gz'))), 4)
+
+
+class SeedApplicationsTests(TestCase):
+    def test_seed_creates_application_graphs(self):
+        """Test that seeding creates numbered applications with sections and spread dates."""
+        call_command('seed_applications', count=30, batch_size=7, seed=42, stdout=StringIO())
+        self.assertEqual(Application.objects.count(), 30)
+        self.assertEqual(PersonalDetails.objects.count(), 30)
+        numbers = list(Application.objects.values_list('application_number', flat=True))
+        self.assertEqual(len(set(numbers)), 30)
+        self.assertTrue(all(n and n.startswith('RK-') for n in numbers))
+        self.assertGreater(len(Application.objects.dates('created_at', 'year')), 1)
+        for app in Application.objects.exclude(status='DRAFT'):
+            self.assertEqual(app.references.count(), 2)
+            self.assertTrue(hasattr(app, 'declaration'))
+
+    def test_refuses_counts_that_overflow_application_numbers(self):
+        """Test that running out of yearly application numbers is refused before anything is written."""
+        with self.assertRaisesMessage(CommandError, '--years 4'):
+            call_command('seed_applications', count=200000, years=1, stdout=StringIO())
+        self.assertFalse(Application.objects.exists())
+
+        # Numbers already used count too: nothing is seeded if any year would run out
+        year = timezone.now().year
+        Application.objects.bulk_create(Application(application_number=f'RK-{y}-99990') for y in [year - 1, year])
+        with self.assertRaisesMessage(CommandError, 'already has 99990'):
+            call_command('seed_applications', count=40, years=1, batch_size=5, stdout=StringIO())
+        self.assertEqual(Application.objects.count(), 2)
+
+
+class CleanupEmptyRecordsTests(TestCase):
+    def test_only_default_records_are_deleted(self):
+        """Test that records holding only NULL, '', False or 0 are deleted and any value keeps one."""
+        apps = [Application.objects.create() for _ in range(4)]
+        Premises.objects.create(application=apps[0], local_authority='')
+        Premises.objects.create(application=apps[1], pets_details='Cat')
+        ChildcareService.objects.create(application=apps[0])
+        ChildcareService.objects.create(application=apps[1], number_of_assistants=1)
+        Suitability.objects.create(application=apps[0])
+        Suitability.objects.create(application=apps[1], dbs_number='001234567890')
+        out = StringIO()
+        call_command('cleanup_empty_records', stdout=out)
+        self.assertIn('Deleted 1 empty Premises records', out.getvalue())
+        self.assertEqual(list(Premises.objects.values_list('application', flat=True)), [apps[1].pk])
+        self.assertEqual(list(ChildcareService.objects.values_list('application', flat=True)), [apps[1].pk])
+        self.assertEqual(list(Suitability.objects.values_list('application', flat=True)), [apps[1].pk])
+
+class BenchmarkCompareTests(TestCase):
+    def test_compare_flags_query_and_time_regressions(self):
+        """Test that extra queries always regress while small timing noise is tolerated."""
+        baseline = {'1000': {'dashboard_view': {'wall_ms': 100.0, 'queries': 10, 'peak_kib': 2048}}}
+        noisy = {'1000': {'dashboard_view': {'wall_ms': 110.0, 'queries': 10, 'peak_kib': 2100}}}
+        self.assertEqual(compare(noisy, baseline, tolerance=0.25), [])
+        slower = {'1000': {'dashboard_view': {'wall_ms': 200.0, 'queries': 11, 'peak_kib': 2048}}}
+        self.assertEqual(len(compare(slower, baseline, tolerance=0.25)), 2)
+
+
+class LoadHarnessTests(TestCase):
+    def test_summary_reports_percentiles_and_locked_rate(self):
+        """Test that the load report computes latency percentiles and lock error rates."""
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 99), 4)
+        results = LoadResults()
+        results.started, results.finished = 0.0, 2.0
+        for i in range(1, 11):
+            results.add('save_and_exit', i / 1000, 'locked' if i > 8 else 'ok')
+        row = results.summary()['kinds']['save_and_exit']
+        self.assertEqual(row['requests'], 10)
+        self.assertEqual(row['throughput_rps'], 5.0)
+        self.assertEqual(row['p50_ms'], 5.0)
+        self.assertEqual(row['p95_ms'], 10.0)
+        self.assertEqual(row['locked_rate'], 0.2)
+
+
+class ApplicationAdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.admin_user)
+        self.changelist_url = reverse('admin:applications_application_changelist')
+
+    def _create(self, first_name, last_name, email):
+        app = Application.objects.create(status='SUBMITTED')
+        PersonalDetails.objects.create(application=app, first_name=first_name, last_name=last_name, email=email)
+        return app
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Test that applicant names are select_related instead of queried per row."""
+        for i in range(3):
+            self._create('Ann', f'Smith{i}', f'ann{i}@example.com')
+        baseline = self._count_queries()
+        for i in range(5):
+            self._create('Bob', f'Jones{i}', f'bob{i}@example.com')
+        self.assertEqual(self._count_queries(), baseline)
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.changelist_url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_search_uses_normalized_columns(self):
+        """Test that admin search matches emails case-insensitively and names by prefix."""
+        jane = self._create('Jane', 'Smith', 'Jane.Smith@Example.com')
+        self._create('John', 'Smithers', 'john@example.com')
+
+        response = self.client.get(self.changelist_url, {'q': 'JANE.smith@example.com'})
+        self.assertEqual(list(response.context['cl'].result_list), [jane])
+
+        response = self.client.get(self.changelist_url, {'q': 'ja  smi'})
+        self.assertEqual(list(response.context['cl'].result_list), [jane])
+
+        response = self.client.get(self.changelist_url, {'q': 'Smith'})
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+
+        response = self.client.get(self.changelist_url, {'q': jane.application_number.lower()})
+        self.assertEqual(list(response.context['cl'].result_list), [jane])
+
+    def test_estimated_paginator_caps_filtered_counts(self):
+        """Test that the paginator counts exactly when small and caps filtered counts."""
+        for i in range(4):
+            Application.objects.create(status='DRAFT')
+        paginator = EstimatedCountPaginator(Application.objects.all(), 2)
+        self.assertEqual(paginator.count, 4)
+
+        class SmallLimitPaginator(EstimatedCountPaginator):
+            exact_count_limit = 2
+        paginator = SmallLimitPaginator(Application.objects.filter(status='DRAFT'), 2)
+        self.assertEqual(paginator.count, 3)
+
+    def test_estimated_paginator_reaches_rows_past_the_cap(self):
+        """Test that a filtered listing over exact_count_limit pages through to its last row."""
+        Application.objects.bulk_create(Application(status='DRAFT') for _ in range(10150))
+        drafts = Application.objects.filter(status='DRAFT').order_by('id')
+        last = drafts.last()
+        paginator = EstimatedCountPaginator(drafts, 100)
+        self.assertEqual(paginator.count, 10001)
+        self.assertFalse(paginator.has_total)
+
+        page = paginator.get_page(101)
+        self.assertTrue(page.has_next())
+        page = paginator.get_page(page.next_page_number())
+        self.assertEqual(page.object_list[-1], last)
+        self.assertFalse(page.has_next())
+        self.assertTrue(paginator.has_total)
+        self.assertEqual(paginator.count, 10150)
+
+        paginator = EstimatedCountPaginator(drafts, 100)
+        self.assertEqual(paginator.get_page(500).number, 101)
+
+
+class ApplicationAdminChangePageTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        self.app = Application.objects.create(status='SUBMITTED')
+        PersonalDetails.objects.create(application=self.app, first_name='Jane', last_name='Smith')
+        AddressEntry.objects.create(application=self.app, line1='1 High St', postcode='LS1 1AA')
+        self.change_url = reverse('admin:applications_application_change', args=[self.app.pk])
+
+    def test_summary_renders_without_formsets(self):
+        """Test that the change page opens on a summary with no inline formsets."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.change_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/applications/application/summary.html')
+        self.assertContains(response, 'Jane')
+        self.assertContains(response, 'LS1 1AA')
+        self.assertNotContains(response, 'TOTAL_FORMS')
+        # Application + one-to-ones in one join, one prefetch per list section, plus session/user
+        self.assertLessEqual(len(queries), 8)
+
+    def test_section_builds_and_saves_only_its_inline(self):
+        """Test that ?section= renders and saves a single inline formset."""
+        response = self.client.get(self.change_url, {'section': 'personal_details'})
+        self.assertContains(response, 'personal_details-TOTAL_FORMS')
+        self.assertNotContains(response, 'address_history-TOTAL_FORMS')
+
+        pd = self.app.personal_details
+        response = self.client.post(f'{self.change_url}?section=personal_details', {
+            'status': 'SUBMITTED',
+            'last_section_completed': '0',
+            'personal_details-TOTAL_FORMS': '1',
+            'personal_details-INITIAL_FORMS': '1',
+            'personal_details-MIN_NUM_FORMS': '0',
+            'personal_details-MAX_NUM_FORMS': '1',
+            'personal_details-0-id': pd.pk,
+            'personal_details-0-application': self.app.pk,
+            'personal_details-0-first_name': 'Janet',
+            'personal_details-0-last_name': 'Smith',
+            '_save': 'Save',
+        })
+        self.assertRedirects(response, self.change_url)
+        pd.refresh_from_db()
+        self.assertEqual(pd.first_name, 'Janet')
+        self.assertEqual(self.app.address_history.count(), 1)
+
+
+class BulkTransitionTests(TestCase):
+    def test_admin_action_moves_selected_and_audits(self):
+        """Test that the admin action updates status in bulk and writes audit rows."""
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(user)
+        apps = [Application.objects.create(status='SUBMITTED') for _ in range(3)]
+        other = Application.objects.create(status='DRAFT')
+
+        response = self.client.post(reverse('admin:applications_application_changelist'), {
+            'action': 'mark_under_review',
+            '_selected_action': [str(app.pk) for app in apps[:2]],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Application.objects.filter(status='UNDER_REVIEW').count(), 2)
+        transitions = StatusTransition.objects.filter(to_status='UNDER_REVIEW')
+        self.assertEqual(transitions.count(), 2)
+        self.assertTrue(all(t.from_status == 'SUBMITTED' and t.changed_by == user for t in transitions))
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'DRAFT')
+
+    def test_command_filters_by_status(self):
+        """Test that the command moves only applications matching --from."""
+        for _ in range(2):
+            Application.objects.create(status='SUBMITTED')
+        Application.objects.create(status='DRAFT')
+        call_command('transition_applications', to_status='CHECKS_IN_PROGRESS', from_status='SUBMITTED', stdout=StringIO())
+        self.assertEqual(Application.objects.filter(status='CHECKS_IN_PROGRESS').count(), 2)
+        self.assertEqual(StatusTransition.objects.count(), 2)
+        # Re-running is a no-op
+        call_command('transition_applications', to_status='CHECKS_IN_PROGRESS', from_status='SUBMITTED', stdout=StringIO())
+        self.assertEqual(StatusTransition.objects.count(), 2)
+
+
+@skipUnlessDBFeature('supports_explaining_query_execution')
+class QueryPlanTests(TestCase):
+    """EXPLAIN the hot dashboard, admin and search queries and reject full table scans."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            app = Application.objects.create(status='SUBMITTED' if i % 2 else 'DRAFT')
+            PersonalDetails.objects.create(application=app, first_name='Jane', last_name=f'Smith{i}',
+                                           email=f'jane{i}@example.com', ni_number=f'AB12345{i}C')
+            AddressEntry.objects.create(application=app, line1='1 High St', postcode=f'LS{i} 1AA')
+
+    def plan(self, queryset):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Plan assertions are written against SQLite EXPLAIN QUERY PLAN output')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertNoFullScan(self, queryset, allow_sort=True):
+        plan = self.plan(queryset)
+        full_scans = [line for line in plan if re.match(r'^SCAN \w+$', line)]
+        self.assertEqual(full_scans, [], plan)
+        if not allow_sort:
+            self.assertFalse([line for line in plan if 'TEMP B-TREE' in line], plan)
+
+    def test_dashboard_queries(self):
+        self.assertNoFullScan(Application.objects.order_by('-created_at'), allow_sort=False)
+        self.assertNoFullScan(Application.objects.filter(status='SUBMITTED'))
+        self.assertNoFullScan(Application.objects.filter(status__in=['CHECKS_IN_PROGRESS', 'UNDER_REVIEW']))
+        self.assertNoFullScan(Application.objects.filter(status='SUBMITTED').order_by('-created_at', '-id'), allow_sort=False)
+        app_ids = list(Application.objects.values_list('pk', flat=True))
+        self.assertNoFullScan(AddressEntry.objects.filter(application_id__in=app_ids[:2]))
+        self.assertNoFullScan(HouseholdMember.objects.filter(application_id__in=app_ids[:2]))
+
+    def test_admin_changelist_queries(self):
+        model_admin = ApplicationAdmin(Application, admin.site)
+        ordered = Application.objects.select_related('personal_details').order_by('-created_at', '-pk')
+        self.assertNoFullScan(ordered, allow_sort=False)
+        self.assertNoFullScan(ordered.filter(status='SUBMITTED'), allow_sort=False)
+        for term in ['jane1@example.com', 'smith', 'jane smi', 'RK-2026', 'AB123451C']:
+            queryset, _ = model_admin.get_search_results(None, ordered, term)
+            self.assertNoFullScan(queryset)
+
+    def test_search_lookups(self):
+        self.assertNoFullScan(PersonalDetails.objects.filter(email='jane1@example.com'))
+        self.assertNoFullScan(PersonalDetails.objects.filter(ni_number_index=blind_index('AB123451C')))
+        self.assertNoFullScan(PersonalDetails.objects.filter(last_name='Smith1'))
+        pd = PersonalDetails.objects.get(email='jane1@example.com')
+        self.assertNoFullScan(PersonalDetails.objects.filter(match_q(pd), application__created_at__lt=timezone.now()))
+        self.assertNoFullScan(AddressEntry.objects.filter(postcode='LS1 1AA'))
+        self.assertNoFullScan(Application.objects.filter(updated_at__gte=timezone.now()))
+
+
+class StatusWorkflowTests(TestCase):
+    def test_transition_logs_and_counts(self):
+        """Test that transitions are validated, logged and reflected in the counters."""
+        app = Application.objects.create()
+        self.assertEqual(StatusCounter.as_dict()['DRAFT'], 1)
+
+        app.transition_to('SUBMITTED')
+        app = Application.objects.get(pk=app.pk)
+        app.transition_to('UNDER_REVIEW', note='Ready')
+        with self.assertRaises(InvalidTransition):
+            app.transition_to('DRAFT')
+
+        self.assertEqual(
+            list(app.status_transitions.values_list('from_status', 'to_status')),
+            [('DRAFT', 'SUBMITTED'), ('SUBMITTED', 'UNDER_REVIEW')],
+        )
+        counts = StatusCounter.as_dict()
+        self.assertEqual((counts['DRAFT'], counts['SUBMITTED'], counts['UNDER_REVIEW']), (0, 0, 1))
+
+        app.delete()
+        self.assertEqual(sum(StatusCounter.as_dict().values()), 0)
+
+    def test_bulk_transition_skips_disallowed_and_adjusts_counters_once(self):
+        """Test that bulk moves only touch allowed sources and keep counters exact."""
+        for status in ['SUBMITTED', 'SUBMITTED', 'DRAFT', 'REGISTERED']:
+            Application.objects.create(status=status)
+        with CaptureQueriesContext(connection) as queries:
+            moved = bulk_transition(Application.objects.all(), 'CHECKS_IN_PROGRESS')
+        self.assertEqual(moved, 2)
+        counter_updates = [q for q in queries if 'applications_statuscounter' in q['sql']]
+        self.assertEqual(len(counter_updates), 2)  # one per status touched, not per row
+
+        StatusCounter.objects.update(count=0)
+        StatusCounter.rebuild()
+        self.assertEqual(StatusCounter.as_dict(), {
+            'DRAFT': 1, 'SUBMITTED': 0, 'CHECKS_IN_PROGRESS': 2, 'UNDER_REVIEW': 0, 'REGISTERED': 1,
+        })
+        self.assertFalse(Application.objects.filter(status='CHECKS_IN_PROGRESS', status_changed_at__isnull=True).exists())
+
+
+class CheckTests(TestCase):
+    def checks(self, app):
+        return dict(app.checks.values_list('check_type', 'status'))
+
+    def test_section_saves_recompute_only_their_checks(self):
+        """Test that section saves keep Check rows current without touching staff-set checks."""
+        app = Application.objects.create()
+        self.assertEqual(set(self.checks(app).values()), {'not-started'})
+        Check.objects.filter(application=app, check_type='ofsted').update(status='complete')
+
+        Suitability.objects.create(application=app, has_dbs=True, dbs_number='001234567890')
+        Training.objects.create(application=app, first_aid_completed=True)
+        ref = Reference.objects.create(application=app, first_name='Ann')
+        checks = self.checks(app)
+        self.assertEqual(
+            (checks['dbs'], checks['first_aid'], checks['safeguarding'], checks['ref_1'], checks['ref_2'], checks['ofsted']),
+            ('complete', 'complete', 'not-started', 'pending', 'not-started', 'complete'),
+        )
+        self.assertEqual(app.checks.get(check_type='dbs').details, '********7890')
+
+        ref.delete()
+        self.assertEqual(self.checks(app)['ref_1'], 'not-started')
+        app.delete()
+        self.assertFalse(Check.objects.exists())
+
+    def test_outstanding_filter_and_recompute_command(self):
+        """Test the SQL outstanding filter and the backfill command for rows written in bulk."""
+        done = Application.objects.create()
+        pending = Application.objects.create()
+        Check.objects.filter(application=done).update(status='complete')
+        self.assertEqual(list(outstanding(Application.objects.all())), [pending])
+
+        Training.objects.bulk_create([Training(application=pending, safeguarding_completed=True)])
+        Check.objects.filter(application=pending, check_type='dbs').delete()
+        self.assertEqual(list(outstanding(Application.objects.all(), 'safeguarding')), [pending])
+
+        # Derived checks follow the sections again; `done` has none, so its are reset
+        call_command('recompute_checks', stdout=StringIO())
+        self.assertEqual(list(outstanding(Application.objects.all(), 'safeguarding')), [done])
+        self.assertEqual(pending.checks.count(), len(Check.CHECK_TYPES))
+
+        response = self.client.get(reverse('dashboard'), {'checks': 'outstanding', 'check_type': 'safeguarding'})
+        self.assertEqual([a['id'] for a in json.loads(response.context['apps_json'])], [str(done.pk)])
+
+
+class SubmissionSnapshotTests(TestCase):
+    def test_submit_snapshots_declared_graph(self):
+        """Test that submitting freezes the graph and exports can read it instead of live rows."""
+        response = self.client.post(reverse('register'), submission_data())
+        self.assertEqual(response.status_code, 302)
+        app = Application.objects.get()
+        snapshot = app.snapshots.get()
+        payload = snapshots.load(snapshot)
+        self.assertEqual(payload['application']['status'], 'SUBMITTED')
+        self.assertEqual(payload['sections']['personal_details']['first_name'], 'Bench')
+        self.assertEqual(len(payload['sections']['references']), 2)
+        self.assertLess(len(snapshot.data), len(snapshots._canonical(payload)))
+
+        PersonalDetails.objects.filter(application=app).update(first_name='Edited')
+        with tempfile.TemporaryDirectory() as out:
+            call_command('export_applications', out, snapshots=True, stdout=StringIO())
+            with gzip.open(os.path.join(out, 'applications.jsonl.gz'), 'rt') as fh:
+                row = json.loads(fh.readline())
+        self.assertEqual(row['personal_details']['first_name'], 'Bench')
+        self.assertEqual(row['application_number'], app.application_number)
+
+    def test_tampered_snapshot_is_detected(self):
+        """Test that edits to the stored bytes fail digest verification."""
+        app = Application.objects.create(status='SUBMITTED')
+        PersonalDetails.objects.create(application=app, first_name='Ann')
+        snapshot = snapshots.capture(app)
+        payload = snapshots.load(snapshot)
+        payload['sections']['personal_details']['first_name'] = 'Eve'
+        SubmissionSnapshot.objects.filter(pk=snapshot.pk).update(data=zlib.compress(snapshots._canonical(payload)))
+        with self.assertRaises(snapshots.SnapshotIntegrityError):
+            snapshots.load(SubmissionSnapshot.objects.get(pk=snapshot.pk))
+
+    def test_rewritten_digest_is_detected(self):
+        """Test that rewriting the data together with a recomputed digest still fails verification."""
+        app = Application.objects.create(status='SUBMITTED')
+        PersonalDetails.objects.create(application=app, first_name='Ann')
+        payload = snapshots.load(snapshots.capture(app))
+        payload['sections']['personal_details']['first_name'] = 'Eve'
+        raw = snapshots._canonical(payload)
+        for digest in [hashlib.sha256(raw).hexdigest(), snapshots.sign(raw, secret='guessed-key')]:
+            SubmissionSnapshot.objects.update(data=zlib.compress(raw), digest=digest)
+            with self.assertRaises(snapshots.SnapshotIntegrityError):
+                snapshots.load(SubmissionSnapshot.objects.get())
+
+        with self.settings(SECRET_KEY='rotated', SECRET_KEY_FALLBACKS=[settings.SECRET_KEY]):
+            SubmissionSnapshot.objects.update(digest=snapshots.sign(raw, secret=settings.SECRET_KEY_FALLBACKS[0]))
+            self.assertEqual(snapshots.load(SubmissionSnapshot.objects.get())['sections']['personal_details']['first_name'], 'Eve')
+
+
+class WriteRetryTests(SimpleTestCase):
+    @override_settings(DB_WRITE_RETRIES=2)
+    def test_retries_locked_errors_with_backoff(self):
+        """Test that locked errors are retried up to DB_WRITE_RETRIES and other errors are not."""
+        calls = []
+
+        @retry_on_locked
+        def flaky(fail_times, message='database is locked'):
+            calls.append(1)
+            if len(calls) <= fail_times:
+                raise OperationalError(message)
+            return 'ok'
+
+        with mock.patch('applications.db.time.sleep') as sleep:
+            self.assertEqual(flaky(2), 'ok')
+            self.assertEqual((len(calls), sleep.call_count), (3, 2))
+            calls.clear()
+            with self.assertRaises(OperationalError):
+                flaky(3)
+            self.assertEqual(len(calls), 3)
+            calls.clear()
+            with self.assertRaises(OperationalError):
+                flaky(1, 'no such table: x')
+            self.assertEqual(len(calls), 1)
+
+
+class SQLiteTuningTests(TestCase):
+    def test_connection_pragmas_applied(self):
+        """Test that the connection hook applies busy_timeout and synchronous."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_number_allocation_retries_on_collision(self):
+        """Test that a save that loses the race for an application number takes the next one."""
+        taken = Application.objects.create().application_number
+        next_number = taken[:-5] + '00002'
+        with mock.patch.object(Application, '_generate_application_number', side_effect=[taken, next_number]), \
+                mock.patch('applications.models.time.sleep'):
+            app = Application.objects.create()
+        self.assertEqual(app.application_number, next_number)
+        self.assertEqual(StatusCounter.as_dict()['DRAFT'], 2)
+
+
+@mock.patch('applications.routers.replica_configured', return_value=True)
+@mock.patch('applications.middleware.replica_configured', return_value=True)
+class ReplicaRoutingTests(SimpleTestCase):
+    def test_reads_pinned_only_inside_use_replica(self, *mocks):
+        """Test that only pinned reads go to the replica and writes never do."""
+        self.assertEqual(Application.objects.all().db, 'default')
+        with use_replica():
+            self.assertEqual(Application.objects.all().db, 'replica')
+            self.assertEqual(ReplicaRouter().db_for_write(Application), 'default')
+        self.assertFalse(ReplicaRouter().allow_migrate('replica', 'applications'))
+
+    def test_session_sticks_to_primary_after_write(self, *mocks):
+        """Test read-your-writes: a session that just wrote reads from the primary."""
+        view = replica_reads(lambda request: HttpResponse(Application.objects.all().db))
+        request = RequestFactory().get('/dashboard/')
+        request.session = {}
+        self.assertEqual(view(request).content, b'replica')
+
+        def write(request):
+            ReplicaRouter().db_for_write(Application)
+            return HttpResponse()
+        post = RequestFactory().post('/')
+        post.session = request.session
+        ReplicaStickinessMiddleware(write)(post)
+        self.assertEqual(view(request).content, b'default')
+
+
+class SectionHistoryTests(TestCase):
+    def test_request_changes_are_diffed_and_bulk_written(self):
+        """Test that only changed fields are stored and a block's changes are inserted together."""
+        app = Application.objects.create()
+        with history.collect(), self.captureOnCommitCallbacks(execute=True):
+            PersonalDetails.objects.create(application=app, first_name='Ann', last_name='Lee')
+            Premises.objects.create(application=app, local_authority='Leeds')
+        pd = PersonalDetails.objects.get(application=app)
+        pd.first_name = 'Anne'
+        with CaptureQueriesContext(connection) as queries:
+            with history.collect(), self.captureOnCommitCallbacks(execute=True):
+                pd.save()
+                Premises.objects.get(application=app).save()  # unchanged: no row
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "applications_sectionchange"')]
+        self.assertEqual(len(inserts), 1)
+
+        changes = list(app.section_changes.values_list('section', 'version', 'action', 'changes'))
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(changes[2], ('personal_details', 2, 'update', {'first_name': 'Anne'}))
+
+    def test_history_commits_with_the_edit(self):
+        """Test that a failed history insert rolls back the edit and versions can't be taken twice."""
+        app = Application.objects.create()
+        with mock.patch.object(history, 'write_changes', side_effect=DatabaseError('disk full')):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                with history.collect():
+                    PersonalDetails.objects.create(application=app, first_name='Ann')
+        self.assertFalse(PersonalDetails.objects.exists())
+
+        pd = PersonalDetails.objects.create(application=app, first_name='Ann')
+        self.assertEqual(app.section_changes.get().version, 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            SectionChange.objects.create(application=app, section='personal_details', object_id=pd.pk, version=1, action='update')
+
+    def test_reconstruct_from_checkpoints(self):
+        """Test rebuilding past versions from the nearest checkpoint and diffs."""
+        app = Application.objects.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            training = Training.objects.create(application=app, first_aid_org='Org 0')
+        for i in range(1, 13):
+            training = Training.objects.get(pk=training.pk)
+            training.first_aid_org = f'Org {i}'
+            with self.captureOnCommitCallbacks(execute=True):
+                training.save()
+        checkpoints = SectionChange.objects.filter(state__isnull=False).values_list('version', flat=True)
+        self.assertEqual(sorted(checkpoints), [1, history.CHECKPOINT_INTERVAL])
+
+        self.assertEqual(history.reconstruct('training', training.pk, 5)['first_aid_org'], 'Org 4')
+        self.assertEqual(history.reconstruct('training', training.pk), history.row_state(training))
+        pk = training.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            training.delete()
+        self.assertIsNone(history.reconstruct('training', pk))
+        self.assertEqual(history.reconstruct('training', pk, 13)['first_aid_org'], 'Org 12')
+
+
+class EncryptedFieldTests(TestCase):
+    def stored(self, model, field, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT {field} FROM {model._meta.db_table} WHERE id = %s', [pk])
+            return cursor.fetchone()[0]
+
+    def test_identifiers_encrypted_at_rest_and_found_by_blind_index(self):
+        """Test that NI/DBS numbers are stored encrypted, read back in clear and matched via their index."""
+        app = Application.objects.create()
+        with history.collect(), self.captureOnCommitCallbacks(execute=True):
+            pd = PersonalDetails.objects.create(application=app, first_name='Ann', ni_number='AB123456C')
+            su = Suitability.objects.create(application=app, has_dbs=True, dbs_number='001234567890')
+        self.assertTrue(self.stored(PersonalDetails, 'ni_number', pd.pk).startswith(PREFIX))
+        self.assertTrue(self.stored(Suitability, 'dbs_number', su.pk).startswith(PREFIX))
+        self.assertEqual(PersonalDetails.objects.get(ni_number_index=blind_index('ab 12 34 56 c')).ni_number, 'AB123456C')
+        self.assertEqual(Suitability.objects.get(dbs_number_index=blind_index('001234567890')).pk, su.pk)
+
+        # Plaintext doesn't leak through history, snapshots or checks
+        self.assertNotIn('AB123456C', json.dumps(list(app.section_changes.values('changes', 'state'))))
+        self.assertEqual(history.reconstruct('personal_details', pd.pk)['ni_number'], 'AB123456C')
+        snapshot = snapshots.capture(app)
+        self.assertNotIn(b'001234567890', zlib.decompress(snapshot.data))
+        self.assertEqual(snapshots.load(snapshot)['sections']['suitability']['dbs_number'], '001234567890')
+        self.assertNotIn('001234567890', Check.objects.get(application=app, check_type='dbs').details)
+
+        with self.assertRaises(FieldError):
+            PersonalDetails.objects.filter(ni_number='AB123456C').exists()
+
+    def test_legacy_plaintext_and_key_rotation(self):
+        """Test that plaintext rows still read, and reencrypt_fields moves rows to a new first key."""
+        app = Application.objects.create()
+        pd = PersonalDetails.objects.create(application=app)
+        with connection.cursor() as cursor:
+            cursor.execute(f'UPDATE {PersonalDetails._meta.db_table} SET ni_number = %s WHERE id = %s', ['QQ123456C', pd.pk])
+        self.assertEqual(PersonalDetails.objects.get(pk=pd.pk).ni_number, 'QQ123456C')
+
+        with override_settings(FIELD_ENCRYPTION_KEYS=['new-key', settings.SECRET_KEY]):
+            call_command('reencrypt_fields', stdout=StringIO())
+            self.assertTrue(self.stored(PersonalDetails, 'ni_number', pd.pk).startswith(PREFIX))
+            self.assertEqual(PersonalDetails.objects.get(ni_number_index=blind_index('QQ123456C')).pk, pd.pk)
+        with override_settings(FIELD_ENCRYPTION_KEYS=['new-key']):
+            self.assertEqual(PersonalDetails.objects.get(pk=pd.pk).ni_number, 'QQ123456C')
+        # Keys are derived once per key set, not per row
+        self.assertIs(keyring(), keyring())
+
+
+class DuplicateDetectionTests(TestCase):
+    def make(self, days_ago, **personal):
+        app = Application.objects.create()
+        Application.objects.filter(pk=app.pk).update(created_at=timezone.now() - datetime.timedelta(days=days_ago))
+        app.refresh_from_db()
+        return PersonalDetails.objects.create(application=app, **personal)
+
+    def test_save_links_to_earlier_application(self):
+        """Test that a new application matching an older one's email is flagged with one query."""
+        first = self.make(10, email='Jane@Example.com', first_name='Jane')
+        second = self.make(1, email='jane@example.com ')
+        with self.assertNumQueries(1):
+            self.assertEqual(find_duplicate(second), first.application_id)
+        flag_duplicate(second)
+        self.assertEqual(Application.objects.get(pk=second.application_id).duplicate_of_id, first.application_id)
+        self.assertIsNone(find_duplicate(first))
+
+        second.email = 'someone.else@example.com'
+        second.save()
+        flag_duplicate(second)
+        self.assertIsNone(Application.objects.get(pk=second.application_id).duplicate_of_id)
+
+    def test_cluster_command_merges_keys_transitively(self):
+        """Test that applications linked through different keys end up in one cluster."""
+        dob = datetime.date(1990, 5, 1)
+        a = self.make(30, ni_number='AB123456C')
+        b = self.make(20, ni_number='AB123456C', email='b@example.com')
+        c = self.make(10, email='B@example.com')
+        d = self.make(25, first_name='Ann', last_name='Lee', dob=dob)
+        e = self.make(5, first_name=' ann ', last_name='LEE', dob=dob)
+        f = self.make(1, first_name='Ann', last_name='Lee', dob=datetime.date(1991, 5, 1))
+        Application.objects.filter(pk=f.application_id).update(duplicate_of=a.application_id)  # stale link
+
+        call_command('cluster_duplicates', stdout=StringIO())
+        links = dict(Application.objects.values_list('pk', 'duplicate_of'))
+        self.assertEqual(links[b.application_id], a.application_id)
+        self.assertEqual(links[c.application_id], a.application_id)
+        self.assertEqual(links[e.application_id], d.application_id)
+        self.assertIsNone(links[a.application_id])
+        self.assertIsNone(links[d.application_id])
+        self.assertIsNone(links[f.application_id])
+
+
+class HistoryCoverageTests(TestCase):
+    as_of = datetime.date(2026, 6, 30)
+
+    def test_sweep_finds_gaps_and_overlaps(self):
+        """Test the interval sweep over the five-year window."""
+        d = datetime.date
+        contiguous = [(d(2015, 1, 1), d(2022, 3, 31)), (d(2022, 4, 1), d(2024, 1, 10)), (d(2024, 1, 10), None)]
+        self.assertEqual(compute_coverage(contiguous, self.as_of), (True, [], []))
+
+        gappy = [(d(2020, 1, 1), d(2023, 1, 31)), (d(2023, 3, 1), d(2026, 1, 1))]
+        self.assertEqual(compute_coverage(gappy, self.as_of), (False, [
+            ['2023-02-01', '2023-02-28'], ['2026-01-02', '2026-06-30'],
+        ], []))
+
+        overlapping = [(d(2020, 1, 1), d(2024, 6, 30)), (d(2024, 1, 1), None)]
+        self.assertEqual(compute_coverage(overlapping, self.as_of), (False, [], [['2024-01-01', '2024-06-30']]))
+        self.assertEqual(compute_coverage(overlapping, self.as_of, allow_overlap=True)[0], True)
+
+    def test_section_saves_keep_coverage_current(self):
+        """Test that address saves recompute coverage once per block and the dashboard filter uses it."""
+        app = Application.objects.create()
+        other = Application.objects.create()
+        today = timezone.localdate()
+        with deferred_recompute():
+            AddressEntry.objects.create(application=app, move_in_date=today - datetime.timedelta(days=365 * 6))
+            EmploymentEntry.objects.create(application=app, start_date=today - datetime.timedelta(days=365 * 3))
+        address = app.coverage.get(kind='address')
+        self.assertTrue(address.coverage_ok)
+        employment = app.coverage.get(kind='employment')
+        self.assertFalse(employment.coverage_ok)
+        self.assertEqual(len(employment.gaps), 1)
+
+        self.assertEqual(set(incomplete_coverage(Application.objects.all())), {app, other})
+        self.assertEqual(list(incomplete_coverage(Application.objects.all(), 'address')), [other])
+        response = self.client.get(reverse('dashboard'), {'coverage': 'incomplete', 'kind': 'address'})
+        self.assertEqual(response.status_code, 200)
+
+
+class HouseholdReclassificationTests(TestCase):
+    def test_is_adult_derived_from_dob_on_save(self):
+        """Test that is_adult follows dob when given and the manual value otherwise."""
+        app = Application.objects.create()
+        cutoff = HouseholdMember.adult_cutoff()
+        child = HouseholdMember.objects.create(application=app, dob=cutoff + datetime.timedelta(days=1), is_adult=True)
+        adult = HouseholdMember.objects.create(application=app, dob=cutoff, is_adult=False)
+        unknown = HouseholdMember.objects.create(application=app, is_adult=False)
+        self.assertEqual([child.is_adult, adult.is_adult, unknown.is_adult], [False, True, False])
+
+    def test_nightly_command_reclassifies_with_set_based_updates(self):
+        """Test that members who came of age flip and their applications' flags follow."""
+        today = datetime.date(2026, 3, 1)
+        app = Application.objects.create(has_adults_in_home=True, has_children_in_home=True)
+        untouched = Application.objects.create(has_adults_in_home=True, has_children_in_home=False)
+        HouseholdMember.objects.create(application=untouched, dob=datetime.date(1980, 1, 1))
+        # Saved (and classified) before their 16th birthday
+        teen = HouseholdMember.objects.create(application=app, dob=datetime.date(2010, 2, 20))
+        HouseholdMember.objects.filter(pk=teen.pk).update(is_adult=False)
+
+        with self.assertNumQueries(4):  # SAVEPOINT/BEGIN, two UPDATEs, RELEASE/COMMIT
+            call_command('reclassify_household', '--date', today.isoformat(), stdout=StringIO())
+        self.assertTrue(HouseholdMember.objects.get(pk=teen.pk).is_adult)
+        app.refresh_from_db()
+        self.assertEqual((app.has_adults_in_home, app.has_children_in_home), (True, False))
+
+        out = StringIO()
+        call_command('reclassify_household', '--date', today.isoformat(), stdout=out)
+        self.assertIn('Reclassified 0 household members (0 applications', out.getvalue())
+
+
+class PostcodeAuthorityTests(TestCase):
+    DATASET = [
+        ('pcds', 'laua', 'lad_name'),
+        ('LS1 1AA', 'E08000035', 'Leeds'),
+        ('LS1 1AB', 'E08000035', 'Leeds'),
+        ('LS1 2AA', 'E08000035', 'Leeds'),
+        ('BS1 1AA', 'E06000023', 'Bristol, City of'),
+        ('BS1 1AB', 'E06000024', 'North Somerset'),
+        ('BS1 2AA', 'E06000023', 'Bristol, City of'),
+    ]
+
+    def setUp(self):
+        self.addCleanup(postcodes.clear_cache)
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('\n'.join(','.join(f'"{v}"' for v in row) for row in self.DATASET))
+        self.addCleanup(os.remove, f.name)
+        out = StringIO()
+        call_command('load_postcodes', f.name, '--name-column', 'lad_name', stdout=out)
+        self.assertIn('Loaded 6 postcodes as 4 prefixes across 3 authorities', out.getvalue())
+
+    def test_normalise_and_prefix_lookup(self):
+        """Test postcode normalisation and the longest-prefix lookup over the compact table."""
+        self.assertEqual(postcodes.normalize_postcode(' ls11aa'), 'LS1 1AA')
+        self.assertEqual(postcodes.normalize_postcode('sw1a-1aa'), 'SW1A 1AA')
+        self.assertEqual(postcodes.normalize_postcode(' not a  postcode'), 'NOT A POSTCODE')
+        self.assertEqual(
+            sorted(PostcodePrefix.objects.values_list('prefix', flat=True)), ['BS1 1AA', 'BS1 1AB', 'BS1 2', 'LS1']
+        )
+        self.assertTrue(postcodes.dataset_loaded())  # read once per process, then served from memory
+        with self.assertNumQueries(0):
+            self.assertEqual(postcodes.authority_for_postcode('ls1 9zz'), 'E08000035')  # district-wide
+            self.assertEqual(postcodes.authority_for_postcode('BS1 2XX'), 'E06000023')  # sector-wide
+            self.assertEqual(postcodes.authority_for_postcode('BS1 1AB'), 'E06000024')  # split sector
+            self.assertIsNone(postcodes.authority_for_postcode('BS1 1ZZ'))
+
+    def test_saves_derive_authority_and_bulk_renormalise(self):
+        """Test derivation on save and the bulk command fixing rows written before it."""
+        app = Application.objects.create()
+        address = AddressEntry.objects.create(application=app, postcode='bs1 2ab', is_current=True)
+        self.assertEqual((address.postcode, address.local_authority_code), ('BS1 2AB', 'E06000023'))
+        premises = Premises.objects.create(application=app, local_authority='bristol city council')
+        self.assertEqual((premises.local_authority, premises.local_authority_code), ('Bristol, City of', 'E06000023'))
+        premises.local_authority = 'Somewhere'
+        premises.save()  # unmatched name: falls back to the current address
+        self.assertEqual(premises.local_authority_code, 'E06000023')
+
+        AddressEntry.objects.filter(pk=address.pk).update(postcode='ls12aa', local_authority_code=None)
+        Premises.objects.filter(pk=premises.pk).update(local_authority='leeds', local_authority_code=None)
+        call_command('normalise_postcodes', stdout=StringIO())
+        address.refresh_from_db()
+        premises.refresh_from_db()
+        self.assertEqual((address.postcode, address.local_authority_code), ('LS1 2AA', 'E08000035'))
+        self.assertEqual((premises.local_authority, premises.local_authority_code), ('Leeds', 'E08000035'))
+
+    def test_seed_derives_authorities_without_address_queries(self):
+        """Test that seeding takes own-home postcodes from the addresses it built, not a query per premises."""
+        with CaptureQueriesContext(connection) as queries:
+            call_command('seed_applications', count=40, seed=7, stdout=StringIO())
+        self.assertFalse([q for q in queries if '"applications_addressentry"."is_current"' in q['sql']])
+        home = dict(AddressEntry.objects.filter(is_current=True).values_list('application_id', 'postcode'))
+        for premises in Premises.objects.filter(is_own_home=True):
+            expected = postcodes.authority_for_name(premises.local_authority) or postcodes.authority_for_postcode(home.get(premises.application_id))
+            self.assertEqual(premises.local_authority_code, expected)
+
+
+
+class ApplicationCacheTests(TestCase):
+    def setUp(self):
+        app_cache.get_cache().clear()
+        self.app = Application.objects.create()
+        PersonalDetails.objects.create(application=self.app, first_name='Ann', last_name='Lee', ni_number='QQ123456C')
+        HouseholdMember.objects.create(application=self.app, first_name='Tom', dob=datetime.date(2015, 1, 1))
+
+    def dashboard_entry(self):
+        apps = json.loads(self.client.get(reverse('dashboard')).context['apps_json'])
+        return next(a for a in apps if a['id'] == str(self.app.pk))
+
+    def test_repeat_reads_come_from_cache_until_a_section_changes(self):
+        """Test that unchanged applications skip the section queries and section saves invalidate them."""
+        with CaptureQueriesContext(connection) as cold:
+            self.assertEqual(self.dashboard_entry()['personal']['ni_number'], 'QQ123456C')
+        with CaptureQueriesContext(connection) as warm:
+            self.dashboard_entry()
+        self.assertLess(len(warm), len(cold))
+        # NI numbers stay encrypted at rest in the cache too
+        cached = app_cache.get_cache().get(app_cache.cache_key(app_cache.DASHBOARD, Application.objects.get(pk=self.app.pk)))
+        self.assertTrue(cached['personal']['ni_number'].startswith('enc1$'))
+
+        pd = PersonalDetails.objects.get(application=self.app)
+        pd.first_name = 'Anne'
+        pd.save()
+        self.assertEqual(self.dashboard_entry()['personal']['first_name'], 'Anne')
+        Reference.objects.create(application=self.app, first_name='Ref', last_name='One')
+        self.assertEqual(len(self.dashboard_entry()['references']), 1)
+
+    def test_bulk_writers_bump_and_warm_command_fills(self):
+        """Test that the set-based reclassification invalidates entries and the warm command rebuilds them."""
+        self.assertFalse(self.dashboard_entry()['household_members'][0]['is_adult'])
+        call_command('reclassify_household', '--date', '2031-06-01', stdout=StringIO())
+        self.assertTrue(self.dashboard_entry()['household_members'][0]['is_adult'])
+
+        app_cache.get_cache().clear()
+        out = StringIO()
+        call_command('warm_application_cache', stdout=out)
+        self.assertIn('(1 cache entries built)', out.getvalue())
+        out = StringIO()
+        call_command('warm_application_cache', stdout=out)
+        self.assertIn('(0 cache entries built)', out.getvalue())
+
+
+    def test_register_bumps_inside_the_save_transaction(self):
+        """Test that a draft save bumps the cache version once, before its transaction ends."""
+        session = self.client.session
+        session['application_id'] = str(self.app.pk)
+        session.save()
+        in_transaction = []
+        real_bump = app_cache.bump
+        with mock.patch('applications.app_cache.bump', side_effect=lambda ids: in_transaction.append(bool(connection.savepoint_ids)) or real_bump(ids)):
+            self.client.post(reverse('register'), {'action': 'save_and_exit', 'personal-first_name': 'Anne', 'personal-last_name': 'Lee'})
+        self.assertEqual(in_transaction, [True])
+        self.assertEqual(self.dashboard_entry()['personal']['first_name'], 'Anne')
+
+class RegisterFragmentTests(TestCase):
+    def setUp(self):
+        caches['template_fragments'].clear()
+
+    def test_unbound_sections_cached_until_application_changes(self):
+        """Test that resume renders come from the fragment cache and section saves invalidate them."""
+        app = Application.objects.create()
+        PersonalDetails.objects.create(application=app, first_name='Ann', last_name='Lee')
+        url = reverse('register') + f'?app_id={app.pk}'
+        with CaptureQueriesContext(connection) as cold:
+            self.assertContains(self.client.get(url), 'value="Ann"')
+        with CaptureQueriesContext(connection) as warm:
+            response = self.client.get(url)
+        self.assertContains(response, 'value="Ann"')
+        self.assertLess(len(warm), len(cold))  # formset rows aren't read to render them
+
+        pd = PersonalDetails.objects.get(application=app)
+        pd.first_name = 'Anne'
+        pd.save()
+        self.assertContains(self.client.get(url), 'value="Anne"')
+
+    def test_single_section_and_bound_forms(self):
+        """Test ?section= partial rendering and that a failed submit echoes the POST, not a cached copy."""
+        response = self.client.get(reverse('register'), {'section': 'premises'})
+        self.assertContains(response, 'id="section-2"')
+        self.assertNotContains(response, 'id="section-0"')
+        self.assertNotContains(response, '<form')
+
+        self.client.get(reverse('register'))  # caches the blank sections
+        response = self.client.post(reverse('register'), {'personal-first_name': 'Posted', 'personal-email': 'bad'})
+        self.assertContains(response, 'value="Posted"')
+
+
+class PartialErrorResponseTests(TestCase):
+    def invalid_submit(self, **headers):
+        data = submission_data()
+        data['personal-email'] = 'not-an-email'
+        data['address-0-move_in_date'] = 'not-a-date'
+        with self.assertLogs('applications.views', 'INFO'):
+            return self.client.post(reverse('register'), data, **headers)
+
+    def test_json_mode_returns_only_failing_sections(self):
+        """Test that Accept: application/json gets field errors and just the errored sections' HTML."""
+        response = self.invalid_submit(HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertEqual(list(body['errors']), ['personal', 'addresses'])
+        self.assertEqual(list(body['errors']['personal']), ['personal-email'])
+        self.assertEqual([(s['key'], s['id']) for s in body['sections']], [('personal', 'section-0'), ('addresses', 'section-1')])
+        self.assertIn('value="not-an-email"', body['sections'][0]['html'])
+
+    def test_fragment_header_and_full_page(self):
+        """Test that X-Fragment gets bare section HTML and a plain browser POST still gets the page."""
+        response = self.invalid_submit(HTTP_X_FRAGMENT='1')
+        self.assertEqual(response.status_code, 400)
+        self.assertContains(response, 'id="section-0"', status_code=400)
+        self.assertNotContains(response, 'id="section-2"', status_code=400)
+
+        response = self.invalid_submit(HTTP_ACCEPT='text/html,application/xhtml+xml,*/*;q=0.8')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<form id="applicationForm"')
+
+
+class FormSchemaTests(TestCase):
+    def test_schema_matches_server_validation(self):
+        """Test that the schema carries the model's NI pattern and the forms' declared cross-field rules."""
+        schema = json.loads(self.client.get(reverse('form_schema')).content)
+        ni = schema['forms']['personal']['fields']['ni_number']
+        self.assertEqual((ni['normalize'], ni['patterns'][0]['pattern']), ('identifier', r'^[A-Z]{2}[0-9]{6}[A-D]{1}$'))
+        self.assertEqual(schema['forms']['personal']['fields']['military_base_abroad']['section'], 'addresses')
+        self.assertEqual(schema['forms']['suitability']['rules'], SuitabilityForm.cross_field_rules)
+        self.assertFalse(schema['forms']['training']['fields']['first_aid_completed']['required'])
+        self.assertIn('postcode', schema['formsets']['address']['fields'])
+
+        form = ChildcareServiceForm({'service-number_of_assistants': '0'}, prefix='service')
+        self.assertEqual(form.errors['__all__'], [schema['forms']['service']['rules'][0]['message']])
+
+    def test_cache_headers(self):
+        """Test year-long caching on the versioned URL, revalidation on the bare one."""
+        url = reverse('register')
+        schema_url = self.client.get(url).context['form_schema_url']
+        response = self.client.get(schema_url)
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=300', self.client.get(reverse('form_schema'))['Cache-Control'])
+        response = self.client.get(reverse('form_schema'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class FormsetDeltaTests(TestCase):
+    def setUp(self):
+        self.app = Application.objects.create()
+        self.kept = AddressEntry.objects.create(application=self.app, line1='1 High St', town='Leeds', postcode='LS1 1AA', move_in_date=datetime.date(2020, 1, 1))
+        self.gone = AddressEntry.objects.create(application=self.app, line1='2 Low St', town='Leeds', postcode='LS2 2BB', move_in_date=datetime.date(2015, 1, 1))
+        session = self.client.session
+        session['application_id'] = str(self.app.pk)
+        session.save()
+
+    def save_delta(self, delta):
+        data = {'action': 'save_and_exit', 'address-delta': json.dumps(delta)}
+        for prefix in ['employment', 'household', 'reference']:
+            data[f'{prefix}-delta'] = '{}'
+        return self.client.post(reverse('register'), data, HTTP_ACCEPT='application/json')
+
+    def test_delta_is_applied_in_bulk(self):
+        """Test that added, changed and deleted rows take one statement each and keep history in step."""
+        delta = {
+            'added': [{'key': 'n1', 'line1': '3 New Rd', 'town': 'York', 'postcode': 'yo1 7hh', 'move_in_date': '2024-02-01'}],
+            'changed': [{'id': self.kept.pk, 'town': 'Leeds City'}],
+            'deleted': [self.gone.pk],
+        }
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = self.save_delta(delta)
+        writes = [q['sql'].split(' ')[0] for q in queries if '"applications_addressentry"' in q['sql'].split(' WHERE')[0]]
+        self.assertEqual(sorted(w for w in writes if w != 'SELECT'), ['DELETE', 'INSERT', 'UPDATE'])
+
+        new = AddressEntry.objects.get(line1='3 New Rd')
+        self.assertEqual(response.json()['rows']['address'], {'n1': new.pk})
+        self.assertEqual(new.postcode, 'YO1 7HH')
+        self.assertEqual(AddressEntry.objects.get(pk=self.kept.pk).town, 'Leeds City')
+        self.assertFalse(AddressEntry.objects.filter(pk=self.gone.pk).exists())
+        changes = SectionChange.objects.filter(application=self.app, section='address_history', object_id=self.kept.pk, action='update')
+        self.assertEqual(changes.get().changes, {'town': 'Leeds City'})
+
+    def test_invalid_delta_is_reported_on_save(self):
+        """Test that a rejected delta answers 400 with its errors instead of being skipped."""
+        other = AddressEntry.objects.create(application=Application.objects.create(), line1='Elsewhere')
+        response = self.save_delta({
+            'added': [{'key': 'n1', 'line1': '3 New Rd', 'move_in_date': 'not a date'}],
+            'changed': [{'id': other.pk, 'town': 'X'}],
+        })
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']['addresses']
+        self.assertEqual(errors['address'], [f'Unknown rows: {other.pk}'])
+        self.assertIn('address-n1-move_in_date', errors)
+        self.assertFalse(AddressEntry.objects.filter(line1='3 New Rd').exists())
+
+        self.assertEqual(self.client.post(reverse('register'), {'action': 'save_and_exit', 'address-delta': 'not json'}, HTTP_ACCEPT='application/json').status_code, 400)
+
+    def test_invalid_delta_is_rejected_without_json(self):
+        """Test that a full-page save re-renders a rejected delta's errors instead of reporting success."""
+        response = self.client.post(reverse('register'), {
+            'action': 'save_and_exit',
+            'personal-first_name': 'Anne',
+            'address-delta': json.dumps({'added': [{'key': 'n1', 'line1': '3 New Rd', 'move_in_date': 'not a date'}]}),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Please correct the errors in the form.')
+        self.assertFalse(AddressEntry.objects.filter(line1='3 New Rd').exists())
+        self.assertFalse(PersonalDetails.objects.filter(application=self.app).exists())
+
+    def test_blank_added_rows_are_skipped(self):
+        """Test that an added row with every field empty is not created, like an empty extra form."""
+        response = self.save_delta({'added': [{'key': 'n1'}, {'key': 'n2', 'line1': '3 New Rd'}]})
+        new = AddressEntry.objects.get(line1='3 New Rd')
+        self.assertEqual(response.json()['rows']['address'], {'n2': new.pk})
+        self.assertEqual(AddressEntry.objects.filter(application=self.app).count(), 3)
+
+    def test_rejects_unknown_rows_and_undeletable_rows(self):
+        """Test that another application's rows and reference deletions fail validation."""
+        other = AddressEntry.objects.create(application=Application.objects.create(), line1='Elsewhere')
+        data = {'address-delta': json.dumps({'changed': [{'id': other.pk, 'town': 'X'}]})}
+        delta = FormsetDelta(AddressEntryFormSet, data, 'address', instance=self.app)
+        self.assertFalse(delta.is_valid())
+        self.assertEqual(delta.non_form_errors(), [f'Unknown rows: {other.pk}'])
+
+        data = {'reference-delta': json.dumps({'deleted': []}), 'address-delta': 'not json'}
+        self.assertTrue(FormsetDelta(ReferenceFormSet, data, 'reference', instance=self.app).is_valid())
+        self.assertFalse(FormsetDelta(AddressEntryFormSet, data, 'address', instance=self.app).is_valid())
+        reference = Reference.objects.create(application=self.app, first_name='Ref')
+        data = {'reference-delta': json.dumps({'deleted': [reference.pk]})}
+        self.assertIn('Rows cannot be deleted here.', FormsetDelta(ReferenceFormSet, data, 'reference', instance=self.app).non_form_errors())
+
+
+@override_settings(API_TOKENS=['secret-token'])
+class ApiTests(TestCase):
+    def setUp(self):
+        self.apps = [Application.objects.create(status=status) for status in ['DRAFT', 'SUBMITTED', 'SUBMITTED']]
+        PersonalDetails.objects.create(application=self.apps[1], first_name='Ann', last_name='Lee', ni_number='AB123456C')
+        AddressEntry.objects.create(application=self.apps[1], line1='1 High St', postcode='LS1 1AA')
+        self.url = reverse('api_application_list')
+
+    def get(self, url, **params):
+        return self.client.get(url, params, HTTP_AUTHORIZATION='Bearer secret-token')
+
+    def test_sparse_fields_and_includes(self):
+        """Test that only requested columns and sections are read, one query per included section."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(self.url, fields='status', include='personal_details,address_history',
+                                **{'fields[personal_details]': 'first_name,ni_number'})
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('updated_at', queries[0]['sql'])
+        second = response.json()['data'][1]
+        self.assertEqual(second['personal_details'], {'id': second['personal_details']['id'], 'first_name': 'Ann', 'ni_number': 'AB123456C'})
+        self.assertEqual(second['address_history'][0]['postcode'], 'LS1 1AA')
+        self.assertEqual(set(second), {'id', 'status', 'personal_details', 'address_history'})
+
+        detail = self.get(reverse('api_application_detail', args=[self.apps[0].pk]), fields='status').json()
+        self.assertEqual(detail['data'], {'id': str(self.apps[0].pk), 'status': 'DRAFT'})
+
+    def test_cursor_pagination_and_filters(self):
+        """Test that following `next` walks every matching application once, in created order."""
+        seen, url, params = [], self.url, {'limit': 1, 'status': 'SUBMITTED', 'fields': 'id'}
+        while url:
+            body = self.get(url, **params).json()
+            seen += [row['id'] for row in body['data']]
+            url, params = body['next'], {}
+        submitted = Application.objects.filter(status='SUBMITTED').order_by('created_at', 'id')
+        self.assertEqual(seen, [str(pk) for pk in submitted.values_list('pk', flat=True)])
+
+        tomorrow = (timezone.now() + datetime.timedelta(days=1)).date().isoformat()
+        self.assertEqual(self.get(self.url, created_after=tomorrow).json()['data'], [])
+
+    def test_auth_and_bad_parameters(self):
+        """Test that anonymous callers get a 401 and malformed queries a 400."""
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        for params in [{'fields': 'nope'}, {'include': 'nope'}, {'fields[premises]': 'id'}, {'cursor': 'abc'}, {'limit': '0'}, {'status': 'X'}]:
+            self.assertEqual(self.get(self.url, **params).status_code, 400, params)
+
+        staff = User.objects.create_user('reader', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        staff.user_permissions.add(Permission.objects.get(codename='view_application'))
+        self.client.force_login(User.objects.get(pk=staff.pk))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
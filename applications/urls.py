@@ -1,7 +1,10 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.register_view, name='register'),
     path('dashboard/', views.dashboard_view, name='dashboard'),
+    path('form-schema.json', views.form_schema_view, name='form_schema'),
+    path(f'api/{api.API_VERSION}/applications/', api.application_list, name='api_application_list'),
+    path(f'api/{api.API_VERSION}/applications/<uuid:pk>/', api.application_detail, name='api_application_detail'),
 ]
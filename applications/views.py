@@ -1,15 +1,91 @@
 import json
+import logging
+
 from django import forms
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import etag, require_GET
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.contrib import messages
-from .models import Application
+from django.db import transaction
+from . import app_cache, form_schema, history, snapshots
+from .checks import CHECK_TYPES, deferred_recompute, flush_recompute, outstanding
+from .coverage import COVERAGE_KINDS, incomplete_coverage
+from .db import retry_on_locked
+from .duplicates import flag_duplicate
+from .formset_delta import FormsetDelta, delta_field
+from .paginators import EstimatedCountPaginator
+from .fragments import REGISTER_SECTIONS, fragment_vary, render_sections, section_errors
+from .routers import replica_reads
+from .serializers import dashboard_sections, open_dashboard_sections
+from .models import Application, StatusCounter
 from .forms import (
     ApplicationForm, PersonalDetailsForm, AddressEntryFormSet, PremisesForm,
     ChildcareServiceForm, TrainingForm, EmploymentEntryFormSet, HouseholdMemberFormSet,
     SuitabilityForm, DeclarationForm, ReferenceFormSet
 )
 
+logger = logging.getLogger(__name__)
+
+# Applications serialized per dashboard page
+DASHBOARD_PAGE_SIZE = 100
+
+
+def partial_response_mode(request):
+    """
+    How a failed submit should answer: 'json' when the client prefers
+    application/json, 'html' when it sends an X-Fragment header, otherwise
+    None for the full page.
+    """
+    if request.get_preferred_type(['text/html', 'application/json']) == 'application/json':
+        return 'json'
+    if request.headers.get('X-Fragment'):
+        return 'html'
+    return None
+
+
+def section_errors_response(mode, context, errors):
+    """Only the failing sections, re-rendered from the POST, with a 400 status."""
+    rendered = render_sections(context, list(errors))
+    if mode == 'html':
+        return HttpResponse(''.join(html for _, html in rendered), status=400)
+    return JsonResponse({
+        'errors': errors,
+        'sections': [
+            {'key': key, 'id': f'section-{REGISTER_SECTIONS.index(key)}', 'html': html}
+            for key, html in rendered
+        ],
+    }, status=400)
+
+
+def form_schema_url():
+    return reverse('form_schema') + '?v=' + form_schema.schema_json()[1]
+
+
+@require_GET
+@etag(lambda request: form_schema.schema_json()[1])
+def form_schema_view(request):
+    """
+    Validation rules of the register forms as JSON, for checking input in
+    the browser before a submit that is bound to fail. The versioned URL
+    (form_schema_url(), ?v=<hash>) never changes content, so it's cached
+    for a year; the bare URL revalidates cheaply through its ETag.
+    """
+    content, version = form_schema.schema_json()
+    response = HttpResponse(content, content_type='application/json')
+    if request.GET.get('v') == version:
+        patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=5 * 60)
+    return response
+
+
+# Section saves recompute each application's checks once, after the view body.
+# The draft-save and submit writes are each one transaction, so a request that
+# hits "database is locked" is safely rerun from the top.
+@deferred_recompute()
+@retry_on_locked
 def register_view(request):
     """
     Handles the multi-step registration form.
@@ -23,8 +99,11 @@ def register_view(request):
         if application:
             request.session['application_id'] = str(application.id)
 
+    errors = None
     if request.method == 'POST':
         action = request.POST.get('action', 'submit')
+        # {formset prefix: {client key: id}} for rows added through a delta
+        row_ids = {}
         is_draft = (action == 'save_and_exit')
         
         # Initialize all forms
@@ -35,25 +114,10 @@ def register_view(request):
         suitability_form = SuitabilityForm(request.POST, prefix='suitability', instance=application.suitability if application and hasattr(application, 'suitability') else None, is_draft=is_draft)
         declaration_form = DeclarationForm(request.POST, prefix='declaration', instance=application.declaration if application and hasattr(application, 'declaration') else None, is_draft=is_draft)
         
-        # FormSets with dynamic extra forms
+        # Formsets posted as a delta (see applications.formset_delta) skip the full-row protocol
         def get_formset(factory, prefix, application):
-            already_exists = False
-            if application:
-                # Check if any related objects exist for this application
-                # This is a bit generic but works if we know the related name or just check the count
-                # Inline formsets have a 'queryset' attribute we can check
-                qs = factory.model.objects.filter(application=application)
-                if qs.exists():
-                    already_exists = True
-            
-            # Create a temporary factory with 0 extra if objects already exist
-            # but preserve weights and fields from the original factory
-            if already_exists:
-                # We can override the extra attribute on the class or just re-create it
-                # A simpler trick: set the extra attribute on the instance after creation
-                fs = factory(request.POST, prefix=prefix, instance=application)
-                fs.extra = 0
-                return fs
+            if delta_field(prefix) in request.POST:
+                return FormsetDelta(factory, request.POST, prefix, instance=application)
             return factory(request.POST, prefix=prefix, instance=application)
 
         address_formset = get_formset(AddressEntryFormSet, 'address', application)
@@ -61,74 +125,91 @@ def register_view(request):
         household_formset = get_formset(HouseholdMemberFormSet, 'household', application)
         reference_formset = get_formset(ReferenceFormSet, 'reference', application)
 
-        if action == 'save_and_exit':
+        # A delta holds only what changed, so a rejected one can't be skipped: the save
+        # falls through to the validation below and answers with the section errors
+        # (forms are still checked as drafts)
+        deltas = [fs for fs in [address_formset, employment_formset, household_formset, reference_formset] if isinstance(fs, FormsetDelta)]
+        deltas_valid = all(fs.is_valid() for fs in deltas)
+
+        if action == 'save_and_exit' and deltas_valid:
             # Partial save - don't enforce full validation
-            if not application:
-                application = Application.objects.create(status='DRAFT')
-                request.session['application_id'] = str(application.id)
-                # Update formset instances
-                address_formset.instance = application
-                employment_formset.instance = application
-                household_formset.instance = application
-                reference_formset.instance = application
-            
-            # Save whatever we have - but only if there's actual data
-            def save_partial(form, app):
-                if not form.is_valid():
-                    return
-                
-                # Check if the form has any meaningful data (non-empty, non-default values)
-                has_data = False
-                for field_name, field_value in form.cleaned_data.items():
-                    # Skip the application field itself
-                    if field_name == 'application':
-                        continue
-                    
-                    # Check if value is meaningful (not None, not empty string, not False for non-boolean fields)
-                    if field_value is not None and field_value != '' and field_value != []:
-                        # For boolean fields, we need to check if it's explicitly set
-                        # For other fields, any non-empty value counts
-                        field = form.fields.get(field_name)
-                        if isinstance(field, forms.BooleanField):
-                            # Only count True values as meaningful for boolean fields
-                            if field_value is True:
+            # Atomic so a retried request (see retry_on_locked) starts from a clean slate;
+            # the section history, checks and cache version are written at the end of the same transaction
+            with transaction.atomic(), history.collect():
+                if not application:
+                    application = Application.objects.create(status='DRAFT')
+                    request.session['application_id'] = str(application.id)
+                    # Update formset instances
+                    address_formset.instance = application
+                    employment_formset.instance = application
+                    household_formset.instance = application
+                    reference_formset.instance = application
+
+                # Save whatever we have - but only if there's actual data
+                def save_partial(form, app):
+                    if not form.is_valid():
+                        return
+
+                    # Check if the form has any meaningful data (non-empty, non-default values)
+                    has_data = False
+                    for field_name, field_value in form.cleaned_data.items():
+                        # Skip the application field itself
+                        if field_name == 'application':
+                            continue
+
+                        # Check if value is meaningful (not None, not empty string, not False for non-boolean fields)
+                        if field_value is not None and field_value != '' and field_value != []:
+                            # For boolean fields, we need to check if it's explicitly set
+                            # For other fields, any non-empty value counts
+                            field = form.fields.get(field_name)
+                            if isinstance(field, forms.BooleanField):
+                                # Only count True values as meaningful for boolean fields
+                                if field_value is True:
+                                    has_data = True
+                                    break
+                            else:
                                 has_data = True
                                 break
-                        else:
-                            has_data = True
-                            break
-                
-                # Only save if there's actual data
-                if has_data:
-                    obj = form.save(commit=False)
-                    obj.application = app
-                    obj.save()
-
-            # Save main forms
-            for f in [personal_form, premises_form, service_form, training_form, suitability_form, declaration_form]:
-                save_partial(f, application)
-            
-            # Save formsets
-            for fs in [address_formset, employment_formset, household_formset, reference_formset]:
-                if fs.is_valid():
-                    fs.save()
-            
-            # Update application-level flags
-            try:
-                current_section = int(request.POST.get('current_section', 0))
-                application.last_section_completed = max(application.last_section_completed, current_section)
-                
-                # New Household flags
-                if 'application-has_adults_in_home' in request.POST:
-                    application.has_adults_in_home = request.POST.get('application-has_adults_in_home') == 'True'
-                if 'application-has_children_in_home' in request.POST:
-                    application.has_children_in_home = request.POST.get('application-has_children_in_home') == 'True'
-                
-                application.save()
-            except Exception as e:
-                print(f"Error saving application flags: {e}")
-                pass
 
+                    # Only save if there's actual data
+                    if has_data:
+                        obj = form.save(commit=False)
+                        obj.application = app
+                        obj.save()
+                        return obj
+
+                # Save main forms
+                personal = save_partial(personal_form, application)
+                for f in [premises_form, service_form, training_form, suitability_form, declaration_form]:
+                    save_partial(f, application)
+                if personal:
+                    flag_duplicate(personal)
+
+                # Save formsets
+                for fs in [address_formset, employment_formset, household_formset, reference_formset]:
+                    if fs.is_valid():
+                        saved = fs.save()
+                        if isinstance(fs, FormsetDelta):
+                            row_ids[fs.prefix] = saved
+
+                # Update application-level flags
+                try:
+                    current_section = int(request.POST.get('current_section', 0))
+                    application.last_section_completed = max(application.last_section_completed, current_section)
+
+                    # New Household flags
+                    if 'application-has_adults_in_home' in request.POST:
+                        application.has_adults_in_home = request.POST.get('application-has_adults_in_home') == 'True'
+                    if 'application-has_children_in_home' in request.POST:
+                        application.has_children_in_home = request.POST.get('application-has_children_in_home') == 'True'
+
+                    application.save()
+                except ValueError:
+                    logger.warning('Error saving application flags for %s', application.pk, exc_info=True)
+                flush_recompute()
+
+            if partial_response_mode(request) == 'json':
+                return JsonResponse({'application': str(application.pk), 'rows': row_ids})
             messages.success(request, 'Progress saved successfully. You can complete your application later.')
             return redirect('dashboard')
 
@@ -142,84 +223,79 @@ def register_view(request):
             household_formset.is_valid() and reference_formset.is_valid())
         
         if forms_valid and formsets_valid:
-            if not application:
-                application = Application.objects.create(status='SUBMITTED')
-                # Update formset instances if the application was just created
-                address_formset.instance = application
-                employment_formset.instance = application
-                household_formset.instance = application
-                reference_formset.instance = application
-            else:
-                application.status = 'SUBMITTED'
-                
+            # Sections, their history and the submission snapshot commit (or roll back) together
+            with transaction.atomic(), history.collect():
+                if not application:
+                    application = Application.objects.create(status='DRAFT')
+                    # Update formset instances if the application was just created
+                    address_formset.instance = application
+                    employment_formset.instance = application
+                    household_formset.instance = application
+                    reference_formset.instance = application
+
                 # New Household flags
                 if 'application-has_adults_in_home' in request.POST:
                     application.has_adults_in_home = request.POST.get('application-has_adults_in_home') == 'True'
                 if 'application-has_children_in_home' in request.POST:
                     application.has_children_in_home = request.POST.get('application-has_children_in_home') == 'True'
-                
-                application.save()
-            
-            # Save everything
-            personal = personal_form.save(commit=False)
-            personal.application = application
-            personal.save()
-            
-            premises = premises_form.save(commit=False)
-            premises.application = application
-            premises.save()
-            
-            service = service_form.save(commit=False)
-            service.application = application
-            service.save()
-            
-            training = training_form.save(commit=False)
-            training.application = application
-            training.save()
-            
-            suitability = suitability_form.save(commit=False)
-            suitability.application = application
-            suitability.save()
-            
-            declaration = declaration_form.save(commit=False)
-            declaration.application = application
-            declaration.save()
-            
-            address_formset.save()
-            employment_formset.save()
-            household_formset.save()
-            reference_formset.save()
+
+                # Re-submitting an application already under review keeps its status
+                if application.can_transition_to('SUBMITTED'):
+                    application.transition_to('SUBMITTED', note='Submitted by applicant')
+                else:
+                    application.save()
+
+                # Save everything
+                personal = personal_form.save(commit=False)
+                personal.application = application
+                personal.save()
+                flag_duplicate(personal)
+
+                premises = premises_form.save(commit=False)
+                premises.application = application
+                premises.save()
+
+                service = service_form.save(commit=False)
+                service.application = application
+                service.save()
+
+                training = training_form.save(commit=False)
+                training.application = application
+                training.save()
+
+                suitability = suitability_form.save(commit=False)
+                suitability.application = application
+                suitability.save()
+
+                declaration = declaration_form.save(commit=False)
+                declaration.application = application
+                declaration.save()
+
+                for fs in [address_formset, employment_formset, household_formset, reference_formset]:
+                    saved = fs.save()
+                    if isinstance(fs, FormsetDelta):
+                        row_ids[fs.prefix] = saved
+
+                # Frozen copy of what was declared; readers of submitted applications use it
+                snapshots.capture(application)
+                flush_recompute()
             
             # Clear session
             if 'application_id' in request.session:
                 del request.session['application_id']
             
+            if partial_response_mode(request) == 'json':
+                return JsonResponse({'application': str(application.pk), 'rows': row_ids})
             messages.success(request, 'Application submitted successfully!')
             return redirect('dashboard') # Redirect to dashboard or success page
         else:
-            # Collect and log all errors for debugging
-            all_errors = []
-            for form_name, form_obj in [
-                ('personal', personal_form), ('premises', premises_form),
-                ('service', service_form), ('training', training_form),
-                ('suitability', suitability_form), ('declaration', declaration_form),
-            ]:
-                if not form_obj.is_valid():
-                    all_errors.append(f"{form_name}: {form_obj.errors}")
-            for fs_name, fs_obj in [
-                ('address', address_formset), ('employment', employment_formset),
-                ('household', household_formset), ('reference', reference_formset),
-            ]:
-                if not fs_obj.is_valid():
-                    all_errors.append(f"{fs_name}: {fs_obj.errors}")
-            
-            print("=" * 60)
-            print("FORM VALIDATION ERRORS:")
-            for err in all_errors:
-                print(f"  {err}")
-            print("=" * 60)
-            
-            messages.error(request, 'Please correct the errors in the form.')
+            errors = section_errors(
+                [personal_form, premises_form, service_form, training_form, suitability_form, declaration_form],
+                [address_formset, employment_formset, household_formset, reference_formset],
+            )
+            logger.info('Register submit failed validation: %s', errors)
+            if not partial_response_mode(request):
+                messages.error(request, 'Please correct the errors in the form.')
     
     else:
         # Initialize forms from session if exist
@@ -230,23 +306,11 @@ def register_view(request):
         suitability_form = SuitabilityForm(prefix='suitability', instance=application.suitability if application and hasattr(application, 'suitability') else None)
         declaration_form = DeclarationForm(prefix='declaration', instance=application.declaration if application and hasattr(application, 'declaration') else None)
         
-        # FormSets for GET requests (Resume)
-        def get_formset_get(factory, prefix, application):
-            extra = factory.extra # default from factory
-            if application:
-                qs = factory.model.objects.filter(application=application)
-                if qs.exists():
-                    extra = 0
-            
-            # Create a localized version of the factory or just override extra on the instance
-            fs = factory(prefix=prefix, instance=application)
-            fs.extra = extra
-            return fs
-
-        address_formset = get_formset_get(AddressEntryFormSet, 'address', application)
-        employment_formset = get_formset_get(EmploymentEntryFormSet, 'employment', application)
-        household_formset = get_formset_get(HouseholdMemberFormSet, 'household', application)
-        reference_formset = get_formset_get(ReferenceFormSet, 'reference', application)
+        # Blank extra rows only until rows exist (ResumableInlineFormSet)
+        address_formset = AddressEntryFormSet(prefix='address', instance=application)
+        employment_formset = EmploymentEntryFormSet(prefix='employment', instance=application)
+        household_formset = HouseholdMemberFormSet(prefix='household', instance=application)
+        reference_formset = ReferenceFormSet(prefix='reference', instance=application)
 
     context = {
         'application': application,
@@ -260,42 +324,78 @@ def register_view(request):
         'employment_formset': employment_formset,
         'household_formset': household_formset,
         'reference_formset': reference_formset,
+        'form_schema_url': form_schema_url(),
     }
+    mode = errors and partial_response_mode(request)
+    if mode:
+        return section_errors_response(mode, context, errors)
+    # Unbound sections are cached per application state; bound ones echo the POST
+    vary_on = None if request.method == 'POST' else fragment_vary(application)
+    # ?section=<key> renders just that section, for refreshing one part of the page
+    section = request.GET.get('section')
+    if request.method == 'GET' and section in REGISTER_SECTIONS:
+        return HttpResponse(render_sections(context, [section], vary_on)[0][1])
+    context['sections'] = render_sections(context, vary_on=vary_on)
     return render(request, 'applications/register.html', context)
 
+@replica_reads
 def dashboard_view(request):
     """
     Rich dashboard matching cma-portal-v2.html design.
     Passes application data as JSON for JavaScript-driven detail panel.
     """
-    applications = Application.objects.select_related(
-        'personal_details', 'premises', 'training', 'suitability', 'declaration'
-    ).prefetch_related(
-        'references', 'household_members', 'employment_history', 'address_history'
-    ).all().order_by('-created_at')
+    # Sections are loaded per cache miss by serializers.dashboard_sections()
+    applications = Application.objects.prefetch_related('checks').order_by('-created_at', '-id')
+
+    # ?checks=outstanding[&check_type=dbs] narrows the list in SQL using the stored Check rows
+    check_type = request.GET.get('check_type')
+    if request.GET.get('checks') == 'outstanding':
+        applications = outstanding(applications, check_type if check_type in CHECK_TYPES else None)
+    # ?coverage=incomplete[&kind=address] uses the stored HistoryCoverage flags
+    kind = request.GET.get('kind')
+    if request.GET.get('coverage') == 'incomplete':
+        applications = incomplete_coverage(applications, kind if kind in COVERAGE_KINDS else None)
+    # ?authority=<ONS code> groups by the derived premises authority (indexed)
+    if request.GET.get('authority'):
+        applications = applications.filter(premises__local_authority_code=request.GET['authority'])
     
-    # Stats
-    total_apps = applications.count()
-    submitted_apps = applications.filter(status='SUBMITTED').count()
-    draft_apps = applications.filter(status='DRAFT').count()
-    registered_apps = applications.filter(status='REGISTERED').count()
+    # Stats (maintained per status by Application.save() / bulk_transition)
+    status_counts = StatusCounter.as_dict()
+    total_apps = sum(status_counts.values())
+    submitted_apps = status_counts['SUBMITTED']
+    draft_apps = status_counts['DRAFT']
+    registered_apps = status_counts['REGISTERED']
     
     # Logic for stats cards
     require_action_apps = submitted_apps  # For now, all submitted apps require action
-    in_progress_apps = applications.filter(status__in=['CHECKS_IN_PROGRESS', 'UNDER_REVIEW']).count()
+    in_progress_apps = status_counts['CHECKS_IN_PROGRESS'] + status_counts['UNDER_REVIEW']
     completed_apps = registered_apps # YTD logic could be added here
     
     # Count all connected persons across all applications
     from .models import HouseholdMember
     total_connected_persons = HouseholdMember.objects.filter(application__in=applications).count()
     
-    # Serialize applications to JSON for the JS detail panel
+    # ?page=N: only one page is read, cached and serialized (app_created_idx
+    # serves the order), and the page count never needs a full COUNT(*)
+    paginator = EstimatedCountPaginator(applications, DASHBOARD_PAGE_SIZE)
+    if not applications.query.where:
+        # Unfiltered, StatusCounter already holds the exact total
+        paginator.count = total_apps
+    page = paginator.get_page(request.GET.get('page'))
+    query = request.GET.copy()
+    query.pop('page', None)
+
+    # Serialize the page to JSON for the JS detail panel. The section data
+    # of unchanged applications comes from applications.app_cache in one
+    # get_many(); the application row and its checks are always read live.
+    applications = list(page.object_list)
+    sections = app_cache.get_many(applications, app_cache.DASHBOARD, dashboard_sections)
     apps_json = []
     from django.utils import timezone
     now = timezone.now()
 
-    for app in applications:
-        days_in_stage = (now.date() - app.updated_at.date()).days if app.updated_at else 0
+    for app, app_sections in zip(applications, sections):
+        days_in_stage = (now.date() - app.status_changed_at.date()).days
         
         app_data = {
             'id': str(app.id), # Ensure string for JS
@@ -307,162 +407,16 @@ def dashboard_view(request):
             'daysInStage': days_in_stage,
             'risk': 'high' if days_in_stage > 14 else 'low', # Mock risk logic
         }
+        app_data.update(open_dashboard_sections(app_sections))
         
-        # Personal Details
-        try:
-            pd = app.personal_details
-            app_data['personal'] = {
-                'title': pd.title,
-                'first_name': pd.first_name,
-                'middle_names': pd.middle_names or '',
-                'last_name': pd.last_name,
-                'dob': pd.dob.strftime('%Y-%m-%d') if pd.dob else '',
-                'gender': pd.gender,
-                'email': pd.email,
-                'phone': pd.phone,
-                'ni_number': pd.ni_number,
-                'right_to_work_status': pd.right_to_work_status,
-                'known_by_other_names': pd.known_by_other_names,
-                'lived_outside_uk': pd.lived_outside_uk,
-                'military_base_abroad': pd.military_base_abroad,
-            }
-        except Exception:
-            app_data['personal'] = None
-        
-        # Premises
-        try:
-            pr = app.premises
-            # Check if premises has any meaningful data (not just defaults)
-            has_meaningful_data = (
-                pr.local_authority or 
-                pr.premises_type or 
-                pr.has_outdoor_space or 
-                pr.has_pets or 
-                pr.pets_details
-            )
-            
-            if has_meaningful_data:
-                app_data['premises'] = {
-                    'local_authority': pr.local_authority,
-                    'premises_type': pr.premises_type,
-                    'is_own_home': pr.is_own_home,
-                    'has_outdoor_space': pr.has_outdoor_space,
-                    'has_pets': pr.has_pets,
-                    'pets_details': pr.pets_details or '',
-                }
-                app_data['local_authority'] = pr.local_authority or '-'
-            else:
-                app_data['premises'] = None
-                app_data['local_authority'] = '-'
-        except Exception:
-            app_data['premises'] = None
-            app_data['local_authority'] = '-'
-        
-        # Training
-        try:
-            tr = app.training
-            app_data['training'] = {
-                'first_aid_completed': tr.first_aid_completed,
-                'first_aid_date': tr.first_aid_date.strftime('%Y-%m-%d') if tr.first_aid_date else '',
-                'first_aid_org': tr.first_aid_org or '',
-                'safeguarding_completed': tr.safeguarding_completed,
-                'safeguarding_date': tr.safeguarding_date.strftime('%Y-%m-%d') if tr.safeguarding_date else '',
-                'safeguarding_org': tr.safeguarding_org or '',
-                'eyfs_completed': tr.eyfs_completed,
-                'food_hygiene_completed': tr.food_hygiene_completed,
-            }
-        except Exception:
-            app_data['training'] = None
-        
-        # Suitability & Checks Construction
-        checks = {
-            'dbs': {'status': 'not-started', 'details': ''},
-            'la_check': {'status': 'not-started'},
-            'ofsted': {'status': 'not-started'},
-            'gp_health': {'status': 'not-started'},
-            'ref_1': {'status': 'not-started'},
-            'ref_2': {'status': 'not-started'},
-            'first_aid': {'status': 'not-started'},
-            'safeguarding': {'status': 'not-started'},
-        }
-
-        try:
-            su = app.suitability
-            app_data['suitability'] = {
-                'has_medical_condition': su.has_medical_condition,
-                'is_disqualified': su.is_disqualified,
-                'social_services_involved': su.social_services_involved,
-                'has_dbs': su.has_dbs,
-                'dbs_number': su.dbs_number or '',
-            }
-            if su.has_dbs:
-                checks['dbs'] = {'status': 'complete', 'details': su.dbs_number}
-            elif su.dbs_number:
-                 checks['dbs'] = {'status': 'pending'}
-        except Exception:
-            app_data['suitability'] = None
-        
-        # Update checks based on training
-        if app_data['training']:
-            if app_data['training']['first_aid_completed']: checks['first_aid']['status'] = 'complete'
-            if app_data['training']['safeguarding_completed']: checks['safeguarding']['status'] = 'complete'
-
-        # References
-        refs = []
-        ref_count = 0
-        for ref in app.references.all():
-            ref_count += 1
-            refs.append({
-                'full_name': f"{ref.first_name} {ref.last_name}",
-                'email': ref.email,
-                'phone': ref.phone,
-                'relationship': ref.relationship,
-                'years_known': ref.years_known,
-            })
-            if ref_count == 1: checks['ref_1']['status'] = 'pending' # Mock logic
-            if ref_count == 2: checks['ref_2']['status'] = 'pending'
-            
-        app_data['references'] = refs
-        app_data['checks'] = checks # Add checks to app_data
-        
-        # Household Members
-        members = []
-        for m in app.household_members.all():
-            members.append({
-                'id': str(m.id),
-                'first_name': m.first_name,
-                'last_name': m.last_name,
-                'dob': m.dob.strftime('%Y-%m-%d') if m.dob else '',
-                'relationship': m.relationship,
-                'is_adult': m.is_adult,
-                'checks': {} # Mock checks for persons
-            })
-        app_data['household_members'] = members
-        # Service Details (Registers)
-        try:
-            sd = app.service_details
-            registers = []
-            if sd.care_age_0_5: registers.append('Early Years')
-            if sd.care_age_5_8: registers.append('Compulsory Childcare')
-            if sd.care_age_8_plus: registers.append('Voluntary Childcare')
-            
-            # Only include register data if at least one age group is selected
-            app_data['register'] = registers if registers else []
-        except Exception:
-            app_data['register'] = []
-        
-        # Addresses
-        addresses = []
-        for addr in app.address_history.all():
-            addresses.append({
-                'line1': addr.line1,
-                'line2': addr.line2 or '',
-                'town': addr.town,
-                'postcode': addr.postcode,
-                'move_in_date': addr.move_in_date.strftime('%Y-%m-%d') if addr.move_in_date else '',
-                'is_current': addr.is_current,
-            })
-        app_data['addresses'] = addresses
+        # Checks are stored rows kept current by applications.checks.recompute_checks()
+        checks = {check_type: {'status': 'not-started'} for check_type in CHECK_TYPES}
+        checks['dbs']['details'] = ''
+        for check in app.checks.all():
+            checks[check.check_type] = {'status': check.status}
+            if check.check_type == 'dbs':
+                checks['dbs']['details'] = check.details
+        app_data['checks'] = checks
         
         apps_json.append(app_data)
     
@@ -477,5 +431,8 @@ def dashboard_view(request):
         'completed_apps': completed_apps,
         'total_connected_persons': total_connected_persons,
         'apps_json': json.dumps(apps_json, default=str),
+        'status_counts_json': json.dumps(status_counts),
+        'page_obj': page,
+        'page_query': query.urlencode(),
     }
     return render(request, 'applications/dashboard.html', context)
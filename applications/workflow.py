@@ -0,0 +1,52 @@
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Application, StatusCounter, StatusTransition
+
+# Rows per UPDATE/INSERT so large batches stay under backend parameter limits
+BATCH_SIZE = 1000
+
+
+def sources_for(to_status):
+    """Statuses from which Application.TRANSITIONS allows a move to `to_status`."""
+    return [status for status, targets in Application.TRANSITIONS.items() if to_status in targets]
+
+
+def bulk_transition(queryset, to_status, user=None, note=''):
+    """
+    Move every application in `queryset` that may legally move to `to_status`.
+
+    Uses set-based UPDATEs rather than Application.save() (which would also
+    re-run application-number allocation per row), bulk-inserts one
+    StatusTransition audit row per application and adjusts StatusCounter
+    once for the whole batch. Applications whose current status doesn't
+    allow the move (see Application.TRANSITIONS) are left alone.
+    Returns the number of applications moved.
+    """
+    valid = {code for code, _ in Application.STATUS_CHOICES}
+    if to_status not in valid:
+        raise ValueError(f'Unknown status {to_status!r}')
+    with transaction.atomic():
+        rows = list(
+            queryset.filter(status__in=sources_for(to_status)).select_for_update().order_by().values_list('pk', 'status')
+        )
+        now = timezone.now()
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start:start + BATCH_SIZE]
+            Application.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                status=to_status, status_changed_at=now, updated_at=now
+            )
+            StatusTransition.objects.bulk_create([
+                StatusTransition(application_id=pk, from_status=from_status, to_status=to_status,
+                                 changed_by=user, note=note)
+                for pk, from_status in batch
+            ])
+
+        deltas = Counter()
+        for _, from_status in rows:
+            deltas[from_status] -= 1
+        deltas[to_status] += len(rows)
+        StatusCounter.adjust(deltas)
+    return len(rows)
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the hot views and commands.
+
+Run with `python manage.py run_benchmarks`; see benchmarks/scenarios.py for
+what is measured and benchmarks/baseline.json for the committed baseline.
+"""
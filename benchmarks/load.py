@@ -0,0 +1,198 @@
+import http.cookiejar
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+from django.core.signals import got_request_exception
+from django.db import connections
+from django.test import Client
+
+from .scenarios import draft_data, submission_data
+
+LOCKED_MESSAGE = 'database is locked'
+
+
+_thread_state = threading.local()
+
+
+def _record_exception(sender, **kwargs):
+    # got_request_exception is global, but fires in the thread that failed
+    _thread_state.exception = sys.exc_info()[1]
+
+
+class InProcessSession:
+    """
+    Drives the WSGI app in-process through the Django test client.
+    The client's own exception capture is shared between threads, so
+    failures are tracked per thread instead and re-raised to the caller.
+    """
+
+    def __init__(self):
+        self.client = Client(raise_request_exception=False)
+        got_request_exception.connect(_record_exception, dispatch_uid='loadtest-exceptions')
+
+    def _call(self, method, *args):
+        _thread_state.exception = None
+        response = method(*args)
+        if _thread_state.exception is not None:
+            raise _thread_state.exception
+        return response.status_code, b''
+
+    def get(self, path):
+        return self._call(self.client.get, path)
+
+    def post(self, path, data):
+        return self._call(self.client.post, path, data)
+
+
+class HttpSession:
+    """Drives a running server (e.g. `runserver`) over HTTP with its own cookie jar."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect()
+        )
+
+    def _csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        # The register page sets the CSRF cookie
+        self.get('/')
+        return next((c.value for c in self.cookies if c.name == 'csrftoken'), '')
+
+    def _open(self, request):
+        try:
+            with self.opener.open(request, timeout=120) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def get(self, path):
+        return self._open(urllib.request.Request(self.base_url + path))
+
+    def post(self, path, data):
+        data = dict(data, csrfmiddlewaretoken=self._csrf_token())
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=urllib.parse.urlencode(data).encode(),
+            headers={'Referer': self.base_url + path},
+        )
+        return self._open(request)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class LoadResults:
+    """Thread-safe collection of (kind, latency, outcome) samples."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.started = None
+        self.finished = None
+
+    def add(self, kind, latency, outcome):
+        with self.lock:
+            self.samples[kind].append((latency, outcome))
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - (self.started or 0)
+        report = {'elapsed_s': round(elapsed, 3), 'kinds': {}}
+        for kind, samples in sorted(self.samples.items()):
+            latencies = sorted(latency for latency, _ in samples)
+            outcomes = defaultdict(int)
+            for _, outcome in samples:
+                outcomes[outcome] += 1
+            report['kinds'][kind] = {
+                'requests': len(samples),
+                'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+                'error_rate': round(1 - outcomes['ok'] / len(samples), 4),
+                'locked_rate': round(outcomes['locked'] / len(samples), 4),
+                'outcomes': dict(outcomes),
+            }
+        return report
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _timed(results, kind, func, expected_status):
+    start = time.perf_counter()
+    try:
+        status, body = func()
+    except Exception as e:
+        outcome = 'locked' if LOCKED_MESSAGE in str(e) else type(e).__name__
+    else:
+        if status == expected_status:
+            outcome = 'ok'
+        elif LOCKED_MESSAGE.encode() in body:
+            outcome = 'locked'
+        else:
+            outcome = f'http_{status}'
+    results.add(kind, time.perf_counter() - start, outcome)
+
+
+def applicant_worker(session, results, iterations, submit, barrier):
+    """Autosave a draft `iterations` times, optionally finishing with a full submit."""
+    barrier.wait()
+    try:
+        for _ in range(iterations):
+            _timed(results, 'save_and_exit', lambda: session.post('/', draft_data()), 302)
+        if submit:
+            _timed(results, 'submit', lambda: session.post('/', submission_data()), 302)
+    finally:
+        connections.close_all()
+
+
+def staff_worker(session, results, iterations, barrier):
+    barrier.wait()
+    try:
+        for _ in range(iterations):
+            _timed(results, 'dashboard', lambda: session.get('/dashboard/'), 200)
+    finally:
+        connections.close_all()
+
+
+def run_load(applicants, staff, iterations, submit=True, base_url=None):
+    """
+    Run `applicants` autosaving threads and `staff` dashboard threads at once.
+    Uses the in-process WSGI app unless `base_url` points at a running server.
+    """
+    def make_session():
+        return HttpSession(base_url) if base_url else InProcessSession()
+
+    results = LoadResults()
+    barrier = threading.Barrier(applicants + staff + 1)
+    threads = [
+        threading.Thread(target=applicant_worker, args=(make_session(), results, iterations, submit, barrier))
+        for _ in range(applicants)
+    ] + [
+        threading.Thread(target=staff_worker, args=(make_session(), results, iterations, barrier))
+        for _ in range(staff)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    results.started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    results.finished = time.perf_counter()
+    return results.summary()
@@ -0,0 +1,241 @@
+import itertools
+import json
+import statistics
+import time
+import tracemalloc
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.models import AddressEntry, Application
+
+
+def _management_form(prefix, total):
+    return {
+        f'{prefix}-TOTAL_FORMS': str(total),
+        f'{prefix}-INITIAL_FORMS': '0',
+        f'{prefix}-MIN_NUM_FORMS': '0',
+        f'{prefix}-MAX_NUM_FORMS': '1000',
+    }
+
+
+def submission_data():
+    """A complete, valid register form POST for a new application."""
+    data = {
+        'personal-title': 'Mrs',
+        'personal-first_name': 'Bench',
+        'personal-last_name': 'Mark',
+        'personal-dob': '1985-05-20',
+        'personal-gender': 'Female',
+        'personal-email': 'bench@example.com',
+        'personal-phone': '07987654321',
+        'personal-ni_number': 'AB123456C',
+        'personal-right_to_work_status': 'British Citizen',
+        'premises-local_authority': 'Leeds',
+        'premises-premises_type': 'Domestic',
+        'premises-is_own_home': 'on',
+        'service-care_age_0_5': 'on',
+        'service-number_of_assistants': '0',
+        'declaration-consent_auth_contact': 'on',
+        'declaration-consent_auth_share': 'on',
+        'declaration-consent_understand_usage': 'on',
+        'declaration-consent_understand_gdpr': 'on',
+        'declaration-consent_truth': 'on',
+        'declaration-signature': 'Bench Mark',
+        'declaration-print_name': 'Bench Mark',
+        'declaration-date_signed': timezone.now().date().isoformat(),
+        'address-0-line1': '1 Test Street',
+        'address-0-town': 'Leeds',
+        'address-0-postcode': 'LS1 1AA',
+        'address-0-move_in_date': '2015-01-01',
+        'address-0-is_current': 'on',
+        'employment-0-employer_name': 'Self',
+        'employment-0-role': 'Nanny',
+        'employment-0-start_date': '2015-01-01',
+        'reference-0-first_name': 'Ref',
+        'reference-0-last_name': 'One',
+        'reference-0-email': 'ref1@example.com',
+        'reference-0-phone': '0111111111',
+        'reference-0-relationship': 'Friend',
+        'reference-0-years_known': '5',
+        'reference-1-first_name': 'Ref',
+        'reference-1-last_name': 'Two',
+        'reference-1-email': 'ref2@example.com',
+        'reference-1-phone': '0222222222',
+        'reference-1-relationship': 'Colleague',
+        'reference-1-years_known': '3',
+    }
+    data.update(_management_form('address', 1))
+    data.update(_management_form('employment', 1))
+    data.update(_management_form('household', 0))
+    data.update(_management_form('reference', 2))
+    return data
+
+
+def draft_data():
+    """A partial save_and_exit POST touching a couple of sections."""
+    data = {
+        'action': 'save_and_exit',
+        'current_section': '2',
+        'personal-first_name': 'Draft',
+        'personal-last_name': 'Bench',
+        'premises-local_authority': 'Leeds',
+    }
+    for prefix in ['address', 'employment', 'household', 'reference']:
+        data.update(_management_form(prefix, 0))
+    return data
+
+
+class BenchmarkContext:
+    """Clients and fixtures shared by the scenarios for one dataset size."""
+
+    def __init__(self):
+        self.client = Client()
+        self.submit_client = Client()
+        # Never saves, so it always sees a blank form
+        self.new_client = Client()
+        draft = Application.objects.filter(status='DRAFT').order_by('created_at').first()
+        if draft is None:
+            draft = Application.objects.create(status='DRAFT')
+        self.draft_id = draft.id
+        self.address = AddressEntry.objects.filter(application=draft).first()
+        if self.address is None:
+            self.address = AddressEntry.objects.create(application=draft, line1='1 Bench Road', town='Leeds')
+        self.edits = itertools.count()
+        self.api_client = Client()
+        reader, _ = User.objects.get_or_create(username='bench-api-reader', defaults={'is_staff': True})
+        reader.user_permissions.add(Permission.objects.get(codename='view_application'))
+        self.api_client.force_login(reader)
+        # Resume once so the draft is in this client's session
+        self.client.get(reverse('register') + f'?app_id={self.draft_id}')
+
+
+def dashboard(ctx):
+    response = ctx.client.get(reverse('dashboard'))
+    assert response.status_code == 200, response.status_code
+
+
+def register_resume(ctx):
+    response = ctx.client.get(reverse('register') + f'?app_id={ctx.draft_id}')
+    assert response.status_code == 200, response.status_code
+
+
+def register_new(ctx):
+    response = ctx.new_client.get(reverse('register'))
+    assert response.status_code == 200, response.status_code
+
+
+def register_invalid_submit(ctx):
+    """A submit that fails validation and re-renders the whole form."""
+    data = submission_data()
+    data['personal-email'] = 'not-an-email'
+    response = ctx.new_client.post(reverse('register'), data)
+    assert response.status_code == 200, response.status_code
+
+
+def save_and_exit(ctx):
+    response = ctx.client.post(reverse('register'), draft_data())
+    assert response.status_code == 302, response.status_code
+
+
+def save_and_exit_delta(ctx):
+    """A draft save posting one changed address row as a delta."""
+    data = {'action': 'save_and_exit', 'current_section': '1'}
+    for prefix in ['address', 'employment', 'household', 'reference']:
+        data[f'{prefix}-delta'] = '{}'
+    data['address-delta'] = json.dumps({'changed': [{'id': ctx.address.pk, 'town': f'Leeds {next(ctx.edits)}'}]})
+    response = ctx.client.post(reverse('register'), data, HTTP_ACCEPT='application/json')
+    assert response.status_code == 200, response.status_code
+
+
+def submit(ctx):
+    response = ctx.submit_client.post(reverse('register'), submission_data())
+    assert response.status_code == 302, response.status_code
+
+
+def api_list(ctx):
+    """A page of the read API with one section, as an integration would pull it."""
+    response = ctx.api_client.get(reverse('api_application_list'), {
+        'fields': 'status,created_at', 'include': 'personal_details', 'limit': 100,
+    })
+    assert response.status_code == 200, response.status_code
+
+
+def cleanup_empty_records(ctx):
+    call_command('cleanup_empty_records', stdout=StringIO())
+
+
+# Slack added on top of the relative tolerance so tiny timings don't flap
+ABSOLUTE_SLACK = {'wall_ms': 5, 'peak_kib': 256}
+
+SCENARIOS = [
+    ('dashboard_view', dashboard),
+    ('register_view_resume', register_resume),
+    ('register_view_new', register_new),
+    ('register_invalid_submit', register_invalid_submit),
+    ('save_and_exit', save_and_exit),
+    ('save_and_exit_delta', save_and_exit_delta),
+    ('submit', submit),
+    ('api_list', api_list),
+    ('cleanup_empty_records', cleanup_empty_records),
+]
+
+
+def measure(func, ctx, repeat=3):
+    """
+    Time `func` `repeat` times, then run it once more under tracemalloc and
+    query capture so the instrumentation doesn't skew the wall time.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(ctx)
+        timings.append(time.perf_counter() - start)
+
+    # Count via execute_wrapper: connection.queries caps out at 9000 entries
+    query_count = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal query_count
+        query_count += 1
+        return execute(sql, params, many, context)
+
+    tracemalloc.start()
+    try:
+        with connection.execute_wrapper(count_queries):
+            func(ctx)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_ms': round(statistics.median(timings) * 1000, 2),
+        'queries': query_count,
+        'peak_kib': peak // 1024,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return a list of human readable regressions of `results` against `baseline`.
+    Wall time and peak memory may grow by `tolerance` (a fraction); query
+    counts must not grow at all. Sizes/scenarios missing from either side are skipped.
+    """
+    regressions = []
+    for size, scenarios in results.items():
+        for name, current in scenarios.items():
+            expected = baseline.get(size, {}).get(name)
+            if not expected:
+                continue
+            if current['queries'] > expected['queries']:
+                regressions.append(f'{name} @ {size}: {current["queries"]} queries (baseline {expected["queries"]})')
+            for metric in ['wall_ms', 'peak_kib']:
+                limit = expected[metric] * (1 + tolerance) + ABSOLUTE_SLACK[metric]
+                if current[metric] > limit:
+                    regressions.append(f'{name} @ {size}: {metric} {current[metric]} (baseline {expected[metric]})')
+    return regressions
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +48,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'applications.middleware.ReplicaStickinessMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -77,8 +79,85 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock at BEGIN, so a writer waits out busy_timeout
+            # instead of failing immediately when upgrading a read lock
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Optional read replica for dashboard/export/admin listing reads, e.g. a second
+# SQLite file kept current with `manage.py sync_replica`. See applications.routers.
+REPLICA_DB_NAME = os.environ.get('DJANGO_REPLICA_DB')
+if REPLICA_DB_NAME:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': REPLICA_DB_NAME,
+        # Tests run against one database
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['applications.routers.ReplicaRouter']
+
+# After a request writes, that session reads from the primary for this long
+# so it sees its own changes before the replica catches up
+REPLICA_STICKY_SECONDS = 60
+
+# Applied to every new SQLite connection by applications.db.configure_sqlite.
+# WAL lets the dashboard's long reads run alongside autosave writes.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,  # ms to wait for the write lock before "database is locked"
+    'synchronous': 'NORMAL',  # safe with WAL; skips an fsync per commit
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Retries (with backoff) for write paths that still hit "database is locked"
+DB_WRITE_RETRIES = 5
+
+# Per-application section data for the dashboard (applications.app_cache).
+# Local memory by default; set DJANGO_APPLICATION_CACHE_DIR to share a file
+# cache between worker processes. Keys carry Application.cache_version, so
+# entries never go stale even in a per-process cache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+    'applications': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'applications',
+        'TIMEOUT': 24 * 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+    # Rendered register page sections (applications.fragments)
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template_fragments',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
 }
+if os.environ.get('DJANGO_APPLICATION_CACHE_DIR'):
+    CACHES['applications'].update(
+        BACKEND='django.core.cache.backends.filebased.FileBasedCache',
+        LOCATION=os.environ['DJANGO_APPLICATION_CACHE_DIR'],
+    )
+APPLICATION_CACHE_ALIAS = 'applications'
+
+# Secrets for encrypted columns (applications.encryption). The first encrypts
+# and keys the blind indexes; later ones can still decrypt, so a key can be
+# rotated by prepending the new one and running reencrypt_fields.
+FIELD_ENCRYPTION_KEYS = [
+    key for key in os.environ.get('DJANGO_FIELD_ENCRYPTION_KEYS', '').split(',') if key
+] or [SECRET_KEY]
+
+# Bearer tokens accepted by the read API (applications.api), for systems
+# without a staff login. Staff sessions with the view permission also work.
+API_TOKENS = [
+    token for token in os.environ.get('DJANGO_API_TOKENS', '').split(',') if token
+]
 
 
 # Password validation
@@ -121,3 +200,22 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# The applications logger writes to stderr; set DJANGO_LOG_LEVEL=INFO to also
+# see failed register submits.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'applications': {
+            'handlers': ['console'],
+            'level': os.environ.get('DJANGO_LOG_LEVEL', 'WARNING'),
+        },
+    },
+}